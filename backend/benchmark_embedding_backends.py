@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+임베딩 추론 백엔드 비교 스크립트
+
+data/documents 코퍼스를 청크로 분할한 뒤 torch / onnx / onnx-int8 백엔드로
+각각 임베딩하여 다음을 비교합니다.
+- 정합성: torch 벡터 대비 코사인 유사도 (최소/평균) ≥ 임계값 여부
+- 처리량: 문서 청크 임베딩 속도 (chunks/sec)
+- 지연시간: 단일 쿼리 embed_query p50/p95 (ms)
+
+실행: cd backend && python benchmark_embedding_backends.py --threshold 0.98
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.document_loader import DirectoryLoader, TextSplitter
+from rag.embeddings import BGEEmbeddings
+
+
+SAMPLE_QUERIES = [
+    "강남역 카페 창업",
+    "역삼동 임대료 시세",
+    "소상공인 정책자금 지원",
+    "서울시 상권분석 서비스 상권영역",
+    "2025 서울시 소상공인 생활백서",
+]
+
+
+def load_corpus(limit: int = None):
+    """index_documents.py와 같은 방식으로 코퍼스 청크 로드"""
+    documents_path = Path(__file__).parent / "data" / "documents"
+    documents = DirectoryLoader(directory_path=str(documents_path)).load()
+    split_docs = TextSplitter(chunk_size=500, chunk_overlap=100, separator="\n\n").split_documents(documents)
+    texts = [doc.page_content for doc in split_docs if doc.page_content.strip()]
+    return texts[:limit] if limit else texts
+
+
+def measure_backend(embeddings: BGEEmbeddings, texts, query_rounds: int):
+    """문서 임베딩 처리량과 쿼리 지연시간 측정"""
+    start = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    latencies = []
+    for i in range(query_rounds):
+        query = SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]
+        start = time.perf_counter()
+        embeddings.embed_query(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return vectors, throughput, np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 정합성/성능 비교")
+    parser.add_argument("--backends", nargs="+", default=["onnx", "onnx-int8"],
+                        help="torch와 비교할 백엔드 목록")
+    parser.add_argument("--threshold", type=float, default=0.98,
+                        help="torch 대비 최소 코사인 유사도 (기본 0.98)")
+    parser.add_argument("--limit", type=int, default=None, help="사용할 최대 청크 수")
+    parser.add_argument("--query-rounds", type=int, default=50, help="쿼리 지연시간 측정 횟수")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🧪 임베딩 백엔드 비교")
+    print("=" * 70)
+
+    texts = load_corpus(args.limit)
+    print(f"\n📄 코퍼스 청크 수: {len(texts)}")
+
+    # 기준: torch 백엔드
+    reference_model = BGEEmbeddings(backend="torch", device="cpu")
+    reference_model.embed_query("워밍업")
+    reference, ref_throughput, ref_p50, ref_p95 = measure_backend(reference_model, texts, args.query_rounds)
+    del reference_model
+
+    rows = [("torch", 1.0, 1.0, ref_throughput, ref_p50, ref_p95, True)]
+    all_passed = True
+
+    for backend in args.backends:
+        model = BGEEmbeddings(backend=backend, device="cpu")
+        model.embed_query("워밍업")
+        vectors, throughput, p50, p95 = measure_backend(model, texts, args.query_rounds)
+        del model
+
+        # 두 벡터 모두 정규화되어 있으므로 내적 = 코사인 유사도
+        cosines = np.einsum("ij,ij->i", reference, vectors)
+        passed = bool(cosines.min() >= args.threshold)
+        all_passed = all_passed and passed
+        rows.append((backend, float(cosines.min()), float(cosines.mean()), throughput, p50, p95, passed))
+
+    print(f"\n{'백엔드':<10} | {'cos 최소':>8} | {'cos 평균':>8} | {'chunks/s':>9} | "
+          f"{'p50 ms':>7} | {'p95 ms':>7} | 정합성")
+    print("-" * 78)
+    for backend, cos_min, cos_mean, throughput, p50, p95, passed in rows:
+        print(f"{backend:<10} | {cos_min:>8.4f} | {cos_mean:>8.4f} | {throughput:>9.1f} | "
+              f"{p50:>7.1f} | {p95:>7.1f} | {'PASS' if passed else 'FAIL'}")
+
+    print(f"\n임계값: cosine ≥ {args.threshold}")
+    sys.exit(0 if all_passed else 1)
+
+
+if __name__ == "__main__":
+    main()
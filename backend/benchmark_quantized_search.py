@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+int8 양자화 후보 검색 벤치마크 스크립트
+
+현재 활성 컬렉션(commercial_analysis_docs)을 스냅샷으로 내보내 QuantizedVectorStore를
+만들고, 재채점 후보 수(rescore_candidates)별로 아래 항목을 비교합니다.
+
+- 메모리: int8 코드 + scale 크기 vs 같은 벡터의 float32 행렬 크기
+- recall@k: 현재 ChromaVectorStore.search 결과 대비 / NumPy 정확 검색 대비
+- 쿼리 지연(p50/p95)
+
+쿼리: 무작위로 고른 컬렉션 문서 벡터에 작은 노이즈를 더한 벡터
+
+실행: cd backend && python benchmark_quantized_search.py --rescore-candidates 20 50 100
+서버 적용: .env에 RAG_VECTOR_BACKEND=quantized
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.numpy_vector_store import NumpyVectorStore
+from rag.quantized_vector_store import QuantizedVectorStore
+from rag.vector_store import ChromaVectorStore
+
+
+def quantized_snapshot_dir(vector_store: ChromaVectorStore) -> str:
+    """QuantizedVectorStore.from_chroma()의 기본 스냅샷 경로"""
+    return str(Path(__file__).parent / "data" / "snapshots" / vector_store.collection_name)
+
+
+def run_queries(store, queries: np.ndarray, k: int):
+    """쿼리별 검색 결과 ID 집합과 지연 시간(ms) 리스트"""
+    found, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results = store.search(query, top_k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found.append(set(results["ids"]))
+    return found, latencies
+
+
+def mean_recall(found, expected, k: int) -> float:
+    return float(np.mean([len(f & e) / k for f, e in zip(found, expected)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 양자화 후보 검색 메모리/recall/지연 비교")
+    parser.add_argument("--rescore-candidates", type=int, nargs="+", default=[20, 50, 100, 200],
+                        help="재채점 후보 수 후보")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🗜️  int8 양자화 후보 검색 벤치마크")
+    print("=" * 70)
+
+    chroma = ChromaVectorStore(result_cache_size=0)  # 인덱스 검색 자체의 지연 측정
+    if chroma.get_document_count() == 0:
+        print("⚠️  컬렉션이 비어있습니다. 먼저 index_documents.py를 실행해주세요.")
+        return
+
+    # 스냅샷을 한 번 내보내고 두 스토어가 같은 벡터를 사용
+    quantized = QuantizedVectorStore.from_chroma(chroma)
+    exact = NumpyVectorStore.from_snapshot(quantized_snapshot_dir(chroma))
+
+    rng = np.random.default_rng(0)
+    picks = rng.choice(len(exact.ids), size=min(args.queries, len(exact.ids)), replace=False)
+    matrix = exact.matrix
+    queries = matrix[picks] + rng.normal(scale=0.02, size=(len(picks), matrix.shape[1])).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    k = min(args.k, len(exact.ids))
+
+    chroma_ids, chroma_lat = run_queries(chroma, queries, k)
+    exact_ids, exact_lat = run_queries(exact, queries, k)
+
+    stats = quantized.memory_stats()
+    print(f"\n문서 수: {len(exact.ids)}, 차원: {matrix.shape[1]}, 쿼리 {len(queries)}개, k={k}")
+    print(f"메모리: int8 {stats['quantized_mb']:.1f}MB vs float32 {stats['float32_mb']:.1f}MB "
+          f"(절감 {stats['saving_ratio'] * 100:.1f}%)")
+
+    print(f"\n{'백엔드':<18} | {'recall(chroma)':>14} | {'recall(exact)':>13} | "
+          f"{'p50 ms':>7} | {'p95 ms':>7}")
+    print("-" * 72)
+
+    def report(name, found, latencies):
+        print(f"{name:<18} | {mean_recall(found, chroma_ids, k):>14.3f} | "
+              f"{mean_recall(found, exact_ids, k):>13.3f} | "
+              f"{np.percentile(latencies, 50):>7.2f} | {np.percentile(latencies, 95):>7.2f}")
+
+    report("chroma (HNSW)", chroma_ids, chroma_lat)
+    report("numpy (exact)", exact_ids, exact_lat)
+    for candidates in args.rescore_candidates:
+        quantized.rescore_candidates = candidates
+        found, latencies = run_queries(quantized, queries, k)
+        report(f"int8 N={candidates}", found, latencies)
+
+    print("\n💡 recall(chroma)는 현재 서비스 검색 대비 결과 일치율, "
+          "recall(exact)는 float32 정확 검색 대비 손실입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+쿼리 마이크로 배칭 벤치마크
+
+동시 클라이언트 수(1, 8, 32)별로 BGEEmbeddings.embed_query 직접 호출과
+BatchingEmbedder를 거친 호출의 초당 처리 쿼리 수(QPS)를 비교합니다.
+
+실행: cd backend && python benchmark_query_batching.py
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.embeddings import BGEEmbeddings
+from rag.batching_embedder import BatchingEmbedder
+
+
+SAMPLE_QUERIES = [
+    "강남역 카페 창업",
+    "홍대 상권 유동인구",
+    "역삼동 임대료 시세",
+    "소상공인 정책자금 지원",
+    "편의점 창업 비용",
+    "서울시 상권분석 서비스 상권영역",
+    "음식점 폐업률이 높은 지역",
+    "2025 서울시 소상공인 생활백서",
+]
+
+CONCURRENCY_LEVELS = [1, 8, 32]
+QUERIES_PER_CLIENT = 16
+
+
+def run_benchmark(embedder, concurrency: int) -> float:
+    """동시 클라이언트 concurrency개로 쿼리를 실행하고 QPS 반환"""
+    def client(client_id: int):
+        for i in range(QUERIES_PER_CLIENT):
+            # 쿼리마다 내용을 조금씩 바꿔 동일 입력 최적화 효과 배제
+            query = f"{SAMPLE_QUERIES[(client_id + i) % len(SAMPLE_QUERIES)]} {client_id}-{i}"
+            embedder.embed_query(query)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return concurrency * QUERIES_PER_CLIENT / elapsed
+
+
+def main():
+    print("=" * 70)
+    print("⚡ 쿼리 마이크로 배칭 벤치마크")
+    print("=" * 70)
+
+    embeddings = BGEEmbeddings()
+    batching = BatchingEmbedder(embeddings, max_batch_size=32, max_wait_ms=5.0)
+
+    # 워밍업 (지연 커널 초기화 제외)
+    embeddings.embed_query("워밍업")
+    batching.embed_query("워밍업")
+
+    print(f"\n{'동시 클라이언트':>14} | {'직접 호출 QPS':>14} | {'배칭 QPS':>10} | {'배속':>6}")
+    print("-" * 56)
+
+    for concurrency in CONCURRENCY_LEVELS:
+        direct_qps = run_benchmark(embeddings, concurrency)
+        batched_qps = run_benchmark(batching, concurrency)
+        speedup = batched_qps / direct_qps if direct_qps else 0.0
+        print(f"{concurrency:>14} | {direct_qps:>14.1f} | {batched_qps:>10.1f} | {speedup:>5.2f}x")
+
+    print(f"\n배칭 통계: {batching.stats()}")
+    batching.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+저장 모드(차원 절단 / float16) recall@k 비교 스크립트
+
+현재 전체 정밀도 컬렉션(commercial_analysis_docs)의 벡터를 기준으로,
+각 저장 모드로 축소한 벡터에서 정확(brute-force) 검색한 top-k가
+원본 top-k를 얼마나 재현하는지(recall@k)와 벡터당 저장 크기를 출력합니다.
+
+쿼리: 샘플 질문 + 무작위로 고른 컬렉션 문서 일부
+
+실행: cd backend && python benchmark_storage_modes.py --k 5 --dims 1024 768 512 256
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.embeddings import BGEEmbeddings
+from rag.vector_store import ChromaVectorStore, reduce_embeddings
+
+
+SAMPLE_QUERIES = [
+    "강남역 카페 창업",
+    "역삼동 임대료 시세",
+    "소상공인 정책자금 지원",
+    "서울시 상권분석 서비스 상권영역",
+    "2025 서울시 소상공인 생활백서",
+    "벤처기업 창업자의 성공요인",
+    "유동인구가 많은 상권 입지 분석 방법",
+    "음식점 폐업률",
+]
+
+
+def top_k_ids(doc_matrix: np.ndarray, query_matrix: np.ndarray, k: int) -> np.ndarray:
+    """코사인(정규화 벡터 내적) 기준 정확 top-k 인덱스"""
+    scores = query_matrix @ doc_matrix.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    """쿼리별 top-k 교집합 비율의 평균"""
+    k = truth.shape[1]
+    return float(np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장 모드별 recall@k 비교")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--dims", type=int, nargs="+", default=[1024, 768, 512, 256],
+                        help="비교할 저장 차원 목록")
+    parser.add_argument("--doc-queries", type=int, default=200,
+                        help="쿼리로 사용할 컬렉션 문서 수")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("💾 저장 모드별 recall@k 비교")
+    print("=" * 70)
+
+    vector_store = ChromaVectorStore()
+    data = vector_store.get_all_documents()
+    doc_matrix = np.asarray(data["embeddings"], dtype=np.float32)
+    if len(doc_matrix) == 0:
+        print("⚠️  컬렉션이 비어있습니다. 먼저 index_documents.py를 실행해주세요.")
+        return
+
+    embeddings = BGEEmbeddings()
+    sample_queries = embeddings.embed_queries_array(SAMPLE_QUERIES)
+
+    rng = np.random.default_rng(0)
+    doc_query_idx = rng.choice(len(doc_matrix), size=min(args.doc_queries, len(doc_matrix)), replace=False)
+
+    # 기준: 전체 정밀도 정확 검색
+    truth_sample = top_k_ids(doc_matrix, sample_queries, args.k)
+    truth_docs = top_k_ids(doc_matrix, doc_matrix[doc_query_idx], args.k)
+
+    print(f"\n문서 수: {len(doc_matrix)}, 원본 차원: {doc_matrix.shape[1]}, k={args.k}")
+    print(f"\n{'차원':>6} | {'정밀도':>8} | {'벡터당 바이트':>12} | {'recall(질문)':>12} | {'recall(문서)':>12}")
+    print("-" * 64)
+
+    for dim in args.dims:
+        for precision in ("float32", "float16"):
+            # float16은 반올림 오차만 반영하고 점수 계산은 float32로 수행
+            reduced_docs = reduce_embeddings(doc_matrix, dim, precision).astype(np.float32)
+            reduced_sample = reduce_embeddings(sample_queries, dim)
+            reduced_doc_queries = reduced_docs[doc_query_idx]
+
+            found_sample = top_k_ids(reduced_docs, reduced_sample, args.k)
+            found_docs = top_k_ids(reduced_docs, reduced_doc_queries, args.k)
+
+            bytes_per_vector = min(dim, doc_matrix.shape[1]) * (2 if precision == "float16" else 4)
+            print(f"{min(dim, doc_matrix.shape[1]):>6} | {precision:>8} | {bytes_per_vector:>12} | "
+                  f"{recall_at_k(truth_sample, found_sample):>12.3f} | "
+                  f"{recall_at_k(truth_docs, found_docs):>12.3f}")
+
+    print("\n💡 ChromaDB는 벡터를 float32로 저장하므로 컬렉션 크기는 차원 절단(--embedding-dim)으로만 줄어듭니다.")
+    print("   float16 바이트 수는 NumPy 백엔드(RAG_VECTOR_PRECISION=float16) 메모리 기준입니다.")
+
+
+if __name__ == "__main__":
+    main()
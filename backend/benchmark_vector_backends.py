@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+벡터 검색 백엔드 비교 벤치마크 (ChromaDB HNSW vs NumPy 정확 검색)
+
+현재 컬렉션(commercial_analysis_docs)의 벡터를 복제·섭동하여 여러 코퍼스 크기의
+임시 컬렉션을 만들고, 같은 쿼리로 두 백엔드의 쿼리 지연(p50/p95)과
+NumPy 결과 대비 Chroma recall@k를 출력합니다. 크기별로 백엔드를 고르는 근거로 사용합니다.
+
+실행: cd backend && python benchmark_vector_backends.py --sizes 1000 5000 20000 100000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.numpy_vector_store import NumpyVectorStore
+from rag.vector_store import ChromaVectorStore
+
+
+def synthetic_corpus(base: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """원본 벡터를 복제하고 작은 노이즈를 더해 원하는 크기의 정규화 행렬 생성"""
+    picks = rng.integers(0, len(base), size=size)
+    matrix = base[picks] + rng.normal(scale=0.02, size=(size, base.shape[1])).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix.astype(np.float32)
+
+
+def time_queries(store, queries: np.ndarray, k: int):
+    """쿼리별 지연 시간(ms)과 결과 ID 목록"""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        found = store.search(query, top_k=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(found["ids"])
+    return np.array(latencies), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma HNSW vs NumPy 정확 검색 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 100000],
+                        help="비교할 코퍼스 크기 목록")
+    parser.add_argument("--queries", type=int, default=200, help="크기별 쿼리 수")
+    parser.add_argument("--k", type=int, default=5, help="top-k")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("⚖️  벡터 검색 백엔드 비교 (ChromaDB HNSW vs NumPy)")
+    print("=" * 70)
+
+    data = ChromaVectorStore().get_all_documents()
+    base = np.asarray(data["embeddings"], dtype=np.float32)
+    if len(base) == 0:
+        print("⚠️  컬렉션이 비어있습니다. 먼저 index_documents.py를 실행해주세요.")
+        return
+
+    rng = np.random.default_rng(0)
+    print(f"\n원본 문서 수: {len(base)}, 차원: {base.shape[1]}, k={args.k}, 쿼리 {args.queries}개")
+    print(f"\n{'문서 수':>8} | {'backend':>7} | {'p50 ms':>7} | {'p95 ms':>7} | {'QPS':>8} | {'recall@k':>8}")
+    print("-" * 60)
+
+    for size in args.sizes:
+        matrix = synthetic_corpus(base, size, rng)
+        queries = synthetic_corpus(base, args.queries, rng)
+        ids = [f"bench_{i}" for i in range(size)]
+        texts = [f"bench {i}" for i in range(size)]
+        metadatas = [{"source": f"bench_{i % 50}.txt"} for i in range(size)]
+
+        temp_dir = tempfile.mkdtemp(prefix="bench_chroma_")
+        try:
+            chroma = ChromaVectorStore(
+                collection_name="bench_backends",
+                persist_directory=temp_dir,
+                result_cache_size=0  # 인덱스 검색 자체의 지연 측정
+            )
+            chroma.add_documents(texts=texts, embeddings=matrix, metadatas=metadatas, ids=ids)
+            numpy_store = NumpyVectorStore(ids, texts, metadatas, matrix)
+
+            # 첫 쿼리의 인덱스 로드 비용 제외
+            chroma.search(queries[0], top_k=args.k)
+            numpy_store.search(queries[0], top_k=args.k)
+
+            numpy_lat, numpy_ids = time_queries(numpy_store, queries, args.k)
+            chroma_lat, chroma_ids = time_queries(chroma, queries, args.k)
+            recall = np.mean([len(set(c) & set(n)) / args.k for c, n in zip(chroma_ids, numpy_ids)])
+
+            for name, lat, rec in (("numpy", numpy_lat, 1.0), ("chroma", chroma_lat, recall)):
+                print(f"{size:>8} | {name:>7} | {np.percentile(lat, 50):>7.2f} | "
+                      f"{np.percentile(lat, 95):>7.2f} | {1000 / lat.mean():>8.0f} | {rec:>8.3f}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("\n💡 NumPy 백엔드 메모리: 문서 수 × 차원 × 4바이트 (1024차원 10만 개 ≈ 400MB)")
+    print("   RAG_VECTOR_BACKEND=numpy로 서버에서 사용할 수 있습니다.")
+
+
+if __name__ == "__main__":
+    main()
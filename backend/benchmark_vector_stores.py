@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+VectorStore 백엔드 성능 비교 스크립트
+
+임베딩 모델이나 기존 컬렉션 없이 같은 생성 코퍼스(클러스터형 정규화 벡터)를
+각 백엔드에 넣고 아래 항목을 출력합니다.
+
+- 삽입 속도 (rows/s, add_documents 배치 단위)
+- 쿼리 지연 p50/p99 (ms), QPS
+- 메모리 (삽입 전후 프로세스 RSS 증가량, MB)
+- 정확 검색 대비 recall@k
+
+검색 결과 캐시는 끄고 측정합니다. 새 백엔드는 BACKENDS에 생성 함수를 추가하면 됩니다.
+
+실행: cd backend && python benchmark_vector_stores.py --size 20000 --dim 1024 --backend numpy chroma
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.numpy_vector_store import NumpyVectorStore
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def make_numpy_store(temp_dir: str):
+    return NumpyVectorStore([], [], [], np.empty((0, 0), dtype=np.float32), collection_name="bench_stores")
+
+
+def make_chroma_store(temp_dir: str):
+    from rag.vector_store import ChromaVectorStore
+
+    return ChromaVectorStore(
+        collection_name="bench_stores",
+        persist_directory=temp_dir,
+        follow_alias=False,
+        result_cache_size=0  # 인덱스 검색 자체의 지연 측정
+    )
+
+
+BACKENDS = {
+    "numpy": make_numpy_store,
+    "chroma": make_chroma_store,
+}
+
+
+def rss_mb() -> float:
+    """현재 프로세스 RSS (MB, 측정 불가 시 nan)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def generated_corpus(size: int, dim: int, clusters: int, rng: np.random.Generator):
+    """클러스터 중심 주변에 흩어진 정규화 벡터 (실제 문서 임베딩처럼 이웃이 뭉쳐 있음)"""
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    matrix = centers[rng.integers(0, clusters, size=size)]
+    matrix = matrix + rng.normal(scale=0.3, size=(size, dim)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix
+
+
+def run_backend(name: str, matrix: np.ndarray, queries: np.ndarray, truth, args) -> dict:
+    """백엔드 하나의 삽입/검색/메모리 측정"""
+    size = len(matrix)
+    ids = [f"bench_{i}" for i in range(size)]
+    texts = [f"bench {i}" for i in range(size)]
+    metadatas = [{"source": f"bench_{i % 50}.txt"} for i in range(size)]
+
+    temp_dir = tempfile.mkdtemp(prefix="bench_stores_")
+    gc.collect()
+    rss_before = rss_mb()
+    try:
+        store = BACKENDS[name](temp_dir)
+
+        start = time.perf_counter()
+        for batch_start in range(0, size, args.batch_size):
+            batch_end = min(batch_start + args.batch_size, size)
+            store.add_documents(
+                texts=texts[batch_start:batch_end],
+                embeddings=matrix[batch_start:batch_end],
+                metadatas=metadatas[batch_start:batch_end],
+                ids=ids[batch_start:batch_end]
+            )
+        insert_s = time.perf_counter() - start
+        assert store.get_document_count() == size, f"{name}: 문서 수 불일치"
+
+        store.search(queries[0], top_k=args.k)  # 첫 쿼리의 인덱스 로드 비용 제외
+        latencies, recalls = [], []
+        for query, expected in zip(queries, truth):
+            query_start = time.perf_counter()
+            found = store.search(query, top_k=args.k)
+            latencies.append((time.perf_counter() - query_start) * 1000)
+            recalls.append(len(expected & set(found["ids"])) / args.k)
+
+        latencies = np.array(latencies)
+        return {
+            "insert_rows_per_s": size / max(insert_s, 1e-9),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "qps": 1000 / latencies.mean(),
+            "memory_mb": rss_mb() - rss_before,
+            "recall": float(np.mean(recalls))
+        }
+    finally:
+        store = None
+        gc.collect()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VectorStore 백엔드별 삽입 속도 / 쿼리 지연 / 메모리 비교")
+    parser.add_argument("--backend", nargs="+", default=list(BACKENDS), choices=list(BACKENDS),
+                        help="비교할 백엔드")
+    parser.add_argument("--size", type=int, default=20000, help="코퍼스 문서 수")
+    parser.add_argument("--dim", type=int, default=1024, help="벡터 차원 (BGE-M3: 1024)")
+    parser.add_argument("--clusters", type=int, default=200, help="코퍼스 클러스터 수")
+    parser.add_argument("--queries", type=int, default=500, help="쿼리 수")
+    parser.add_argument("--batch-size", type=int, default=1000, help="add_documents 배치 크기")
+    parser.add_argument("--k", type=int, default=5, help="top-k")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("📊 VectorStore 백엔드 성능 비교")
+    print("=" * 70)
+
+    rng = np.random.default_rng(0)
+    matrix = generated_corpus(args.size, args.dim, args.clusters, rng)
+    picks = rng.choice(args.size, size=min(args.queries, args.size), replace=False)
+    queries = matrix[picks] + rng.normal(scale=0.05, size=(len(picks), args.dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    # 정답: 정확 검색 top-k (블록 단위로 계산하여 큰 점수 행렬을 만들지 않음)
+    truth = []
+    for start in range(0, len(queries), 256):
+        scores = queries[start:start + 256] @ matrix.T
+        top = np.argpartition(-scores, args.k - 1, axis=1)[:, :args.k]
+        truth += [{f"bench_{i}" for i in row} for row in top]
+
+    print(f"\n문서 수: {args.size}, 차원: {args.dim}, 쿼리 {len(queries)}개, k={args.k}, "
+          f"배치 {args.batch_size}")
+    if psutil is None:
+        print("   (psutil 미설치: /proc/self/statm 기준 RSS 사용)")
+    print(f"\n{'backend':>8} | {'insert rows/s':>13} | {'p50 ms':>7} | {'p99 ms':>7} | "
+          f"{'QPS':>8} | {'RSS +MB':>8} | {'recall@k':>8}")
+    print("-" * 78)
+
+    for name in args.backend:
+        row = run_backend(name, matrix, queries, truth, args)
+        print(f"{name:>8} | {row['insert_rows_per_s']:>13.0f} | {row['p50_ms']:>7.2f} | "
+              f"{row['p99_ms']:>7.2f} | {row['qps']:>8.0f} | {row['memory_mb']:>8.1f} | "
+              f"{row['recall']:>8.3f}")
+
+    print("\n💡 RSS 증가량은 백엔드를 순서대로 실행한 같은 프로세스 기준이므로 대략적인 값입니다.")
+    print("   정확한 비교가 필요하면 --backend로 하나씩 실행하세요.")
+
+
+if __name__ == "__main__":
+    main()
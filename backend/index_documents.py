@@ -5,21 +5,139 @@
 
 data/documents/ 폴더의 모든 문서를 읽어서
 ChromaDB 벡터 데이터베이스에 저장합니다.
+
+청크 ID는 경로/페이지/청크 번호/내용 해시로 결정되므로, 다시 실행하면
+변경된 청크만 임베딩·추가하고 사라진 청크만 삭제합니다.
+
+--rebuild는 활성 컬렉션을 지우지 않고 새 버전(commercial_analysis_docs__v{n})을
+만들어 검증한 뒤 별칭을 전환합니다. 실행 중인 서버는 재시작 없이 새 버전을 사용합니다.
+
+maintain 하위 명령은 재임베딩 없이 저장소를 정리합니다.
+살아있는/삭제된 행 수와 디스크 사용량을 보고하고, 살아있는 벡터로 HNSW 인덱스를 새 버전에
+재구성한 뒤 chroma.sqlite3를 VACUUM하고 전후 크기와 콜드 오픈 시간을 비교합니다.
+
+    python index_documents.py maintain [--report-only] [--no-rebuild-hnsw] [--no-vacuum]
 """
 
+import argparse
 import os
+import sqlite3
 import sys
 from pathlib import Path
+from typing import List
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from rag.document_loader import DirectoryLoader, TextSplitter
 from rag.embeddings import BGEEmbeddings
-from rag.vector_store import ChromaVectorStore
+from rag.embedding_cache import EmbeddingCache
+from rag.embedding_pool import MultiProcessEmbeddingPool
+from rag.vector_store import ChromaVectorStore, make_chunk_id
+from rag.sparse_index import SparseLexicalIndex
+from rag.bm25_index import BM25Index
+from rag.index_maintenance import measure_cold_open, rebuild_active_version, storage_report, vacuum_sqlite
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="data/documents 문서를 ChromaDB에 인덱싱")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="index",
+        choices=("index", "maintain"),
+        help="index: 문서 인덱싱 (기본값), maintain: 단편화 보고 / HNSW 재구성 / SQLite VACUUM"
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=0,
+        help="문서 임베딩 워커 프로세스 수 (0이면 단일 프로세스)"
+    )
+    sparse_group = parser.add_mutually_exclusive_group()
+    sparse_group.add_argument(
+        "--sparse",
+        action="store_true",
+        help="BGE-M3 sparse 어휘 가중치 역색인도 함께 생성"
+    )
+    sparse_group.add_argument(
+        "--no-sparse",
+        action="store_true",
+        help="기존 sparse 역색인 삭제 (지정하지 않으면 기존 역색인은 유지)"
+    )
+    parser.add_argument(
+        "--sparse-head-repo",
+        default=None,
+        help="sparse_linear.pt를 받을 저장소 (기본값: 임베딩 모델 저장소, 예: BAAI/bge-m3)"
+    )
+    parser.add_argument(
+        "--max-seq-length",
+        type=int,
+        default=None,
+        help="임베딩 최대 시퀀스 길이 (토큰, 초과분 절단; 기본값은 모델 설정). "
+             "컬렉션에 기록된 값과 다르면 기존 청크도 다시 임베딩"
+    )
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=1000,
+        help="ChromaDB 배치당 저장 행 수 (Chroma 최대 배치 크기로 제한)"
+    )
+    parser.add_argument(
+        "--embedding-dim",
+        type=int,
+        default=None,
+        help="저장 차원 수 (앞에서부터 절단 후 재정규화, 컬렉션 크기 축소; 새 컬렉션/버전에만 적용, "
+             "기존 컬렉션과 다르면 --rebuild 필요, recall 비교는 benchmark_storage_modes.py 참고)"
+    )
+    for name, help_text in (
+        ("m", "HNSW 노드당 연결 수"),
+        ("construction-ef", "HNSW 빌드 시 후보 목록 크기"),
+        ("search-ef", "HNSW 검색 시 후보 목록 크기")
+    ):
+        parser.add_argument(
+            f"--hnsw-{name}",
+            type=int,
+            default=None,
+            help=f"{help_text} (새 컬렉션/버전에만 적용, 값 선택은 tune_hnsw.py 참고)"
+        )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="변경분만 반영하지 않고 새 버전 컬렉션에 전체 재인덱싱 후, 검증되면 활성 버전으로 전환"
+    )
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=1,
+        help="--rebuild / maintain 전환 후 롤백용으로 남길 이전 버전 수 (나머지는 삭제)"
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="maintain: 단편화 보고서만 출력하고 변경하지 않음"
+    )
+    parser.add_argument(
+        "--no-rebuild-hnsw",
+        action="store_true",
+        help="maintain: HNSW 재구성(새 버전 복사 후 전환) 건너뜀"
+    )
+    parser.add_argument(
+        "--no-vacuum",
+        action="store_true",
+        help="maintain: chroma.sqlite3 VACUUM 건너뜀"
+    )
+    return parser.parse_args()
+
 
+def discard_build(vector_store, args) -> None:
+    """--rebuild 중 실패하면 만들던 버전 컬렉션 삭제 (활성 버전은 그대로 유지)"""
+    if args.rebuild and vector_store is not None:
+        print(f"   - 미완성 버전 컬렉션 삭제: {vector_store.collection_name}")
+        vector_store.delete_collection()
 
-def main():
+
+def main(args):
     print("=" * 70)
     print("📚 문서 인덱싱 시작")
     print("=" * 70)
@@ -79,72 +197,178 @@ def main():
     # 4. 임베딩 모델 초기화
     print("\n🤖 3단계: BGE-M3-KO 임베딩 모델 로딩 중...")
     try:
-        embeddings_model = BGEEmbeddings()
+        # 변경되지 않은 청크는 디스크 캐시에서 재사용
+        embedding_cache = EmbeddingCache()
+        embeddings_model = BGEEmbeddings(
+            cache=embedding_cache,
+            enable_sparse=args.sparse,
+            sparse_head_repo=args.sparse_head_repo,
+            max_seq_length=args.max_seq_length
+        )
         print(f"   ✓ 임베딩 차원: {embeddings_model.get_embedding_dimension()}")
     except Exception as e:
         print(f"\n❌ 임베딩 모델 로드 실패: {e}")
         return
 
-    # 5. 문서 임베딩
-    print("\n🔢 4단계: 문서 임베딩 중...")
+    # 5. 변경된 청크만 임베딩하여 ChromaDB에 반영
+    print("\n🔢 4단계: 변경된 청크 임베딩 및 ChromaDB 반영 중...")
+    vector_store = None
     try:
         texts = [doc.page_content for doc in split_docs]
         metadatas = [doc.metadata for doc in split_docs]
 
-        print(f"   - {len(texts)}개 청크 임베딩 시작...")
-        print("   (시간이 걸릴 수 있습니다...)")
-
-        doc_embeddings = embeddings_model.embed_documents(texts)
-        print(f"   ✓ {len(doc_embeddings)}개 임베딩 생성 완료")
-
-    except Exception as e:
-        print(f"\n❌ 임베딩 생성 실패: {e}")
-        return
-
-    # 6. ChromaDB에 저장
-    print("\n💾 5단계: ChromaDB에 저장 중...")
-    try:
-        # 기존 컬렉션 삭제 후 새로 생성
-        vector_store = ChromaVectorStore(
-            collection_name="commercial_analysis_docs"
-        )
-
-        # 기존 데이터가 있으면 삭제
-        existing_count = vector_store.get_document_count()
-        if existing_count > 0:
-            print(f"   ⚠️  기존 데이터 {existing_count}개 발견")
-            print("   - 기존 컬렉션 삭제 중...")
-            vector_store.delete_collection()
-
-            # 새 컬렉션 생성
+        if args.rebuild:
+            # 활성 버전은 그대로 두고 새 버전 컬렉션에 빌드 (검증 후 전환)
+            vector_store = ChromaVectorStore.create_version(
+                "commercial_analysis_docs",
+                embedding_dim=args.embedding_dim,
+                write_batch_size=args.write_batch_size,
+                hnsw_m=args.hnsw_m,
+                hnsw_construction_ef=args.hnsw_construction_ef,
+                hnsw_search_ef=args.hnsw_search_ef
+            )
+        else:
             vector_store = ChromaVectorStore(
-                collection_name="commercial_analysis_docs"
+                collection_name="commercial_analysis_docs",
+                embedding_dim=args.embedding_dim,
+                write_batch_size=args.write_batch_size,
+                hnsw_m=args.hnsw_m,
+                hnsw_construction_ef=args.hnsw_construction_ef,
+                hnsw_search_ef=args.hnsw_search_ef
             )
-            print("   ✓ 새 컬렉션 생성 완료")
 
-        # 문서 추가
-        ids = vector_store.add_documents(
+        # sparse 가중치는 새로 임베딩한 청크에 대해서만 받아 둠
+        new_sparse: List[dict] = []
+
+        def embed_new_chunks(new_texts):
+            print(f"   - 신규/변경 청크 {len(new_texts)}개 임베딩 시작...")
+            print("   (시간이 걸릴 수 있습니다...)")
+            # float32 행렬 그대로 ChromaDB까지 전달 (Python float 리스트 변환 없음)
+            if args.sparse:
+                # dense + sparse를 같은 forward pass에서 계산 (캐시 미사용)
+                vectors, weights = embeddings_model.embed_documents_with_sparse(new_texts)
+                new_sparse.extend(weights)
+                return vectors
+            if args.embed_workers > 0:
+                # 캐시 미스 청크만 워커 프로세스들이 나누어 임베딩
+                with MultiProcessEmbeddingPool(
+                    num_workers=args.embed_workers,
+                    max_seq_length=args.max_seq_length,
+                    batch_token_budget=embeddings_model.batch_token_budget,
+                    max_batch_size=embeddings_model.max_batch_size
+                ) as pool:
+                    embeddings_model.attach_worker_pool(pool)
+                    try:
+                        return embeddings_model.embed_documents_array(new_texts)
+                    finally:
+                        embeddings_model.attach_worker_pool(None)
+            return embeddings_model.embed_documents_array(new_texts)
+
+        # 같은 청크(경로/페이지/청크 번호/내용 동일)는 건너뛰고,
+        # 문서 폴더에서 사라진 청크는 컬렉션에서 삭제
+        # (컬렉션에 기록된 max_seq_length와 다르면 기존 청크도 새 길이로 다시 임베딩;
+        #  기록이 없는 기존 컬렉션은 모델 기본값으로 임베딩된 것으로 간주)
+        stored_length = vector_store.stored_max_seq_length or embeddings_model.default_max_seq_length
+        reembed = not args.rebuild and stored_length != embeddings_model.max_seq_length
+        if reembed:
+            print(f"   - max_seq_length 변경 ({stored_length} → {embeddings_model.max_seq_length}): "
+                  "기존 청크도 다시 임베딩합니다.")
+        result = vector_store.upsert_documents(
             texts=texts,
-            embeddings=doc_embeddings,
-            metadatas=metadatas
+            metadatas=metadatas,
+            embedding_function=embed_new_chunks,
+            prune_scope="collection",
+            reembed=reembed
         )
+        print(f"   ✓ 추가 {len(result['added'])}개, 유지 {len(result['unchanged'])}개, "
+              f"삭제 {len(result['deleted'])}개")
+        vector_store.record_max_seq_length(embeddings_model.max_seq_length)
+
+        cache_stats = embedding_cache.stats()
+        print(f"   - 캐시 적중: {cache_stats['hits']}개 / 미적중: {cache_stats['misses']}개 "
+              f"(적중률 {cache_stats['hit_ratio']:.1%}, 저장 항목 {cache_stats['entries']}개)")
+
+        # 절단 리포트: max_seq_length를 넘어 뒷부분이 임베딩에 반영되지 않는 청크
+        truncated = embeddings_model.find_truncated(texts)
+        print(f"   - 절단된 청크: {len(truncated)}개 (max_seq_length={embeddings_model.max_seq_length})")
+        for index, length in sorted(truncated, key=lambda item: -item[1])[:20]:
+            metadata = metadatas[index]
+            location = metadata.get("source", "unknown")
+            if "page" in metadata:
+                location += f" p.{metadata['page']}"
+            print(f"     · {location} 청크 #{metadata.get('chunk_index', '?')}: "
+                  f"{length} 토큰 → {embeddings_model.max_seq_length} 토큰")
+        if len(truncated) > 20:
+            print(f"     · ... 외 {len(truncated) - 20}개")
 
-        print(f"   ✓ {len(ids)}개 문서 ChromaDB에 저장 완료")
+    except Exception as e:
+        print(f"\n❌ 임베딩/저장 실패: {e}")
+        discard_build(vector_store, args)
+        return
+
+    # 6. sparse 역색인 / BM25 인덱스 / 메타데이터 파티션 색인 (컬렉션 옆 파일) 갱신
+    print("\n💾 5단계: sparse 역색인 / BM25 인덱스 / 파티션 색인 갱신 중...")
+    try:
+        sparse_index = SparseLexicalIndex.for_vector_store(vector_store)
+        if args.sparse:
+            sparse_index.remove(result["deleted"])
+            sparse_index.add(result["added"], new_sparse)
+
+            # 이전에 sparse 없이 인덱싱된 청크는 가중치를 새로 계산
+            missing = [doc_id for doc_id in result["unchanged"] if doc_id not in sparse_index]
+            if missing:
+                print(f"   - sparse 가중치 없는 기존 청크 {len(missing)}개 계산 중...")
+                stored = vector_store.get_documents(missing)
+                _, missing_sparse = embeddings_model.embed_documents_with_sparse(stored["documents"])
+                sparse_index.add(stored["ids"], missing_sparse)
+            sparse_index.save()
+        elif args.no_sparse and os.path.exists(sparse_index.index_path):
+            os.remove(sparse_index.index_path)
+            print("   - 이전 sparse 역색인 삭제 (--no-sparse)")
+        elif os.path.exists(sparse_index.index_path):
+            # 삭제된 청크만 빼고 유지 (새 청크 가중치는 다음 --sparse 실행 때 채워짐)
+            sparse_index.remove(result["deleted"])
+            sparse_index.save()
+            if result["added"]:
+                print(f"   [WARN] 새 청크 {len(result['added'])}개는 sparse 가중치가 없습니다. "
+                      "(--sparse로 다시 실행하면 채워짐)")
+            print("   - 기존 sparse 역색인 유지 (--sparse 미사용)")
+        else:
+            print("   - sparse 역색인 건너뜀 (--sparse 미사용)")
+
+        # BM25 인덱스: 삭제/추가된 청크만 반영 (처음이면 기존 청크도 추가)
+        bm25_index = BM25Index.for_vector_store(vector_store)
+        bm25_index.remove(result["deleted"])
+        text_by_id = {make_chunk_id(text, metadata): text for text, metadata in zip(texts, metadatas)}
+        bm25_index.add(result["added"], [text_by_id[doc_id] for doc_id in result["added"]])
+        missing = [doc_id for doc_id in result["unchanged"] if doc_id not in bm25_index]
+        if missing:
+            print(f"   - BM25 인덱스에 없는 기존 청크 {len(missing)}개 추가 중...")
+            bm25_index.add(missing, [text_by_id[doc_id] for doc_id in missing])
+        bm25_index.save()
+
+        # 필터 검색(source/file_type/category)이 해당 파티션 벡터만 검색하도록 ID 집합 저장
+        partition_index = vector_store.build_partition_index()
+        for key, sizes in partition_index.sizes().items():
+            print(f"   - 파티션 {key}: {len(sizes)}개 (최대 {max(sizes.values(), default=0)}개 문서)")
 
     except Exception as e:
-        print(f"\n❌ ChromaDB 저장 실패: {e}")
+        print(f"\n❌ sparse 역색인 / BM25 인덱스 / 파티션 색인 갱신 실패: {e}")
+        discard_build(vector_store, args)
         return
 
     # 7. 검증
     print("\n✅ 6단계: 인덱싱 검증 중...")
+    verified = False
     try:
         final_count = vector_store.get_document_count()
-        print(f"   ✓ 최종 저장된 문서 수: {final_count}개")
+        expected_count = len(result["added"]) + len(result["unchanged"])
+        print(f"   ✓ 최종 저장된 문서 수: {final_count}개 (예상 {expected_count}개)")
 
         # 테스트 검색
         print("\n🔍 테스트 검색 수행...")
         test_query = "강남에서 카페 창업"
-        test_embedding = embeddings_model.embed_query(test_query)
+        test_embedding = embeddings_model.embed_query_array(test_query)
         results = vector_store.search(test_embedding, top_k=3)
 
         print(f"   - 검색 쿼리: '{test_query}'")
@@ -163,9 +387,23 @@ def main():
                 print(f"   [{i}] {source} (유사도: {similarity:.3f})")
                 print(f"       {preview}...")
 
+        verified = final_count == expected_count and len(results["documents"]) > 0
+
     except Exception as e:
         print(f"\n⚠️  검증 중 오류: {e}")
 
+    # 8. 새 버전 전환 (--rebuild)
+    if args.rebuild:
+        if not verified:
+            print("\n❌ 검증 실패: 활성 버전을 유지하고 새 버전을 삭제합니다.")
+            discard_build(vector_store, args)
+            return
+
+        print("\n🔀 7단계: 새 버전으로 전환 중...")
+        vector_store.promote(info={"documents": final_count})
+        removed = vector_store.gc_versions(keep=args.keep_versions)
+        print(f"   ✓ 활성 버전: {vector_store.collection_name} (이전 버전 {len(removed)}개 삭제)")
+
     # 완료
     print("\n" + "=" * 70)
     print("🎉 문서 인덱싱 완료!")
@@ -177,9 +415,132 @@ def main():
     print()
 
 
+def format_mb(num_bytes) -> str:
+    return f"{num_bytes / 1024 / 1024:.1f}MB" if num_bytes is not None else "-"
+
+
+def print_storage_report(report: dict) -> None:
+    """maintain 단편화 보고서 출력"""
+    sqlite = report["sqlite"]
+    print(f"   - 전체 디스크 사용량: {format_mb(report['total_bytes'])}")
+    if sqlite:
+        print(f"   - chroma.sqlite3: {format_mb(sqlite['file_bytes'])} "
+              f"(WAL {format_mb(sqlite['wal_bytes'])}, 빈 페이지 {sqlite['freelist_count']}/"
+              f"{sqlite['page_count']} = {sqlite['free_ratio']:.1%}, {format_mb(sqlite['free_bytes'])})")
+        if sqlite["log_rows"] is not None:
+            print(f"   - 쓰기 로그(embeddings_queue): {sqlite['log_rows']}행")
+
+    print(f"\n   {'collection':<36} | {'live':>8} | {'dead':>8} | {'pending':>8} | {'hnsw':>8} | "
+          f"{'deleted':>8} | {'segments':>9} | {'sidecar':>8}")
+    print("   " + "-" * 114)
+    for name, row in sorted(report["collections"].items()):
+        marker = "*" if name == report["active"] else " "
+        counts = [
+            row[key] if row[key] is not None else "-"
+            for key in ("live", "dead", "pending_writes", "hnsw_elements", "hnsw_deleted")
+        ]
+        print(f"  {marker}{name:<36} | " + " | ".join(f"{count:>8}" for count in counts) + " | "
+              f"{format_mb(row['segment_bytes']):>9} | {format_mb(row['sidecar_bytes']):>8}")
+    print("   (* 활성 버전, pending: HNSW에 아직 반영되지 않은 쓰기 로그 수, "
+          "hnsw/deleted: 디스크에 저장된 HNSW 요소 / 삭제 표시 수, -: 알 수 없음)")
+
+    unmapped = [segment for segment in report["segments"] if segment["collection"] is None]
+    if unmapped:
+        print(f"   - 컬렉션을 확인할 수 없는 세그먼트 디렉토리 {len(unmapped)}개 "
+              f"({format_mb(sum(segment['bytes'] for segment in unmapped))})")
+
+
+def print_cold_open(label: str, timing: dict) -> None:
+    if "error" in timing:
+        print(f"   - 콜드 오픈 ({label}): 측정 실패 ({timing['error']})")
+        return
+    first_query = timing["first_query_s"]
+    query_text = f"{first_query * 1000:.0f}ms" if first_query is not None else "-"
+    print(f"   - 콜드 오픈 ({label}): 열기 {timing['open_s'] * 1000:.0f}ms, 첫 검색 {query_text}")
+
+
+def maintain(args):
+    """
+    저장소 유지보수: 단편화 보고 → HNSW 재구성 → SQLite VACUUM → 전후 비교
+
+    HNSW 재구성은 활성 버전을 그대로 둔 채 새 버전에 복사하고 별칭을 전환하므로
+    실행 중인 서버는 계속 검색할 수 있습니다. VACUUM은 다른 프로세스가 쓰는 중이면 실패합니다.
+    """
+    print("=" * 70)
+    print("🧹 인덱스 유지보수 시작")
+    print("=" * 70)
+
+    vector_store = ChromaVectorStore(
+        collection_name="commercial_analysis_docs",
+        write_batch_size=args.write_batch_size,
+        result_cache_size=0
+    )
+    persist_directory = vector_store.persist_directory
+
+    print("\n📊 1단계: 단편화 보고서")
+    before = storage_report(vector_store)
+    print_storage_report(before)
+    cold_before = measure_cold_open(persist_directory, vector_store.alias)
+    print_cold_open("전", cold_before)
+
+    if args.report_only:
+        print("\n💡 --report-only: 변경 없이 종료합니다.")
+        return
+
+    if args.no_rebuild_hnsw:
+        print("\n⏭️  2단계: HNSW 재구성 건너뜀 (--no-rebuild-hnsw)")
+    else:
+        print("\n🔁 2단계: 살아있는 벡터로 HNSW 인덱스 재구성 중...")
+        previous = vector_store.collection_name
+        vector_store = rebuild_active_version(vector_store, keep_versions=args.keep_versions)
+        if previous == vector_store.alias:
+            print(f"   💡 버전 없는 기존 컬렉션({previous})은 삭제하지 않았습니다. "
+                  f"확인 후 직접 삭제하세요.")
+
+    if args.no_vacuum:
+        print("\n⏭️  3단계: SQLite VACUUM 건너뜀 (--no-vacuum)")
+    elif not before["sqlite"]:
+        print("\n⏭️  3단계: chroma.sqlite3가 없어 VACUUM 건너뜀")
+    else:
+        print("\n🗜️  3단계: chroma.sqlite3 VACUUM 중...")
+        try:
+            vacuum_sqlite(persist_directory)
+        except sqlite3.OperationalError as e:
+            print(f"   ⚠️  VACUUM 실패 (다른 프로세스가 쓰는 중일 수 있음): {e}")
+
+    print("\n📊 4단계: 유지보수 후 보고서")
+    after = storage_report(vector_store)
+    print_storage_report(after)
+    cold_after = measure_cold_open(persist_directory, vector_store.alias)
+    print_cold_open("후", cold_after)
+
+    print("\n" + "=" * 70)
+    print("🎉 인덱스 유지보수 완료!")
+    print("=" * 70)
+    print(f"\n   {'':<16} | {'전':>10} | {'후':>10}")
+    print("   " + "-" * 42)
+    rows = [
+        ("디스크 전체", format_mb(before["total_bytes"]), format_mb(after["total_bytes"])),
+        ("chroma.sqlite3", format_mb(before["sqlite"].get("file_bytes")),
+         format_mb(after["sqlite"].get("file_bytes"))),
+    ]
+    for label, key in (("콜드 오픈", "open_s"), ("첫 검색", "first_query_s")):
+        rows.append((label, *[
+            f"{timing[key] * 1000:.0f}ms" if timing.get(key) is not None else "-"
+            for timing in (cold_before, cold_after)
+        ]))
+    for label, value_before, value_after in rows:
+        print(f"   {label:<16} | {value_before:>10} | {value_after:>10}")
+    print()
+
+
 if __name__ == "__main__":
     try:
-        main()
+        args = parse_args()
+        if args.command == "maintain":
+            maintain(args)
+        else:
+            main(args)
     except KeyboardInterrupt:
         print("\n\n⚠️  사용자에 의해 중단되었습니다.")
         sys.exit(0)
@@ -14,6 +14,13 @@ import json
 
 # RAG 모듈 import
 from rag.rag_chain import RAGChain
+from rag.retriever import Retriever
+from rag.embeddings import BGEEmbeddings
+from rag.batching_embedder import BatchingEmbedder
+from rag.numpy_vector_store import NumpyVectorStore
+from rag.quantized_vector_store import QuantizedVectorStore
+from rag.vector_store import ChromaVectorStore
+from rag.bm25_index import BM25Index
 
 # ============================================
 # 환경 변수 로드
@@ -28,40 +35,127 @@ client = OpenAI(
 )
 
 # ============================================
-# RAG 시스템 초기화 (Lazy Loading)
+# RAG 시스템 초기화 (시작 시 워밍업)
 # ============================================
-# 첫 요청 시에만 초기화되어 시작 속도 개선
+# 서버 시작 직후 백그라운드에서 BGE 모델 로드, ChromaDB 열기,
+# 더미 임베딩/검색까지 수행하여 첫 사용자의 10~20초 대기를 없앱니다.
+# 워밍업이 끝나기 전에는 /ready가 503을 반환하므로
+# 로드밸런서는 준비된 노드로만 트래픽을 보낼 수 있습니다.
+#
+# 환경 변수:
+#   RAG_WARMUP_ON_STARTUP: "false"면 기존처럼 첫 요청 시 초기화 (기본 "true")
+#   RAG_WARMUP_MCP: "true"면 워밍업 시 MCP 도구 발견까지 수행 (기본 "false")
+#   RAG_VECTOR_BACKEND: "numpy"면 컬렉션을 메모리로 읽어 정확 검색,
+#                       "quantized"면 int8 후보 검색 + float32 재채점 (기본 "chroma")
+#   RAG_VECTOR_PRECISION: numpy 백엔드 행렬 정밀도, "float16"이면 메모리 절반 (기본 컬렉션 값)
+#   RAG_QUERY_BATCHING: "true"면 동시 요청의 쿼리 임베딩을 모아 한 번에 인코딩 (기본 "true")
+#   RAG_QUERY_BATCH_WAIT_MS: 배치를 모으는 최대 대기 시간 (밀리초, 기본 5)
+#   RAG_BM25: "true"면 청크 텍스트 문자 n-gram BM25 검색을 dense 검색과 RRF로 결합 (기본 "false")
 import asyncio
+from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse
 
-# ============================================
-# RAG 시스템 초기화 (Lazy Loading)
-# ============================================
-# 첫 요청 시에만 초기화되어 시작 속도 개선
 rag_chain = None
+rag_ready = False
+rag_warmup_error = None
+_rag_init_lock = asyncio.Lock()
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """환경 변수 true/false 읽기"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _create_rag_chain() -> RAGChain:
+    """RAGChain 생성 (모델 로드 포함, 블로킹)"""
+    backend = os.getenv("RAG_VECTOR_BACKEND", "chroma").strip().lower()
+    if backend == "numpy":
+        # 소규모 컬렉션은 메모리 상주 정확 검색이 HNSW 조회보다 빠름
+        vector_store = NumpyVectorStore.from_chroma(
+            embedding_precision=os.getenv("RAG_VECTOR_PRECISION") or None
+        )
+    elif backend == "quantized":
+        # 벡터는 int8로 상주(1/4 메모리), 후보만 스냅샷 float32로 재채점
+        vector_store = QuantizedVectorStore.from_chroma()
+    else:
+        vector_store = ChromaVectorStore()
+
+    bm25_index = None
+    if _env_flag("RAG_BM25", False):
+        # 저장된 BM25 인덱스를 열고 컬렉션과 다른 청크만 반영 (없으면 새로 생성)
+        bm25_index = BM25Index.load_or_build(vector_store)
+
+    embeddings = BGEEmbeddings()
+    if _env_flag("RAG_QUERY_BATCHING", True):
+        # asearch 워커 스레드들의 동시 embed_query 호출을 한 번의 encode로 묶음
+        embeddings = BatchingEmbedder(
+            embeddings,
+            max_wait_ms=float(os.getenv("RAG_QUERY_BATCH_WAIT_MS", "5"))
+        )
+    retriever = Retriever(embeddings=embeddings, vector_store=vector_store, bm25_index=bm25_index)
+
+    return RAGChain(
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        retriever=retriever,
+        model_name="gpt-4o-mini",
+        temperature=0.7,
+        max_tokens=1000
+    )
+
 
 async def get_rag_chain():
-    """RAG 체인 인스턴스 반환 (Lazy Loading)"""
+    """RAG 체인 인스턴스 반환 (워밍업 중이면 완료까지 대기)"""
     global rag_chain
-    if rag_chain is None:
-        print("🚀 RAG 시스템 초기화 중... (첫 요청, 10~20초 소요)")
-        rag_chain = RAGChain(
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            model_name="gpt-4o-mini",
-            temperature=0.7,
-            max_tokens=1000
-        )
-
-        # MCP 도구는 첫 요청 시 자동 발견됩니다 (Lazy Loading in RAGChain)
-        print("[OK] RAG system ready! (MCP 도구는 첫 요청 시 발견됩니다)")
+    async with _rag_init_lock:
+        if rag_chain is None:
+            print("🚀 RAG 시스템 초기화 중... (10~20초 소요)")
+            # 모델 로드는 블로킹 작업이므로 이벤트 루프 밖에서 실행
+            rag_chain = await asyncio.to_thread(_create_rag_chain)
+            print("[OK] RAG system ready!")
     return rag_chain
 
+
+async def warm_up_rag():
+    """RAG 체인 생성 + 더미 임베딩/검색 (+ 선택적 MCP 도구 발견)"""
+    global rag_ready, rag_warmup_error
+    try:
+        rag = await get_rag_chain()
+        await rag.warm_up(discover_mcp_tools=_env_flag("RAG_WARMUP_MCP", False))
+        rag_ready = True
+        print("[OK] RAG 워밍업 완료 - /ready 200")
+    except Exception as e:
+        rag_warmup_error = str(e)
+        print(f"[ERROR] RAG 워밍업 실패: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 RAG 워밍업을 백그라운드로 시작 (/health는 즉시 응답)"""
+    global rag_ready
+    warmup_task = None
+    if _env_flag("RAG_WARMUP_ON_STARTUP", True):
+        warmup_task = asyncio.create_task(warm_up_rag())
+    else:
+        # 워밍업을 끈 경우 기존처럼 첫 요청 시 초기화하며 즉시 ready로 간주
+        rag_ready = True
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    if rag_chain is not None and isinstance(rag_chain.retriever.embeddings, BatchingEmbedder):
+        # 대기 중인 쿼리를 처리한 뒤 배칭 워커 종료
+        rag_chain.retriever.embeddings.close()
+
 # ============================================
 # FastAPI 앱 생성
 # ============================================
 app = FastAPI(
     title="JobFlex Chatbot API",
     description="상권 분석 챗봇 백엔드 (OpenAI 연결)",
-    version="2.0.0"  # OpenAI 연결 완료!
+    version="2.0.0",  # OpenAI 연결 완료!
+    lifespan=lifespan
 )
 
 # ============================================
@@ -121,6 +215,25 @@ async def root():
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/ready")
+async def readiness_check():
+    """워밍업(모델 로드, 더미 임베딩/검색)이 끝난 뒤에만 200 반환"""
+    if rag_ready:
+        return {"status": "ready"}
+    if rag_warmup_error is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": rag_warmup_error})
+    return JSONResponse(status_code=503, content={"status": "warming_up"})
+
+@app.get("/api/rag-stats")
+async def rag_stats():
+    """RAG 검색기 통계 (쿼리 캐시 적중률, 검색 실행기 대기열 깊이 등)"""
+    if rag_chain is None:
+        return {"initialized": False}
+    return {
+        "initialized": True,
+        "retriever": rag_chain.retriever.get_stats()
+    }
+
 # ============================================
 # 메인 챗봇 엔드포인트 (OpenAI 연결!)
 # ============================================
@@ -0,0 +1,158 @@
+"""
+동시 쿼리 마이크로 배칭 모듈
+
+여러 요청이 동시에 embed_query를 호출하면 짧은 대기 시간 동안 쿼리를 모아
+한 번의 model.encode 호출로 처리합니다. BGEEmbeddings와 같은 인터페이스를
+제공하므로 Retriever는 변경 없이 그대로 사용할 수 있습니다.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Dict, Any
+
+import numpy as np
+
+from .embeddings import BGEEmbeddings
+
+
+class BatchingEmbedder:
+    """embed_query 호출을 모아서 배치 인코딩하는 래퍼"""
+
+    def __init__(
+        self,
+        embeddings: BGEEmbeddings,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            embeddings: 실제 인코딩을 수행할 BGEEmbeddings 인스턴스
+            max_batch_size: 한 번에 인코딩할 최대 쿼리 수
+            max_wait_ms: 첫 쿼리 도착 후 배치를 모으는 최대 대기 시간 (밀리초)
+        """
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self.batches = 0
+        self.queries = 0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        # 종료 표시(None) 이후에는 새 쿼리가 큐에 들어가지 않도록 확인과 추가를 함께 잠금
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run,
+            name="BatchingEmbedder",
+            daemon=True
+        )
+        self._worker.start()
+
+        print(f"[BATCH] 쿼리 마이크로 배칭 활성화 "
+              f"(max_batch={max_batch_size}, max_wait={max_wait_ms}ms)")
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        단일 쿼리 임베딩 (다른 동시 요청과 함께 배치 처리됨)
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            임베딩 벡터 (list of floats)
+        """
+        return self.embed_query_array(text).tolist()
+
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """embed_query()의 ndarray 버전 (shape (dim,) float32)"""
+        if not text or not text.strip():
+            raise ValueError("텍스트가 비어있습니다.")
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("BatchingEmbedder가 종료되었습니다.")
+            self._queue.put((text, future))
+        return future.result()
+
+    def _run(self) -> None:
+        """배치 수집 및 인코딩 루프 (워커 스레드)"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+
+            # 대기 시간 내 도착한 쿼리를 max_batch_size까지 수집
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._encode_batch(batch)
+
+        self._drain()
+
+    def _drain(self) -> None:
+        """종료 시 큐에 남은 쿼리를 모두 인코딩 (대기 중인 호출자가 멈추지 않도록)"""
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+
+        for start in range(0, len(leftovers), self.max_batch_size):
+            self._encode_batch(leftovers[start:start + self.max_batch_size])
+
+    def _encode_batch(self, batch: list) -> None:
+        """수집된 배치를 한 번에 인코딩하고 각 호출자의 Future에 결과 전달"""
+        texts = [text for text, _ in batch]
+        try:
+            vectors = self.embeddings.embed_queries_array(texts)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.queries += len(batch)
+        for (_, future), vector in zip(batch, vectors):
+            # 행 뷰는 배치 행렬 전체를 붙잡고 호출자끼리 메모리를 공유하므로 행마다 복사
+            future.set_result(vector.copy())
+
+    def stats(self) -> Dict[str, Any]:
+        """배칭 통계 반환"""
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "pending": self._queue.qsize()
+        }
+
+    def close(self) -> None:
+        """워커 스레드 종료 (이미 큐에 들어온 쿼리는 인코딩한 뒤 종료)"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    # 나머지 메서드(embed_documents 등)는 원본 임베딩 모델에 위임
+    def __getattr__(self, name: str):
+        return getattr(self.embeddings, name)
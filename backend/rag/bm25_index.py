@@ -0,0 +1,382 @@
+"""
+BM25 어휘 검색 인덱스 모듈
+
+청크 텍스트를 문자 n-gram으로 토큰화하여 BM25 점수로 검색합니다.
+한국어는 조사가 붙어도(강남구의, 강남구에서) 같은 n-gram을 공유하므로 형태소 분석기 없이도
+지명·업종명·통계 수치처럼 정확한 표현이 중요한 청크를 찾을 수 있습니다.
+
+포스팅은 토큰별 연속 배열(CSR)로 메모리에 상주하며, Chroma 컬렉션 옆 .bm25.npz 파일로 저장됩니다.
+문서 추가는 대기 목록에, 삭제는 삭제 표시로 기록했다가 다음 검색/저장 시 한 번에 병합합니다.
+"""
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    문자 n-gram 토큰화
+
+    NFKC 정규화·소문자 변환 후 단어(공백/문장부호 기준)마다 n-gram을 만듭니다.
+    최소 길이보다 짧은 단어(예: '구', '동')는 단어 자체를 토큰으로 사용합니다.
+
+    Args:
+        text: 입력 텍스트
+        ngram_range: (최소 n, 최대 n)
+    """
+    min_n, max_n = ngram_range
+    tokens: List[str] = []
+    for word in WORD_PATTERN.findall(unicodedata.normalize("NFKC", text).lower()):
+        if len(word) <= min_n:
+            tokens.append(word)
+            continue
+        for n in range(min_n, min(max_n, len(word)) + 1):
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+class BM25Index:
+    """문자 n-gram BM25 역색인"""
+
+    def __init__(
+        self,
+        index_path: Optional[str] = None,
+        ngram_range: Tuple[int, int] = (2, 3),
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """
+        Args:
+            index_path: 인덱스 파일 경로 (.npz, 있으면 로드, None이면 메모리에만 유지)
+            ngram_range: 문자 n-gram 길이 범위
+            k1: 단어 빈도 포화 계수
+            b: 문서 길이 정규화 계수
+        """
+        self.index_path = index_path
+        self.ngram_range = tuple(ngram_range)
+        self.k1 = k1
+        self.b = b
+
+        # 토큰 어휘: 토큰 → 토큰 번호
+        self._terms: List[str] = []
+        self._term_index: Dict[str, int] = {}
+
+        # 문서 행: 행 번호 → 문서 ID, 문서 ID → 행 번호
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._doc_lengths = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+
+        # 병합된 포스팅 (CSR): 토큰 t의 포스팅 = rows/tfs[offsets[t]:offsets[t + 1]]
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._posting_rows = np.zeros(0, dtype=np.int32)
+        self._posting_tfs = np.zeros(0, dtype=np.float32)
+        self._length_norm = np.zeros(0, dtype=np.float32)
+
+        # 다음 병합 때 반영할 추가 문서 포스팅
+        self._pending_terms: List[int] = []
+        self._pending_rows: List[int] = []
+        self._pending_tfs: List[int] = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        self.queries = 0
+        self.total_query_seconds = 0.0
+        self.max_query_seconds = 0.0
+
+        if index_path and os.path.exists(index_path):
+            self.load()
+
+    @staticmethod
+    def path_for(persist_directory: str, collection_name: str) -> str:
+        """컬렉션 옆 인덱스 파일 경로"""
+        return os.path.join(persist_directory, f"{collection_name}.bm25.npz")
+
+    @classmethod
+    def for_vector_store(cls, vector_store, **kwargs) -> "BM25Index":
+        """벡터 스토어 컬렉션 옆 경로의 인덱스 열기 (persist_directory가 없으면 메모리 전용)"""
+        persist_directory = getattr(vector_store, "persist_directory", None)
+        path = None
+        if persist_directory:
+            path = cls.path_for(persist_directory, vector_store.collection_name)
+        return cls(path, **kwargs)
+
+    @classmethod
+    def load_or_build(cls, vector_store, page_size: int = 1000, **kwargs) -> "BM25Index":
+        """
+        저장된 인덱스를 열고 벡터 스토어와 다른 문서만 추가/삭제 (변경 시 저장)
+
+        파일이 없으면 저장된 청크 텍스트 전체로 새로 만듭니다.
+        """
+        start = time.perf_counter()
+        index = cls.for_vector_store(vector_store, **kwargs)
+        changes = index.sync(vector_store, page_size=page_size)
+        if (changes["added"] or changes["removed"]) and index.index_path:
+            index.save()
+        print(f"[OK] BM25 인덱스 준비 완료 ({len(index)}개 문서, 추가 {changes['added']}개, "
+              f"삭제 {changes['removed']}개, {time.perf_counter() - start:.2f}s)")
+        return index
+
+    def add(self, ids: List[str], texts: List[str]) -> None:
+        """
+        문서 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            ids: 문서 ID 리스트
+            texts: 문서 텍스트 리스트
+        """
+        if len(ids) != len(texts):
+            raise ValueError("ID와 텍스트의 개수가 일치하지 않습니다.")
+
+        with self._lock:
+            self._remove_locked([doc_id for doc_id in ids if doc_id in self._rows])
+
+            first_row = len(self._row_ids)
+            lengths = np.zeros(len(ids), dtype=np.float32)
+            for offset, (doc_id, text) in enumerate(zip(ids, texts)):
+                row = first_row + offset
+                counts = Counter(char_ngrams(text, self.ngram_range))
+                for term, tf in counts.items():
+                    term_id = self._term_index.get(term)
+                    if term_id is None:
+                        term_id = self._term_index[term] = len(self._terms)
+                        self._terms.append(term)
+                    self._pending_terms.append(term_id)
+                    self._pending_rows.append(row)
+                    self._pending_tfs.append(tf)
+                lengths[offset] = sum(counts.values())
+                self._row_ids.append(doc_id)
+                self._rows[doc_id] = row
+
+            self._doc_lengths = np.concatenate([self._doc_lengths, lengths])
+            self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+            self._dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """문서 삭제 (다음 병합 시 포스팅에서 제거)"""
+        with self._lock:
+            self._remove_locked(ids)
+
+    def _remove_locked(self, ids: Iterable[str]) -> None:
+        for doc_id in ids:
+            row = self._rows.pop(doc_id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._row_ids[row] = None
+                self._dirty = True
+
+    def clear(self) -> None:
+        """인덱스 전체 삭제"""
+        with self._lock:
+            self._remove_locked(list(self._rows))
+            self._compact_locked()
+
+    def sync(self, vector_store, page_size: int = 1000) -> Dict[str, int]:
+        """
+        벡터 스토어에 저장된 청크와 일치하도록 차이만 반영
+
+        저장된 ID 목록만 읽어(문서/임베딩 제외) 비교하고, 새로 생긴 ID의 텍스트만
+        page_size 단위로 가져와 추가합니다.
+
+        Returns:
+            {"added": 추가한 문서 수, "removed": 삭제한 문서 수}
+        """
+        stored_ids = set(vector_store.filter_ids())
+        with self._lock:
+            indexed_ids = set(self._rows)
+        new_ids = [doc_id for doc_id in stored_ids if doc_id not in indexed_ids]
+        stale = [doc_id for doc_id in indexed_ids if doc_id not in stored_ids]
+
+        for start in range(0, len(new_ids), page_size):
+            page = vector_store.get_documents(new_ids[start:start + page_size])
+            self.add(page["ids"], [doc or "" for doc in page["documents"]])
+        self.remove(stale)
+        return {"added": len(new_ids), "removed": len(stale)}
+
+    def _compact_locked(self) -> None:
+        """대기 중인 추가/삭제를 CSR 포스팅에 병합 (삭제된 행과 빈 토큰은 제거)"""
+        if not self._dirty:
+            return
+
+        base_terms = np.repeat(
+            np.arange(len(self._offsets) - 1, dtype=np.int64),
+            np.diff(self._offsets)
+        )
+        terms = np.concatenate([base_terms, np.asarray(self._pending_terms, dtype=np.int64)])
+        rows = np.concatenate([self._posting_rows, np.asarray(self._pending_rows, dtype=np.int32)])
+        tfs = np.concatenate([self._posting_tfs, np.asarray(self._pending_tfs, dtype=np.float32)])
+
+        keep = self._alive[rows]
+        terms, rows, tfs = terms[keep], rows[keep], tfs[keep]
+
+        # 살아있는 행만 0부터 다시 번호 매김
+        new_row = np.cumsum(self._alive, dtype=np.int64) - 1
+        rows = new_row[rows].astype(np.int32)
+        alive_rows = np.flatnonzero(self._alive)
+        self._row_ids = [self._row_ids[row] for row in alive_rows]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._row_ids)}
+        self._doc_lengths = self._doc_lengths[alive_rows]
+        self._alive = np.ones(len(alive_rows), dtype=bool)
+
+        # 포스팅이 남은 토큰만 어휘에 유지
+        df = np.bincount(terms, minlength=len(self._terms))
+        used = np.flatnonzero(df)
+        new_term = np.full(len(self._terms), -1, dtype=np.int64)
+        new_term[used] = np.arange(len(used))
+        terms = new_term[terms]
+        self._terms = [self._terms[term_id] for term_id in used]
+        self._term_index = {term: term_id for term_id, term in enumerate(self._terms)}
+
+        order = np.lexsort((rows, terms))
+        self._posting_rows = rows[order]
+        self._posting_tfs = tfs[order]
+        self._offsets = np.zeros(len(self._terms) + 1, dtype=np.int64)
+        np.cumsum(df[used], out=self._offsets[1:])
+
+        self._pending_terms, self._pending_rows, self._pending_tfs = [], [], []
+        self._update_length_norm()
+        self._dirty = False
+
+    def _update_length_norm(self) -> None:
+        """문서별 BM25 길이 정규화 항 k1 × (1 - b + b × 길이 / 평균 길이)"""
+        average = float(self._doc_lengths.mean()) if len(self._doc_lengths) else 0.0
+        if average > 0:
+            ratio = self._doc_lengths / average
+        else:
+            ratio = np.ones_like(self._doc_lengths)
+        self._length_norm = (self.k1 * (1 - self.b + self.b * ratio)).astype(np.float32)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        allowed_ids: Optional[Collection[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 점수 기준 상위 문서 검색
+
+        Args:
+            query: 검색 쿼리 텍스트
+            top_k: 반환할 문서 개수
+            allowed_ids: 검색 대상 문서 ID (메타데이터 필터 통과 문서, None이면 전체)
+
+        Returns:
+            [(문서 ID, 점수), ...] 점수 내림차순 (일치하는 n-gram이 없는 문서 제외)
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._compact_locked()
+            results = self._search_locked(query, top_k, allowed_ids)
+
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.total_query_seconds += elapsed
+            self.max_query_seconds = max(self.max_query_seconds, elapsed)
+        return results
+
+    def _search_locked(
+        self,
+        query: str,
+        top_k: int,
+        allowed_ids: Optional[Collection[str]] = None
+    ) -> List[Tuple[str, float]]:
+        num_docs = len(self._row_ids)
+        if num_docs == 0 or top_k <= 0:
+            return []
+
+        allowed = None
+        if allowed_ids is not None:
+            allowed = np.zeros(num_docs, dtype=bool)
+            allowed[[self._rows[doc_id] for doc_id in allowed_ids if doc_id in self._rows]] = True
+
+        scores = np.zeros(num_docs, dtype=np.float32)
+        for term, query_tf in Counter(char_ngrams(query, self.ngram_range)).items():
+            term_id = self._term_index.get(term)
+            if term_id is None:
+                continue
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            rows = self._posting_rows[start:end]
+            tfs = self._posting_tfs[start:end]
+            idf = np.log(1 + (num_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += query_tf * idf * tfs * (self.k1 + 1) / (tfs + self._length_norm[rows])
+
+        if allowed is not None:
+            scores[~allowed] = 0
+        matched = np.flatnonzero(scores)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(self._row_ids[row], float(scores[row])) for row in matched]
+
+    def stats(self) -> Dict[str, float]:
+        """인덱스 크기와 쿼리 지연 통계"""
+        with self._lock:
+            return {
+                "documents": len(self._rows),
+                "terms": len(self._terms),
+                "postings": int(len(self._posting_rows) + len(self._pending_rows)),
+                "queries": self.queries,
+                "avg_query_ms": round(self.total_query_seconds / self.queries * 1000, 3) if self.queries else 0.0,
+                "max_query_ms": round(self.max_query_seconds * 1000, 3)
+            }
+
+    def save(self) -> None:
+        """CSR 형식(.npz)으로 저장"""
+        if not self.index_path:
+            raise ValueError("index_path가 없어 BM25 인덱스를 저장할 수 없습니다.")
+
+        with self._lock:
+            self._compact_locked()
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+            # 서버와 index_documents.py가 동시에 저장해도 임시 파일이 겹치지 않도록 PID 포함
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp.npz"
+            np.savez_compressed(
+                tmp_path,
+                doc_ids=np.array(self._row_ids, dtype=np.str_),
+                terms=np.array(self._terms, dtype=np.str_),
+                offsets=self._offsets,
+                posting_rows=self._posting_rows,
+                posting_tfs=self._posting_tfs.astype(np.int32),
+                doc_lengths=self._doc_lengths.astype(np.int32),
+                ngram_range=np.array(self.ngram_range, dtype=np.int32)
+            )
+            os.replace(tmp_path, self.index_path)
+        print(f"[OK] BM25 인덱스 저장 완료 ({len(self._row_ids)}개 문서, {len(self._terms)}개 n-gram)")
+
+    def load(self) -> None:
+        """.npz 파일에서 인덱스 로드 (n-gram 설정이 다르면 비워 둠 → sync()로 다시 생성)"""
+        data = np.load(self.index_path)
+        if tuple(data["ngram_range"].tolist()) != self.ngram_range:
+            print(f"[WARN] BM25 인덱스 n-gram 설정 불일치 ({tuple(data['ngram_range'].tolist())} ≠ "
+                  f"{self.ngram_range}): 다시 생성합니다.")
+            return
+
+        with self._lock:
+            self._row_ids = data["doc_ids"].tolist()
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._row_ids)}
+            self._terms = data["terms"].tolist()
+            self._term_index = {term: term_id for term_id, term in enumerate(self._terms)}
+            self._offsets = data["offsets"].astype(np.int64)
+            self._posting_rows = data["posting_rows"].astype(np.int32)
+            self._posting_tfs = data["posting_tfs"].astype(np.float32)
+            self._doc_lengths = data["doc_lengths"].astype(np.float32)
+            self._alive = np.ones(len(self._row_ids), dtype=bool)
+            self._pending_terms, self._pending_rows, self._pending_tfs = [], [], []
+            self._dirty = False
+            self._update_length_norm()
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -0,0 +1,136 @@
+"""
+컬렉션 별칭(alias) 관리 모듈
+
+인덱스를 새로 만들 때 기존 컬렉션을 지우지 않고 버전별 컬렉션
+(예: commercial_analysis_docs__v3)을 만든 뒤, 검증이 끝나면 별칭이 가리키는
+활성 버전만 원자적으로 교체합니다(blue/green). 별칭 정보는 ChromaDB 저장 경로의
+aliases.json에 저장되며, 서버 프로세스는 파일 변경을 감지해 재시작 없이 새 버전을 사용합니다.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+VERSION_SEPARATOR = "__v"
+
+
+def versioned_name(alias: str, version: int) -> str:
+    """버전별 물리 컬렉션 이름"""
+    return f"{alias}{VERSION_SEPARATOR}{version}"
+
+
+def parse_version(alias: str, collection_name: str) -> Optional[int]:
+    """
+    물리 컬렉션 이름에서 버전 번호 추출
+
+    별칭과 같은 이름(별칭 도입 이전 컬렉션)은 버전 0, 관련 없는 이름은 None
+    """
+    if collection_name == alias:
+        return 0
+    match = re.fullmatch(re.escape(alias + VERSION_SEPARATOR) + r"(\d+)", collection_name)
+    return int(match.group(1)) if match else None
+
+
+class CollectionAliasRegistry:
+    """별칭 → 활성 물리 컬렉션 포인터 파일(aliases.json) 관리"""
+
+    FILE_NAME = "aliases.json"
+
+    def __init__(self, persist_directory: str):
+        """
+        Args:
+            persist_directory: ChromaDB 저장 경로 (포인터 파일 위치)
+        """
+        self.persist_directory = persist_directory
+        self.path = os.path.join(persist_directory, self.FILE_NAME)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, aliases: Dict[str, Dict[str, Any]]) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일을 봄)"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(aliases, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def get(self, alias: str) -> Optional[Dict[str, Any]]:
+        """별칭 레코드 ({"collection", "version", "promoted_at", ...}) 또는 None"""
+        return self._read().get(alias)
+
+    def resolve(self, alias: str) -> str:
+        """별칭이 가리키는 물리 컬렉션 이름 (레코드가 없으면 별칭 그대로)"""
+        record = self.get(alias)
+        return record["collection"] if record else alias
+
+    def mtime(self) -> float:
+        """포인터 파일 수정 시각 (없으면 0)"""
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def promote(
+        self,
+        alias: str,
+        collection_name: str,
+        info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        별칭을 새 물리 컬렉션으로 원자적으로 전환
+
+        Args:
+            alias: 별칭
+            collection_name: 활성화할 물리 컬렉션 이름
+            info: 레코드에 함께 남길 정보 (문서 수 등)
+
+        Returns:
+            새 별칭 레코드
+        """
+        version = parse_version(alias, collection_name)
+        if version is None:
+            raise ValueError(f"'{collection_name}'은(는) 별칭 '{alias}'의 버전 컬렉션이 아닙니다.")
+
+        with self._lock:
+            aliases = self._read()
+            previous = aliases.get(alias, {}).get("collection")
+            record = {
+                "collection": collection_name,
+                "version": version,
+                "previous": previous,
+                "promoted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **(info or {})
+            }
+            aliases[alias] = record
+            self._write(aliases)
+
+        print(f"[ALIAS] '{alias}' → '{collection_name}' 전환 완료 (이전: {previous or alias})")
+        return record
+
+    def versions(self, alias: str, collection_names: List[str]) -> List[str]:
+        """collection_names 중 별칭의 버전 컬렉션을 버전 오름차순으로 반환"""
+        versioned = [
+            (parse_version(alias, name), name)
+            for name in collection_names
+            if parse_version(alias, name) is not None
+        ]
+        return [name for _, name in sorted(versioned)]
+
+    def next_version(self, alias: str, collection_names: List[str]) -> int:
+        """다음 빌드에 사용할 버전 번호"""
+        used = [parse_version(alias, name) for name in self.versions(alias, collection_names)]
+        record = self.get(alias)
+        if record:
+            used.append(record["version"])
+        return max(used, default=0) + 1
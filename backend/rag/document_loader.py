@@ -160,6 +160,10 @@ class DirectoryLoader:
                 try:
                     loader = self._get_loader(str(file_path))
                     docs = loader.load()
+                    # 하위 폴더의 같은 파일명을 구분하기 위한 상대 경로 (청크 ID 생성에 사용)
+                    relative_path = file_path.relative_to(self.directory_path).as_posix()
+                    for doc in docs:
+                        doc.metadata["relative_path"] = relative_path
                     documents.extend(docs)
                 except Exception as e:
                     print(f"[WARN] File load failed (skipped): {file_path.name}, Error: {e}")
@@ -0,0 +1,333 @@
+"""
+임베딩 캐시 모듈
+
+- EmbeddingCache: (모델 이름, 모델 리비전, 정규화된 청크 텍스트 해시)를 키로
+  임베딩 벡터를 SQLite BLOB(float32)으로 저장하는 디스크 캐시.
+  재인덱싱 시 변경되지 않은 청크는 모델을 다시 거치지 않습니다.
+- QueryEmbeddingCache: 검색 쿼리 임베딩용 인메모리 LRU 캐시 (선택적 TTL).
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """콘텐츠 주소 기반 임베딩 캐시 (SQLite + LRU 제거)"""
+
+    # SQLite 바인딩 변수 개수 제한을 피하기 위한 조회 단위
+    _QUERY_CHUNK = 500
+
+    def __init__(
+        self,
+        cache_path: str = None,
+        max_entries: int = 200_000
+    ):
+        """
+        Args:
+            cache_path: 캐시 파일 경로 (None이면 data/embedding_cache.sqlite3)
+            max_entries: 최대 저장 벡터 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+        """
+        if cache_path is None:
+            current_dir = Path(__file__).parent.parent
+            cache_path = str(current_dir / "data" / "embedding_cache.sqlite3")
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)"
+        )
+        self._conn.commit()
+
+        print(f"[CACHE] 임베딩 캐시 준비 완료 ({cache_path}, 항목 수: {len(self)})")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """캐시 키 계산용 텍스트 정규화 (NFC + 공백 정리)"""
+        text = unicodedata.normalize("NFC", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    @classmethod
+    def make_key(cls, model_name: str, revision: Optional[str], text: str) -> str:
+        """(모델, 리비전, 정규화 텍스트) 해시 키 생성"""
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update((revision or "").encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(cls.normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        여러 키의 벡터 조회
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            {key: float32 벡터} (캐시에 있는 항목만)
+        """
+        found: Dict[str, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        with self._lock:
+            for start in range(0, len(unique_keys), self._QUERY_CHUNK):
+                chunk = unique_keys[start:start + self._QUERY_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+
+            # LRU 갱신
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """
+        여러 벡터 저장 후 용량 초과분 제거
+
+        Args:
+            items: {key: 벡터}
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            vector = np.ascontiguousarray(vector, dtype=np.float32)
+            rows.append((key, int(vector.shape[0]), vector.tobytes(), now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        """max_entries 초과 시 가장 오래 사용되지 않은 항목 제거 (lock 보유 상태에서 호출)"""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (overflow,)
+        )
+        self.evictions += overflow
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "max_entries": self.max_entries
+        }
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class QueryEmbeddingCache:
+    """검색 쿼리 임베딩용 인메모리 LRU 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            max_entries: 최대 캐시 항목 수
+            ttl_seconds: 항목 유효 시간 (초, None이면 만료 없음)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+        # {정규화 쿼리: (임베딩, 생성 시각, 계산 소요 ms)}
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], Any]
+    ) -> Any:
+        """
+        캐시된 임베딩 반환, 없으면 compute(text)로 계산 후 저장
+
+        Args:
+            text: 쿼리 텍스트
+            compute: 캐시 미스 시 호출할 임베딩 함수
+
+        Returns:
+            임베딩 벡터
+        """
+        key = EmbeddingCache.normalize_text(text)
+        now = time.monotonic()
+
+        with self._lock:
+            found, embedding = self._lookup(key, now)
+        if found:
+            return embedding
+
+        start = time.perf_counter()
+        embedding = compute(text)
+        cost_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._store(key, embedding, now, cost_ms)
+
+        return embedding
+
+    def get_or_compute_many(
+        self,
+        texts: List[str],
+        compute_many: Callable[[List[str]], Sequence[Any]]
+    ) -> List[Any]:
+        """
+        여러 쿼리의 캐시된 임베딩 반환, 미스 쿼리는 compute_many 한 번으로 계산 후 저장
+
+        Args:
+            texts: 쿼리 텍스트 리스트
+            compute_many: 캐시 미스 텍스트 리스트를 받아 같은 순서의 임베딩을 반환하는 함수
+
+        Returns:
+            texts와 같은 순서의 임베딩 리스트
+        """
+        keys = [EmbeddingCache.normalize_text(text) for text in texts]
+        now = time.monotonic()
+        results: List[Any] = [None] * len(texts)
+
+        # 같은 정규화 키는 한 번만 계산
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in missing:
+                    missing[key].append(i)
+                    continue
+                found, embedding = self._lookup(key, now)
+                if found:
+                    results[i] = embedding
+                else:
+                    missing[key] = [i]
+
+        if missing:
+            start = time.perf_counter()
+            computed = compute_many([texts[positions[0]] for positions in missing.values()])
+            cost_ms = (time.perf_counter() - start) * 1000 / len(missing)
+
+            with self._lock:
+                for (key, positions), embedding in zip(missing.items(), computed):
+                    self._store(key, embedding, now, cost_ms)
+                    for i in positions:
+                        results[i] = embedding
+
+        return results
+
+    def _lookup(self, key: str, now: float):
+        """(적중 여부, 임베딩) 반환 및 통계 갱신 (lock 보유 상태에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            embedding, created_at, cost_ms = entry
+            if self.ttl_seconds is None or now - created_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_ms += cost_ms
+                return True, embedding
+            # 만료된 항목 제거
+            del self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def _store(self, key: str, embedding: Any, now: float, cost_ms: float) -> None:
+        """항목 저장 및 LRU 제거 (lock 보유 상태에서 호출)"""
+        self._entries[key] = (embedding, now, cost_ms)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_ms": round(self.saved_ms, 1),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries
+        }
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
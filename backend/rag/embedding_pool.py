@@ -0,0 +1,257 @@
+"""
+멀티 프로세스 임베딩 풀 모듈
+
+대량 인덱싱 시 청크 목록을 샤드로 나누어 여러 워커 프로세스에서 동시에
+임베딩합니다. 각 워커는 CPU 코어 일부에 고정(pinning)되고 자체 모델 사본을
+로드하며, 결과는 원본 순서대로 스트리밍됩니다.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+def _split_cores(num_workers: int) -> List[List[int]]:
+    """사용 가능한 CPU 코어를 워커 수만큼 연속 구간으로 분할"""
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+
+    per_worker = max(len(cores) // num_workers, 1)
+    slices = []
+    for i in range(num_workers):
+        start = (i * per_worker) % len(cores)
+        if i == num_workers - 1 and num_workers <= len(cores):
+            # 나누어떨어지지 않는 나머지 코어는 마지막 워커에 배정
+            slices.append(cores[start:])
+        else:
+            slices.append(cores[start:start + per_worker])
+    return slices
+
+
+def _worker_main(
+    worker_id: int,
+    cores: List[int],
+    model_kwargs: dict,
+    tasks: "mp.Queue",
+    results: "mp.Queue"
+) -> None:
+    """워커 프로세스: 코어 고정 후 모델 로드, 샤드 단위 임베딩"""
+    # 코어 고정 및 intra-op 스레드 수를 코어 수에 맞춤
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+    torch.set_num_threads(len(cores))
+
+    from .embeddings import BGEEmbeddings
+
+    try:
+        embeddings = BGEEmbeddings(device="cpu", **model_kwargs)
+    except Exception as e:
+        results.put(("error", worker_id, repr(e)))
+        return
+    results.put(("ready", worker_id, None))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        call_id, shard_id, texts = task
+        try:
+            vectors = embeddings._encode_documents(texts)
+            results.put(("done", (call_id, shard_id), vectors))
+        except Exception as e:
+            results.put(("error", (call_id, shard_id), repr(e)))
+
+
+class MultiProcessEmbeddingPool:
+    """CPU 코어 고정 멀티 프로세스 문서 임베딩 풀"""
+
+    def __init__(
+        self,
+        num_workers: int,
+        model_name: str = "dragonkue/BGE-m3-ko",
+        revision: Optional[str] = None,
+        backend: str = "torch",
+        shard_size: int = 256,
+        max_seq_length: Optional[int] = None,
+        batch_token_budget: int = 16384,
+        max_batch_size: int = 128,
+        poll_interval: float = 1.0
+    ):
+        """
+        Args:
+            num_workers: 워커 프로세스 수
+            model_name: HuggingFace 모델 이름
+            revision: 모델 리비전
+            backend: 추론 백엔드 ('torch', 'onnx', 'onnx-int8')
+            shard_size: 워커에 한 번에 전달할 청크 수
+            max_seq_length: 최대 시퀀스 길이 (None이면 모델 기본값)
+            batch_token_budget: 워커 내 문서 배치당 최대 패딩 포함 토큰 수
+            max_batch_size: 워커 내 문서 배치당 최대 청크 수
+            poll_interval: 결과 대기 중 워커 생존 여부를 확인하는 간격 (초)
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers는 1 이상이어야 합니다.")
+
+        self.num_workers = num_workers
+        self.shard_size = shard_size
+        self.poll_interval = poll_interval
+        # encode_iter 호출 번호 (중단된 이전 호출의 늦은 결과를 구분)
+        self._call_ids = itertools.count()
+
+        # CUDA/토크나이저 스레드 상태를 물려받지 않도록 spawn 사용
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+
+        model_kwargs = {
+            "model_name": model_name,
+            "revision": revision,
+            "backend": backend,
+            "max_seq_length": max_seq_length,
+            "batch_token_budget": batch_token_budget,
+            "max_batch_size": max_batch_size
+        }
+        core_slices = _split_cores(num_workers)
+
+        print(f"[POOL] 임베딩 워커 {num_workers}개 시작 중... "
+              f"(워커당 코어 {len(core_slices[0])}개)")
+
+        self._workers = []
+        for worker_id, cores in enumerate(core_slices):
+            process = ctx.Process(
+                target=_worker_main,
+                args=(worker_id, cores, model_kwargs, self._tasks, self._results),
+                daemon=True
+            )
+            process.start()
+            self._workers.append(process)
+
+        # 모든 워커의 모델 로드 완료 대기
+        for _ in range(num_workers):
+            try:
+                status, worker_id, error = self._get_result()
+            except RuntimeError:
+                self.close()
+                raise
+            if status == "error":
+                self.close()
+                raise RuntimeError(f"임베딩 워커 {worker_id} 초기화 실패: {error}")
+
+        print(f"[OK] 임베딩 워커 {num_workers}개 준비 완료")
+
+    def encode_iter(self, texts: List[str]) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        청크를 샤드로 나누어 워커에 분배하고 결과를 원본 순서대로 스트리밍
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Yields:
+            (시작 인덱스, shape (샤드 크기, dim) float32 행렬)
+
+        샤드 오류로 예외가 나거나 호출자가 순회를 중단해도, 이 호출의 남은 결과는
+        호출 번호가 달라 다음 호출에서 버려지므로 다른 호출의 결과와 섞이지 않습니다.
+        """
+        call_id = next(self._call_ids)
+        shards = [
+            texts[start:start + self.shard_size]
+            for start in range(0, len(texts), self.shard_size)
+        ]
+        for shard_id, shard in enumerate(shards):
+            self._tasks.put((call_id, shard_id, shard))
+
+        # 순서가 뒤바뀐 결과는 버퍼에 보관했다가 차례가 되면 내보냄
+        pending: Dict[int, np.ndarray] = {}
+        next_shard = 0
+        received = 0
+        try:
+            while received < len(shards):
+                status, (result_call_id, shard_id), payload = self._get_result()
+                if result_call_id != call_id:
+                    continue  # 이전에 중단된 호출의 결과
+                received += 1
+                if status == "error":
+                    raise RuntimeError(f"샤드 {shard_id} 임베딩 실패: {payload}")
+                pending[shard_id] = payload
+
+                while next_shard in pending:
+                    yield next_shard * self.shard_size, pending.pop(next_shard)
+                    next_shard += 1
+        finally:
+            if received < len(shards):
+                self._discard_tasks(call_id)
+
+    def _get_result(self) -> tuple:
+        """
+        결과 큐에서 하나 꺼내기 (poll_interval마다 워커 생존 여부 확인)
+
+        워커가 OOM/segfault 등으로 종료되면 처리 중이던 샤드 결과가 오지 않으므로
+        무한 대기하지 않고 RuntimeError를 발생시킵니다.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                dead = [
+                    (worker_id, process.exitcode)
+                    for worker_id, process in enumerate(self._workers)
+                    if not process.is_alive()
+                ]
+                if dead:
+                    detail = ", ".join(f"워커 {worker_id} (exitcode={code})" for worker_id, code in dead)
+                    raise RuntimeError(f"임베딩 워커가 종료되었습니다: {detail}")
+
+    def _discard_tasks(self, call_id: int) -> None:
+        """중단된 호출의 아직 시작되지 않은 샤드 작업을 큐에서 제거 (워커 낭비 방지)"""
+        kept = []
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is None or task[0] != call_id:
+                kept.append(task)
+        for task in kept:
+            self._tasks.put(task)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        전체 청크 임베딩 (원본 순서의 float32 행렬)
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            shape (len(texts), dim) float32 행렬
+        """
+        embeddings = None
+        for start, block in self.encode_iter(texts):
+            if embeddings is None:
+                embeddings = np.empty((len(texts), block.shape[1]), dtype=np.float32)
+            embeddings[start:start + len(block)] = block
+            print(f"[POOL] {min(start + len(block), len(texts))}/{len(texts)} 청크 임베딩 완료")
+        return embeddings
+
+    def close(self) -> None:
+        """워커 프로세스 종료"""
+        for _ in self._workers:
+            self._tasks.put(None)
+        for process in self._workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,20 +3,98 @@ BGE-M3-KO 임베딩 모델을 사용한 텍스트 벡터화 모듈
 
 BGE-M3-KO는 한국어에 최적화된 임베딩 모델입니다.
 HuggingFace: dragonkue/BGE-m3-ko
+
+추론 백엔드:
+- "torch": PyTorch (기본값)
+- "onnx": ONNX Runtime (CPU 추론 가속)
+- "onnx-int8": ONNX Runtime + 동적 int8 양자화 (최초 실행 시 로컬에 내보내기)
 """
 
 from sentence_transformers import SentenceTransformer
-from typing import List, Union
+from typing import Any, Dict, List, Tuple, Union, Optional
+from pathlib import Path
+import itertools
+import threading
+import numpy as np
 import torch
+from tqdm.auto import tqdm
+
+from .embedding_cache import EmbeddingCache
+
+
+class SequenceLengthStats:
+    """인코딩 입력의 토큰 길이 통계 (히스토그램 + 절단 건수)"""
+
+    # 히스토그램 구간 상한 (토큰 수)
+    BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """통계 초기화"""
+        self.histogram = {f"<={bound}": 0 for bound in self.BUCKETS}
+        self.histogram[f">{self.BUCKETS[-1]}"] = 0
+        self.count = 0
+        self.truncated = 0
+        self.total_tokens = 0
+        self.max_length = 0
+
+    def record(self, lengths: List[int], max_seq_length: int) -> None:
+        """
+        토큰 길이 기록
+
+        Args:
+            lengths: 절단 전 토큰 길이 리스트
+            max_seq_length: 모델 최대 시퀀스 길이 (초과분은 절단된 것으로 집계)
+        """
+        for length in lengths:
+            for bound in self.BUCKETS:
+                if length <= bound:
+                    self.histogram[f"<={bound}"] += 1
+                    break
+            else:
+                self.histogram[f">{self.BUCKETS[-1]}"] += 1
+
+            self.count += 1
+            self.total_tokens += min(length, max_seq_length)
+            self.max_length = max(self.max_length, length)
+            if length > max_seq_length:
+                self.truncated += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """통계 딕셔너리 반환"""
+        return {
+            "count": self.count,
+            "truncated": self.truncated,
+            "avg_tokens": round(self.total_tokens / self.count, 1) if self.count else 0.0,
+            "max_length": self.max_length,
+            "histogram": dict(self.histogram)
+        }
 
 
 class BGEEmbeddings:
     """BGE-M3-KO 임베딩 모델 래퍼 클래스"""
 
+    SUPPORTED_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+    # 동적 int8 양자화 설정 (sentence-transformers quantization_config 이름)
+    ONNX_QUANTIZATION_CONFIG = "avx2"
+
     def __init__(
         self,
         model_name: str = "dragonkue/BGE-m3-ko",
-        device: str = None
+        device: str = None,
+        revision: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        backend: str = "torch",
+        onnx_export_dir: str = None,
+        batch_token_budget: int = 16384,
+        max_batch_size: int = 128,
+        max_seq_length: Optional[int] = None,
+        enable_sparse: bool = False,
+        sparse_head_repo: Optional[str] = None,
+        query_length_sample_every: int = 32
     ):
         """
         BGE-M3-KO 임베딩 모델 초기화
@@ -24,23 +102,158 @@ class BGEEmbeddings:
         Args:
             model_name: HuggingFace 모델 이름 (기본값: dragonkue/BGE-m3-ko)
             device: 실행 디바이스 ('cuda', 'cpu', None=자동감지)
+            revision: 모델 리비전 (브랜치/태그/커밋, None이면 기본 브랜치)
+            cache: 문서 임베딩 디스크 캐시 (None이면 캐시 사용 안 함)
+            backend: 추론 백엔드 ('torch', 'onnx', 'onnx-int8')
+            onnx_export_dir: int8 양자화 모델 저장 경로 (None이면 data/onnx/<모델명>)
+            batch_token_budget: 문서 배치당 최대 패딩 포함 토큰 수 (배치 크기 자동 결정)
+            max_batch_size: 문서 배치당 최대 청크 수
+            max_seq_length: 최대 시퀀스 길이 (토큰, 초과분 절단; None이면 모델 기본값)
+            enable_sparse: BGE-M3 sparse 어휘 가중치 출력 활성화
+            sparse_head_repo: sparse_linear.pt를 받을 저장소 (None이면 model_name;
+                모델 저장소에 헤드가 없으면 BAAI/bge-m3 등을 명시해야 함)
+            query_length_sample_every: 쿼리 N번 호출마다 한 번만 토큰 길이 통계 기록
+                (통계용 토큰화 비용 절감, 0이면 쿼리 통계 미기록)
         """
+        if backend not in self.SUPPORTED_BACKENDS:
+            raise ValueError(f"지원하지 않는 백엔드: {backend} (지원: {self.SUPPORTED_BACKENDS})")
+
+        self.model_name = model_name
+        self.revision = revision
+        self.cache = cache
+        self.backend = backend
+        self.batch_token_budget = batch_token_budget
+        self.max_batch_size = max_batch_size
+
+        # 대량 인덱싱용 멀티 프로세스 풀 (attach_worker_pool로 연결)
+        self.worker_pool = None
+
+        # 토큰 길이 통계 (누적 + 마지막 호출)
+        self.length_stats = SequenceLengthStats()
+        self.last_call_stats: Optional[Dict[str, Any]] = None
+        self._stats_lock = threading.Lock()
+        self.query_length_sample_every = query_length_sample_every
+        self._query_calls = itertools.count()
+
         # GPU 사용 가능 여부 자동 감지
         if device is None:
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
         else:
             self.device = device
 
-        print(f"[INIT] BGE-M3-KO embedding model loading... (device: {self.device})")
+        print(f"[INIT] BGE-M3-KO embedding model loading... (device: {self.device}, backend: {backend})")
 
         try:
             # SentenceTransformer 모델 로드
-            self.model = SentenceTransformer(model_name, device=self.device)
+            load_kwargs = {"revision": revision} if revision else {}
+            if backend == "torch":
+                self.model = SentenceTransformer(model_name, device=self.device, **load_kwargs)
+            elif backend == "onnx":
+                self.model = SentenceTransformer(
+                    model_name, device=self.device, backend="onnx", **load_kwargs
+                )
+            else:
+                self.model = self._load_quantized_onnx(model_name, onnx_export_dir, load_kwargs)
             print(f"[OK] 모델 로드 완료: {model_name}")
         except Exception as e:
             print(f"[ERROR] 모델 로드 실패: {e}")
             raise
 
+        # 어텐션 비용은 시퀀스 길이의 제곱에 비례하므로 상한을 두어 연산량 제한
+        self.default_max_seq_length = self.model.max_seq_length
+        if max_seq_length is not None:
+            self.model.max_seq_length = max_seq_length
+        print(f"   - max_seq_length: {self.model.max_seq_length}")
+
+        # sparse 어휘 가중치 헤드 (dense와 같은 forward pass의 토큰 출력 사용)
+        self.sparse_head = None
+        if enable_sparse:
+            self.sparse_head = self._load_sparse_head(sparse_head_repo or model_name)
+            tokenizer = self.model.tokenizer
+            self._special_token_ids = {
+                token_id for token_id in (
+                    tokenizer.cls_token_id,
+                    tokenizer.eos_token_id,
+                    tokenizer.pad_token_id,
+                    tokenizer.unk_token_id
+                ) if token_id is not None
+            }
+
+    def _load_sparse_head(self, repo_id: str) -> torch.nn.Module:
+        """
+        BGE-M3 sparse_linear 헤드 로드 (hidden → 토큰 가중치)
+
+        다른 저장소의 헤드로 조용히 대체하지 않습니다. 파인튜닝 모델과 맞지 않는
+        헤드는 엉뚱한 어휘 가중치를 만들기 때문에, 헤드가 없으면 sparse_head_repo로
+        사용할 저장소를 명시해야 합니다.
+        """
+        from huggingface_hub import hf_hub_download
+
+        try:
+            path = hf_hub_download(repo_id, "sparse_linear.pt")
+        except Exception as e:
+            raise RuntimeError(
+                f"{repo_id}에서 sparse_linear.pt를 찾을 수 없습니다: {e}\n"
+                "   헤드가 있는 저장소를 sparse_head_repo로 지정하세요. (예: BAAI/bge-m3)"
+            ) from e
+
+        state = torch.load(path, map_location="cpu")
+        head = torch.nn.Linear(in_features=state["weight"].shape[1], out_features=1)
+        head.load_state_dict(state)
+        head.eval()
+        print(f"[OK] sparse 헤드 로드 완료: {repo_id}")
+        return head
+
+    def _load_quantized_onnx(
+        self,
+        model_name: str,
+        export_dir: Optional[str],
+        load_kwargs: dict
+    ) -> SentenceTransformer:
+        """int8 동적 양자화 ONNX 모델 로드 (없으면 내보내기 후 로드)"""
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        if export_dir is None:
+            current_dir = Path(__file__).parent.parent
+            export_dir = str(current_dir / "data" / "onnx" / model_name.replace("/", "__"))
+
+        file_name = f"onnx/model_qint8_{self.ONNX_QUANTIZATION_CONFIG}.onnx"
+        quantized_path = Path(export_dir) / file_name
+
+        if not quantized_path.exists():
+            print(f"[ONNX] int8 양자화 모델 생성 중... ({export_dir})")
+            onnx_model = SentenceTransformer(
+                model_name, device=self.device, backend="onnx", **load_kwargs
+            )
+            onnx_model.save(export_dir)
+            export_dynamic_quantized_onnx_model(
+                onnx_model,
+                quantization_config=self.ONNX_QUANTIZATION_CONFIG,
+                model_name_or_path=export_dir
+            )
+
+        return SentenceTransformer(
+            export_dir,
+            device=self.device,
+            backend="onnx",
+            model_kwargs={"file_name": file_name}
+        )
+
+    @property
+    def cache_revision(self) -> str:
+        """
+        디스크 캐시 키에 사용할 리비전 문자열
+
+        int8 양자화 벡터는 원본과 값이 다르므로 백엔드를 키에 포함합니다.
+        max_seq_length를 모델 기본값과 다르게 지정하면 절단 위치가 달라지므로 함께 포함합니다.
+        """
+        revision = self.revision or ""
+        if self.backend == "onnx-int8":
+            revision += f"+{self.backend}"
+        if self.max_seq_length != self.default_max_seq_length:
+            revision += f"+seq{self.max_seq_length}"
+        return revision
+
     def embed_query(self, text: str) -> List[float]:
         """
         단일 쿼리 텍스트를 임베딩 벡터로 변환
@@ -51,9 +264,23 @@ class BGEEmbeddings:
         Returns:
             임베딩 벡터 (list of floats)
         """
+        return self.embed_query_array(text).tolist()
+
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """
+        단일 쿼리 텍스트를 float32 ndarray로 임베딩 (Python float 리스트 변환 없음)
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            shape (dim,) float32 벡터
+        """
         if not text or not text.strip():
             raise ValueError("텍스트가 비어있습니다.")
 
+        self._sample_query_lengths([text])
+
         # 임베딩 생성
         embedding = self.model.encode(
             text,
@@ -61,7 +288,40 @@ class BGEEmbeddings:
             normalize_embeddings=True  # 코사인 유사도 계산을 위한 정규화
         )
 
-        return embedding.tolist()
+        return np.ascontiguousarray(embedding, dtype=np.float32)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 쿼리를 한 번의 model.encode 호출로 임베딩
+
+        Args:
+            texts: 쿼리 텍스트 리스트 (빈 텍스트 불가)
+
+        Returns:
+            입력 순서와 동일한 임베딩 벡터 리스트
+        """
+        return self.embed_queries_array(texts).tolist()
+
+    def embed_queries_array(self, texts: List[str]) -> np.ndarray:
+        """
+        embed_queries()의 ndarray 버전
+
+        Returns:
+            shape (len(texts), dim) float32 행렬
+        """
+        if any(not t or not t.strip() for t in texts):
+            raise ValueError("텍스트가 비어있습니다.")
+
+        self._sample_query_lengths(texts)
+
+        embeddings = self.model.encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=max(len(texts), 1)
+        )
+
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
@@ -76,21 +336,290 @@ class BGEEmbeddings:
         if not texts:
             return []
 
+        return self.embed_documents_array(texts).tolist()
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        여러 문서를 배치로 임베딩하여 연속된 float32 행렬로 반환
+
+        대량 인덱싱 시 벡터마다 Python float 리스트를 만들지 않으므로
+        메모리 사용량과 변환 시간이 줄어듭니다. 결과는 그대로
+        ChromaVectorStore.add_documents()에 전달할 수 있습니다.
+
+        Args:
+            texts: 임베딩할 텍스트 리스트 (빈 텍스트는 제외됨)
+
+        Returns:
+            shape (유효 텍스트 수, dim) float32 행렬
+        """
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
         # 빈 텍스트 필터링
         valid_texts = [t for t in texts if t and t.strip()]
         if not valid_texts:
             raise ValueError("유효한 텍스트가 없습니다.")
 
-        # 배치 임베딩 생성
-        embeddings = self.model.encode(
-            valid_texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            show_progress_bar=len(valid_texts) > 10,  # 10개 이상일 때만 진행바 표시
-            batch_size=32  # 배치 크기
+        if self.cache is None:
+            return self._encode_documents(valid_texts)
+
+        # 캐시 조회 후 누락된 텍스트만 임베딩
+        keys = [
+            EmbeddingCache.make_key(self.model_name, self.cache_revision, t)
+            for t in valid_texts
+        ]
+        cached = self.cache.get_many(keys)
+
+        missing_indices = [i for i, key in enumerate(keys) if key not in cached]
+        if missing_indices:
+            print(f"[CACHE] 캐시 적중 {len(valid_texts) - len(missing_indices)}개, "
+                  f"신규 임베딩 {len(missing_indices)}개")
+            new_embeddings = self._encode_documents([valid_texts[i] for i in missing_indices])
+            new_items = {}
+            for i, vector in zip(missing_indices, new_embeddings):
+                new_items[keys[i]] = vector
+            self.cache.put_many(new_items)
+            cached.update(new_items)
+
+        # 미리 할당한 연속 버퍼에 행 단위로 채움
+        dim = next(iter(cached.values())).shape[0]
+        embeddings = np.empty((len(keys), dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            embeddings[row] = cached[key]
+        return embeddings
+
+    @property
+    def max_seq_length(self) -> int:
+        """현재 최대 시퀀스 길이 (토큰)"""
+        return self.model.max_seq_length
+
+    def _raw_token_lengths(self, texts: List[str]) -> List[int]:
+        """텍스트별 절단 전 토큰 길이 (특수 토큰 포함)"""
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=True,
+            truncation=False,
+            return_length=True
         )
+        return list(encoded["length"])
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """텍스트별 실제 인코딩 토큰 길이 (max_seq_length에서 절단, 통계 기록)"""
+        raw_lengths = self._raw_token_lengths(texts)
+        self._record_lengths(raw_lengths)
+        return [min(length, self.max_seq_length) for length in raw_lengths]
+
+    def _sample_query_lengths(self, texts: List[str]) -> None:
+        """쿼리 호출 query_length_sample_every번마다 한 번 토큰 길이 통계 기록"""
+        if self.query_length_sample_every <= 0:
+            return
+        if next(self._query_calls) % self.query_length_sample_every == 0:
+            self._record_lengths(self._raw_token_lengths(texts))
+
+    def _record_lengths(self, raw_lengths: List[int]) -> None:
+        """호출별/누적 토큰 길이 통계 기록"""
+        call_stats = SequenceLengthStats()
+        call_stats.record(raw_lengths, self.max_seq_length)
+        with self._stats_lock:
+            self.length_stats.record(raw_lengths, self.max_seq_length)
+            self.last_call_stats = call_stats.to_dict()
+
+    def get_length_stats(self) -> Dict[str, Any]:
+        """토큰 길이 통계 반환 (누적 + 마지막 호출, 쿼리는 샘플링된 호출만 포함)"""
+        with self._stats_lock:
+            return {
+                "max_seq_length": self.max_seq_length,
+                "query_sample_every": self.query_length_sample_every,
+                "cumulative": self.length_stats.to_dict(),
+                "last_call": self.last_call_stats
+            }
+
+    def find_truncated(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """
+        max_seq_length를 넘어 절단되는 텍스트 찾기 (통계에는 기록하지 않음)
+
+        Args:
+            texts: 검사할 텍스트 리스트
+
+        Returns:
+            [(텍스트 인덱스, 절단 전 토큰 길이), ...]
+        """
+        return [
+            (i, length)
+            for i, length in enumerate(self._raw_token_lengths(texts))
+            if length > self.max_seq_length
+        ]
+
+    def _plan_batches(self, lengths: List[int]) -> List[List[int]]:
+        """
+        토큰 길이 기반 배치 구성
+
+        길이 내림차순으로 정렬한 뒤, (배치 크기 × 배치 내 최대 길이)가
+        batch_token_budget을 넘지 않도록 묶습니다. 비슷한 길이끼리 묶이므로
+        짧은 청크가 긴 청크 길이만큼 패딩되는 낭비가 줄어듭니다.
+
+        Returns:
+            원본 인덱스 배치 리스트
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+        batches = []
+        current: List[int] = []
+        current_max = 0
+        for idx in order:
+            batch_max = max(current_max, lengths[idx])
+            if current and (
+                len(current) >= self.max_batch_size
+                or (len(current) + 1) * batch_max > self.batch_token_budget
+            ):
+                batches.append(current)
+                current, batch_max = [], lengths[idx]
+            current.append(idx)
+            current_max = batch_max
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def attach_worker_pool(self, pool) -> None:
+        """
+        문서 임베딩을 MultiProcessEmbeddingPool로 분산 처리하도록 연결
+
+        Args:
+            pool: MultiProcessEmbeddingPool 인스턴스 (None이면 연결 해제)
+        """
+        self.worker_pool = pool
+
+    def _encode_documents(self, texts: List[str]) -> np.ndarray:
+        """문서 텍스트 배치 인코딩 (길이 버킷 배치, 원본 순서의 float32 ndarray 반환)"""
+        # 토큰 길이/절단 통계는 풀 사용 여부와 관계없이 이 프로세스에 기록
+        lengths = self._token_lengths(texts)
+        if self.worker_pool is not None:
+            # 워커는 같은 batch_token_budget/max_batch_size로 샤드 안에서 길이 버킷 배치
+            return self.worker_pool.encode(texts)
+
+        batches = self._plan_batches(lengths)
+
+        embeddings = None
+        progress = tqdm(total=len(texts), desc="Embedding", disable=len(texts) <= 10)
+        for batch in batches:
+            # 배치 임베딩 생성
+            batch_embeddings = self.model.encode(
+                [texts[i] for i in batch],
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+                batch_size=len(batch)
+            )
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+            # 원본 순서 위치에 기록
+            embeddings[batch] = batch_embeddings
+            progress.update(len(batch))
+        progress.close()
+
+        return embeddings
+
+    def embed_query_with_sparse(self, text: str) -> Tuple[np.ndarray, Dict[int, float]]:
+        """
+        단일 쿼리의 dense 벡터와 sparse 어휘 가중치를 한 번의 forward pass로 계산
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            (shape (dim,) float32 벡터, {토큰 ID: 가중치})
+        """
+        if not text or not text.strip():
+            raise ValueError("텍스트가 비어있습니다.")
+
+        self._sample_query_lengths([text])
+        dense, sparse = self._encode_with_sparse([text], [[0]])
+        return dense[0], sparse[0]
+
+    def embed_queries_with_sparse(
+        self,
+        texts: List[str]
+    ) -> Tuple[np.ndarray, List[Dict[int, float]]]:
+        """
+        여러 쿼리의 dense 벡터와 sparse 어휘 가중치를 한 번의 forward pass로 계산
+
+        Args:
+            texts: 임베딩할 쿼리 리스트
+
+        Returns:
+            (shape (len(texts), dim) float32 행렬, 쿼리별 {토큰 ID: 가중치} 리스트)
+        """
+        if any(not t or not t.strip() for t in texts):
+            raise ValueError("텍스트가 비어있습니다.")
+
+        self._sample_query_lengths(texts)
+        return self._encode_with_sparse(texts, [list(range(len(texts)))])
+
+    def embed_documents_with_sparse(
+        self,
+        texts: List[str]
+    ) -> Tuple[np.ndarray, List[Dict[int, float]]]:
+        """
+        문서의 dense 벡터와 sparse 어휘 가중치를 함께 계산
+
+        Args:
+            texts: 임베딩할 텍스트 리스트 (빈 텍스트는 제외됨)
+
+        Returns:
+            (shape (유효 텍스트 수, dim) float32 행렬, 텍스트별 {토큰 ID: 가중치} 리스트)
+        """
+        valid_texts = [t for t in texts if t and t.strip()]
+        if not valid_texts:
+            raise ValueError("유효한 텍스트가 없습니다.")
+
+        batches = self._plan_batches(self._token_lengths(valid_texts))
+        return self._encode_with_sparse(valid_texts, batches)
+
+    def _encode_with_sparse(
+        self,
+        texts: List[str],
+        batches: List[List[int]]
+    ) -> Tuple[np.ndarray, List[Dict[int, float]]]:
+        """배치별로 전체 출력(sentence/token 임베딩)을 받아 dense + sparse 계산"""
+        if self.sparse_head is None:
+            raise RuntimeError("sparse 출력이 비활성화되어 있습니다. (enable_sparse=True 필요)")
+
+        dense = None
+        sparse: List[Dict[int, float]] = [{} for _ in texts]
+        for batch in batches:
+            outputs = self.model.encode(
+                [texts[i] for i in batch],
+                output_value=None,  # sentence_embedding + token_embeddings + input_ids
+                convert_to_numpy=False,
+                show_progress_bar=False,
+                batch_size=len(batch)
+            )
+            for i, row in zip(batch, outputs):
+                vector = row["sentence_embedding"].float().cpu().numpy()
+                if dense is None:
+                    dense = np.empty((len(texts), vector.shape[0]), dtype=np.float32)
+                dense[i] = vector / max(float(np.linalg.norm(vector)), 1e-12)
+                sparse[i] = self._sparse_weights(row)
+
+        return dense, sparse
+
+    def _sparse_weights(self, row: dict) -> Dict[int, float]:
+        """토큰 임베딩에 sparse 헤드를 적용하여 토큰 ID별 최대 가중치 계산"""
+        with torch.no_grad():
+            token_embeddings = row["token_embeddings"].float().cpu()
+            weights = torch.relu(self.sparse_head(token_embeddings)).squeeze(-1).tolist()
+
+        input_ids = row["input_ids"].cpu().tolist()
+        attention_mask = row["attention_mask"].cpu().tolist()
 
-        return embeddings.tolist()
+        result: Dict[int, float] = {}
+        for token_id, weight, mask in zip(input_ids, weights, attention_mask):
+            if not mask or weight <= 0 or token_id in self._special_token_ids:
+                continue
+            if weight > result.get(token_id, 0.0):
+                result[token_id] = weight
+        return result
 
     def get_embedding_dimension(self) -> int:
         """임베딩 벡터의 차원 수 반환"""
@@ -109,14 +638,16 @@ class LangChainBGEEmbeddings:
     def __init__(
         self,
         model_name: str = "dragonkue/BGE-m3-ko",
-        device: str = None
+        device: str = None,
+        backend: str = "torch"
     ):
         """
         Args:
             model_name: HuggingFace 모델 이름
             device: 실행 디바이스
+            backend: 추론 백엔드 ('torch', 'onnx', 'onnx-int8')
         """
-        self.embeddings = BGEEmbeddings(model_name=model_name, device=device)
+        self.embeddings = BGEEmbeddings(model_name=model_name, device=device, backend=backend)
 
     def embed_query(self, text: str) -> List[float]:
         """LangChain 호환 쿼리 임베딩"""
@@ -0,0 +1,499 @@
+"""
+인덱스 유지보수 모듈
+
+삭제·교체가 누적된 ChromaDB 저장소의 단편화를 진단하고 정리합니다.
+
+- 저장소 보고서: 디스크 사용량, SQLite 페이지/빈 페이지, 세그먼트(HNSW) 파일 크기,
+  HNSW 요소 수와 삭제 표시(tombstone) 수, 컬렉션별 살아있는/삭제된 문서 수
+- HNSW 재구성: 활성 버전의 살아있는 벡터만 새 버전 컬렉션에 복사한 뒤 별칭 전환
+  (Chroma는 기존 HNSW 인덱스를 제자리에서 재구성하는 API가 없음)
+- SQLite VACUUM: 빈 페이지를 반환하여 chroma.sqlite3 파일 크기 축소
+- 콜드 오픈 시간: 새 프로세스에서 컬렉션 열기 + 첫 검색(HNSW 로드) 시간 측정
+
+HNSW 수치는 디스크에 저장된 세그먼트 파일(header.bin, data_level0.bin) 기준이므로
+Chroma가 아직 디스크에 반영하지 않은 최근 변경(hnsw:sync_threshold 미만)은 빠집니다.
+그 변경은 SQLite 쓰기 로그(embeddings_queue)에서 따로 세며, 살아있는 문서 수는
+collection.count(), 삭제된 문서 수는 HNSW 삭제 표시 + 미반영 삭제 로그로 계산합니다.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .bm25_index import BM25Index
+from .vector_store import ChromaVectorStore, sidecar_paths
+
+
+SQLITE_FILENAME = "chroma.sqlite3"
+
+# hnswlib 인덱스 헤더 (header.bin): offsetLevel0, max_elements, cur_element_count,
+# size_data_per_element, label_offset, offsetData, maxlevel, enterpoint_node,
+# maxM, maxM0, M, mult, ef_construction
+# Chroma 1.x는 이 앞에 4바이트 버전 번호를 붙여 저장 (버전 없는 파일은 이전 형식)
+HNSW_HEADER = struct.Struct("<QQQQQQiIQQQdQ")
+HNSW_HEADER_VERSION = struct.Struct("<I")
+HNSW_DELETE_MARK = 0x01
+# 쓰기 로그(embeddings_queue) operation 값: ADD, UPDATE, UPSERT, DELETE
+LOG_OPERATION_DELETE = 3
+
+COLD_OPEN_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from rag.vector_store import ChromaVectorStore
+start = time.perf_counter()
+store = ChromaVectorStore(collection_name=sys.argv[3], persist_directory=sys.argv[2], result_cache_size=0)
+opened = time.perf_counter() - start
+page = next(store.iter_documents(page_size=1), None)
+first_query = None
+if page is not None and len(page["ids"]):
+    start = time.perf_counter()
+    store.search(page["embeddings"][0], top_k=5)
+    first_query = time.perf_counter() - start
+print("COLD_OPEN " + json.dumps({"open_s": opened, "first_query_s": first_query}))
+"""
+
+
+def directory_size(path: str) -> int:
+    """디렉토리 아래 전체 파일 크기 (바이트)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def sqlite_stats(persist_directory: str) -> Dict[str, Any]:
+    """
+    chroma.sqlite3 파일 크기와 페이지 사용 현황
+
+    Returns:
+        {"path", "file_bytes", "wal_bytes", "page_size", "page_count", "freelist_count",
+         "free_bytes", "free_ratio", "log_rows"} (파일이 없으면 {})
+    """
+    path = os.path.join(persist_directory, SQLITE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+
+    wal_path = path + "-wal"
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        try:
+            # Chroma 쓰기 로그 (세그먼트에 반영된 뒤에도 정리 전까지 남아 있음)
+            log_rows = connection.execute("SELECT COUNT(*) FROM embeddings_queue").fetchone()[0]
+        except sqlite3.Error:
+            log_rows = None
+    finally:
+        connection.close()
+
+    return {
+        "path": path,
+        "file_bytes": os.path.getsize(path),
+        "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+        "free_bytes": page_size * freelist_count,
+        "free_ratio": round(freelist_count / page_count, 4) if page_count else 0.0,
+        "log_rows": log_rows
+    }
+
+
+def segment_collections(persist_directory: str) -> Dict[str, str]:
+    """
+    세그먼트 ID → 컬렉션 이름 (Chroma SQLite 메타데이터 기준)
+
+    Chroma 버전에 따라 스키마가 다르므로 조회에 실패하면 빈 딕셔너리를 반환합니다.
+    """
+    path = os.path.join(persist_directory, SQLITE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                "SELECT s.id, c.name FROM segments s JOIN collections c ON s.collection = c.id"
+            ).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return {}
+    return {str(segment_id): name for segment_id, name in rows}
+
+
+def read_hnsw_header(segment_path: str) -> Optional[Dict[str, int]]:
+    """
+    세그먼트 디렉토리의 header.bin 해석
+
+    파일 크기로 버전 접두사 유무를 판단하고, 해석한 값이 hnswlib 레이아웃
+    (링크 목록 크기, 요소 크기)과 data_level0.bin 크기에 맞는지 확인합니다.
+
+    Returns:
+        {"version", "offset_level0", "max_elements", "element_count", "size_per_element",
+         "dim", "max_level", "M", "construction_ef"} (없거나 형식이 맞지 않으면 None)
+    """
+    header_path = os.path.join(segment_path, "header.bin")
+    try:
+        with open(header_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) == HNSW_HEADER_VERSION.size + HNSW_HEADER.size:
+        version = HNSW_HEADER_VERSION.unpack_from(data)[0]
+        data = data[HNSW_HEADER_VERSION.size:]
+    elif len(data) == HNSW_HEADER.size:
+        version = 0
+    else:
+        return None
+
+    (offset_level0, max_elements, element_count, size_per_element, label_offset, offset_data,
+     max_level, _, max_m, max_m0, m, _, ef_construction) = HNSW_HEADER.unpack(data)
+
+    # level 0 링크 목록 = 4바이트 개수 헤더 + maxM0개 이웃, 그 뒤 벡터(float32)와 8바이트 라벨
+    if (
+        m < 1 or max_m != m or max_m0 != 2 * m
+        or offset_data != offset_level0 + 4 + 4 * max_m0
+        or label_offset <= offset_data or (label_offset - offset_data) % 4
+        or size_per_element != label_offset + 8
+        or element_count > max_elements
+    ):
+        return None
+
+    # hnswlib는 요소 수만큼, Chroma는 용량만큼 data_level0.bin을 저장
+    try:
+        data_bytes = os.path.getsize(os.path.join(segment_path, "data_level0.bin"))
+    except OSError:
+        return None
+    if (
+        data_bytes % size_per_element
+        or not element_count * size_per_element <= data_bytes <= max_elements * size_per_element
+    ):
+        return None
+
+    return {
+        "version": version,
+        "offset_level0": offset_level0,
+        "max_elements": max_elements,
+        "element_count": element_count,
+        "size_per_element": size_per_element,
+        "dim": (label_offset - offset_data) // 4,
+        "max_level": max_level,
+        "M": m,
+        "construction_ef": ef_construction
+    }
+
+
+def count_hnsw_deleted(segment_path: str, header: Dict[str, int]) -> int:
+    """
+    data_level0.bin에서 삭제 표시된 요소 수 계산
+
+    hnswlib는 삭제된 요소를 그래프에서 빼지 않고 level 0 링크 목록 헤더의
+    3번째 바이트에 삭제 플래그만 세웁니다. 파일을 memory-map하여 요소마다 1바이트만 읽습니다.
+
+    Args:
+        header: read_hnsw_header()로 검증한 헤더 (요소 간격 = size_per_element)
+    """
+    data_path = os.path.join(segment_path, "data_level0.bin")
+    count = header["element_count"]
+    stride = header["size_per_element"]
+    if count == 0:
+        return 0
+
+    data = np.memmap(data_path, dtype=np.uint8, mode="r")
+    flags = data[header["offset_level0"] + 2::stride][:count]
+    deleted = int(np.count_nonzero(flags & HNSW_DELETE_MARK))
+    del data
+    return deleted
+
+
+def segment_stats(persist_directory: str) -> List[Dict[str, Any]]:
+    """
+    세그먼트 디렉토리별 파일 크기와 HNSW 요소/삭제 표시 수
+
+    header.bin이 있지만 형식을 확인할 수 없으면 HNSW 값은 None(알 수 없음)입니다.
+
+    Returns:
+        [{"segment", "collection", "bytes", "files", "elements", "deleted", "capacity", "M", ...}]
+    """
+    if not os.path.isdir(persist_directory):
+        return []
+
+    names = segment_collections(persist_directory)
+    stats = []
+    for entry in sorted(os.listdir(persist_directory)):
+        segment_path = os.path.join(persist_directory, entry)
+        if not os.path.isdir(segment_path):
+            continue
+
+        files = {
+            name: os.path.getsize(os.path.join(segment_path, name))
+            for name in os.listdir(segment_path)
+            if os.path.isfile(os.path.join(segment_path, name))
+        }
+        row: Dict[str, Any] = {
+            "segment": entry,
+            "collection": names.get(entry),
+            "bytes": sum(files.values()),
+            "files": files
+        }
+        if "header.bin" in files:
+            header = read_hnsw_header(segment_path)
+            if header is None:
+                print(f"[WARN] HNSW 헤더 형식을 확인할 수 없습니다: {entry}/header.bin")
+                header = {}
+            row.update({
+                "elements": header.get("element_count"),
+                "deleted": count_hnsw_deleted(segment_path, header) if header else None,
+                "capacity": header.get("max_elements"),
+                "M": header.get("M"),
+                "construction_ef": header.get("construction_ef")
+            })
+        stats.append(row)
+    return stats
+
+
+def pending_write_stats(persist_directory: str) -> Dict[str, Dict[str, int]]:
+    """
+    컬렉션별로 HNSW 세그먼트에 아직 반영되지 않은 쓰기 로그 수
+
+    embeddings_queue에서 벡터 세그먼트의 max_seq_id보다 뒤에 있는 행을 셉니다.
+    Chroma 버전에 따라 스키마가 다르므로 조회에 실패하면 빈 딕셔너리를 반환합니다.
+
+    Returns:
+        {컬렉션 이름: {"pending_writes": 미반영 로그 행 수, "pending_deletes": 그중 삭제 수}}
+    """
+    path = os.path.join(persist_directory, SQLITE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            segments = connection.execute(
+                "SELECT c.name, c.id, s.id FROM segments s JOIN collections c ON s.collection = c.id "
+                "WHERE s.scope = 'VECTOR'"
+            ).fetchall()
+            stats = {}
+            for name, collection_id, segment_id in segments:
+                row = connection.execute(
+                    "SELECT seq_id FROM max_seq_id WHERE segment_id = ?", (segment_id,)
+                ).fetchone()
+                max_seq_id = row[0] if row else 0
+                if isinstance(max_seq_id, bytes):
+                    # 이전 Chroma 버전은 seq_id를 big-endian 바이트로 저장
+                    max_seq_id = int.from_bytes(max_seq_id, "big")
+                counts = dict(connection.execute(
+                    "SELECT operation, COUNT(*) FROM embeddings_queue "
+                    "WHERE topic LIKE ? AND seq_id > ? GROUP BY operation",
+                    (f"%/{collection_id}", max_seq_id)
+                ).fetchall())
+                stats[name] = {
+                    "pending_writes": sum(counts.values()),
+                    "pending_deletes": counts.get(LOG_OPERATION_DELETE, 0)
+                }
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return {}
+    return stats
+
+
+def storage_report(vector_store: ChromaVectorStore) -> Dict[str, Any]:
+    """
+    저장소 단편화 보고서
+
+    Args:
+        vector_store: 보고 대상 저장소의 벡터 스토어 (같은 persist_directory의 모든 컬렉션 포함)
+
+    Returns:
+        {"total_bytes", "sqlite", "segments", "collections": {이름: {"live", "dead",
+         "pending_writes", "hnsw_elements", "hnsw_deleted", "segment_bytes", "sidecar_bytes"}},
+         "active"} (알 수 없는 값은 None)
+    """
+    persist_directory = vector_store.persist_directory
+    segments = segment_stats(persist_directory)
+    pending = pending_write_stats(persist_directory)
+
+    collections: Dict[str, Dict[str, Any]] = {}
+    for name in vector_store.list_collections():
+        try:
+            live = vector_store.client.get_collection(name=name).count()
+        except Exception:
+            live = None
+        sidecar_bytes = 0
+        for side_path in sidecar_paths(persist_directory, name):
+            if os.path.exists(side_path):
+                sidecar_bytes += os.path.getsize(side_path)
+        log = pending.get(name, {})
+        collections[name] = {
+            "live": live,
+            "dead": None,
+            "pending_writes": log.get("pending_writes"),
+            "pending_deletes": log.get("pending_deletes"),
+            "hnsw_elements": 0,
+            "hnsw_deleted": 0,
+            "segment_bytes": 0,
+            "sidecar_bytes": sidecar_bytes
+        }
+
+    for segment in segments:
+        row = collections.get(segment["collection"])
+        if row is None:
+            continue
+        row["segment_bytes"] += segment["bytes"]
+        if "elements" in segment:
+            for key, value in (("hnsw_elements", segment["elements"]), ("hnsw_deleted", segment["deleted"])):
+                row[key] = row[key] + value if row[key] is not None and value is not None else None
+
+    # 삭제된 문서 = 디스크 HNSW의 삭제 표시 + 아직 반영되지 않은 삭제 로그
+    for row in collections.values():
+        if row["hnsw_deleted"] is not None and row["pending_deletes"] is not None:
+            row["dead"] = row["hnsw_deleted"] + row["pending_deletes"]
+
+    return {
+        "total_bytes": directory_size(persist_directory),
+        "sqlite": sqlite_stats(persist_directory),
+        "segments": segments,
+        "collections": collections,
+        "active": vector_store.collection_name
+    }
+
+
+def vacuum_sqlite(persist_directory: str) -> Dict[str, int]:
+    """
+    chroma.sqlite3 VACUUM (빈 페이지 반환)
+
+    VACUUM은 데이터베이스 전체를 다시 쓰므로 다른 프로세스가 쓰는 중이면
+    sqlite3.OperationalError(database is locked)가 발생합니다.
+
+    Returns:
+        {"before_bytes", "after_bytes"}
+    """
+    path = os.path.join(persist_directory, SQLITE_FILENAME)
+    before = os.path.getsize(path)
+
+    connection = sqlite3.connect(path, timeout=30)
+    try:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    after = os.path.getsize(path)
+    print(f"[VACUUM] {SQLITE_FILENAME}: {before / 1024 / 1024:.1f}MB → {after / 1024 / 1024:.1f}MB")
+    return {"before_bytes": before, "after_bytes": after}
+
+
+def rebuild_active_version(
+    vector_store: ChromaVectorStore,
+    page_size: int = 1000,
+    keep_versions: int = 1
+) -> ChromaVectorStore:
+    """
+    활성 버전의 살아있는 벡터로 새 버전 컬렉션을 만들어 HNSW 인덱스 재구성
+
+    임베딩 차원과 HNSW 파라미터는 활성 버전과 같게 유지하고, 저장된 임베딩을
+    그대로 복사하므로 재임베딩이 필요 없습니다. sparse 역색인/BM25 인덱스는 복사, 파티션 색인은 새로 만듭니다.
+    문서 수가 일치할 때만 별칭을 전환하며, 실패하면 새 버전을 삭제하고 활성 버전을 유지합니다.
+
+    Args:
+        vector_store: 활성 버전 벡터 스토어
+        page_size: 복사 페이지 크기 (행 수)
+        keep_versions: 전환 후 롤백용으로 남길 이전 버전 수
+
+    Returns:
+        새 활성 버전 벡터 스토어
+    """
+    source_name = vector_store.collection_name
+    expected = vector_store.get_document_count()
+    hnsw = vector_store.hnsw_params
+
+    rebuilt = ChromaVectorStore.create_version(
+        vector_store.alias,
+        persist_directory=vector_store.persist_directory,
+        embedding_dim=vector_store.embedding_dim,
+        write_batch_size=vector_store.write_batch_size,
+        hnsw_m=hnsw["M"],
+        hnsw_construction_ef=hnsw["construction_ef"],
+        hnsw_search_ef=hnsw["search_ef"]
+    )
+    try:
+        copied = 0
+        for page in vector_store.iter_documents(page_size=page_size):
+            rebuilt.add_documents(
+                texts=page["documents"],
+                embeddings=page["embeddings"],
+                metadatas=page["metadatas"],
+                ids=page["ids"]
+            )
+            copied += len(page["ids"])
+        print(f"[OK] 살아있는 문서 {copied}개 복사: {source_name} → {rebuilt.collection_name}")
+
+        final_count = rebuilt.get_document_count()
+        if final_count != expected:
+            raise ValueError(f"문서 수 불일치 (원본 {expected}개, 재구성 {final_count}개)")
+        # 임베딩을 그대로 복사했으므로 임베딩 최대 시퀀스 길이 기록도 유지
+        if vector_store.stored_max_seq_length is not None:
+            rebuilt.record_max_seq_length(vector_store.stored_max_seq_length)
+
+        # 문서 ID가 같으므로 sparse 역색인 / BM25 인덱스는 그대로 복사
+        for source_path, target_path in (
+            (os.path.join(vector_store.persist_directory, f"{source_name}.sparse.npz"),
+             os.path.join(rebuilt.persist_directory, f"{rebuilt.collection_name}.sparse.npz")),
+            (BM25Index.path_for(vector_store.persist_directory, source_name),
+             BM25Index.path_for(rebuilt.persist_directory, rebuilt.collection_name))
+        ):
+            if os.path.exists(source_path):
+                shutil.copyfile(source_path, target_path)
+        if rebuilt.partition_keys:
+            rebuilt.build_partition_index(page_size=page_size)
+    except Exception:
+        print(f"[ERROR] HNSW 재구성 실패: 새 버전 삭제 후 활성 버전({source_name}) 유지")
+        rebuilt.delete_collection()
+        raise
+
+    rebuilt.promote(info={"documents": final_count, "rebuilt_from": source_name})
+    removed = rebuilt.gc_versions(keep=keep_versions)
+    print(f"[ALIAS] 활성 버전 전환: {source_name} → {rebuilt.collection_name} "
+          f"(이전 버전 {len(removed)}개 삭제)")
+    return rebuilt
+
+
+def measure_cold_open(persist_directory: str, collection_name: str, timeout: float = 600) -> Dict[str, Any]:
+    """
+    새 프로세스에서 컬렉션 열기 + 첫 검색 시간 측정
+
+    같은 프로세스에서는 Chroma가 열린 세그먼트를 재사용하므로 별도 프로세스로 측정합니다.
+    (OS 페이지 캐시는 비우지 않음)
+
+    Returns:
+        {"open_s", "first_query_s"} (측정 실패 시 {"error": 메시지})
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", COLD_OPEN_SCRIPT, backend_dir, persist_directory, collection_name],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"{timeout}초 초과"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith("COLD_OPEN "):
+            return json.loads(line[len("COLD_OPEN "):])
+    message = (completed.stderr.strip().splitlines() or ["결과 없음"])[-1]
+    return {"error": message}
@@ -0,0 +1,175 @@
+"""
+메타데이터 파티션 색인 모듈
+
+자주 쓰는 필터 키(source, file_type, category)의 값별 문서 ID 집합을 미리 계산해
+컬렉션 옆 파일(<컬렉션>.partitions.json)에 저장합니다. 필터 검색은 해당 파티션의
+벡터만 대상으로 하고, 검색기는 partition_filter()로 파티션을 직접 지정할 수 있습니다.
+"""
+
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+PARTITION_KEYS = ("source", "file_type", "category")
+
+
+def partition_filter(
+    partitions: Optional[Dict[str, Any]],
+    filter_metadata: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    파티션 지정을 Chroma where 필터로 변환하여 기존 필터와 결합
+
+    Args:
+        partitions: {키: 값 또는 값 리스트} (예: {"file_type": "pdf", "source": ["a.pdf", "b.pdf"]})
+        filter_metadata: 함께 적용할 메타데이터 필터
+
+    Returns:
+        where 필터 (조건이 없으면 None)
+    """
+    clauses = []
+    for key, value in (partitions or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            clauses.append({key: {"$in": list(value)}})
+        else:
+            clauses.append({key: value})
+    if filter_metadata:
+        clauses.append(filter_metadata)
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def partition_clauses(
+    where: Dict[str, Any],
+    keys: Iterable[str] = PARTITION_KEYS
+) -> List[Tuple[str, List[Any]]]:
+    """
+    where 필터에서 반드시 만족해야 하는 파티션 조건 추출
+
+    최상위 또는 $and 안의 {키: 값}, {키: {"$eq": 값}}, {키: {"$in": [...]}} 조건만 해당합니다.
+    ($or, $ne 등은 파티션으로 좁힐 수 없으므로 무시)
+
+    Returns:
+        [(키, 허용 값 리스트), ...]
+    """
+    keys = set(keys)
+    clauses: List[Tuple[str, List[Any]]] = []
+    for key, condition in where.items():
+        if key == "$and":
+            for sub in condition:
+                clauses += partition_clauses(sub, keys)
+        elif key in keys:
+            if not isinstance(condition, dict):
+                clauses.append((key, [condition]))
+            elif set(condition) == {"$eq"}:
+                clauses.append((key, [condition["$eq"]]))
+            elif set(condition) == {"$in"}:
+                clauses.append((key, list(condition["$in"])))
+    return clauses
+
+
+class MetadataPartitionIndex:
+    """파티션 키 값별 문서 ID 집합 ({키: {값: {문서 ID}}})"""
+
+    def __init__(self, index_path: str, keys: Iterable[str] = PARTITION_KEYS):
+        """
+        Args:
+            index_path: 색인 파일 경로 (.json, 있으면 로드)
+            keys: 파티션 키
+        """
+        self.index_path = index_path
+        self.keys = tuple(keys)
+        self._partitions: Dict[str, Dict[Any, Set[str]]] = {key: defaultdict(set) for key in self.keys}
+        self._doc_values: Dict[str, Dict[str, Any]] = {}  # 삭제용 {문서 ID: {키: 값}}
+
+        if os.path.exists(index_path):
+            self.load()
+
+    @classmethod
+    def path_for(cls, persist_directory: str, collection_name: str) -> str:
+        """컬렉션 옆 색인 파일 경로"""
+        return os.path.join(persist_directory, f"{collection_name}.partitions.json")
+
+    def add(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """문서 추가 (같은 ID가 있으면 교체)"""
+        self.remove([doc_id for doc_id in ids if doc_id in self._doc_values])
+        for doc_id, metadata in zip(ids, metadatas):
+            values = {
+                key: (metadata or {})[key] for key in self.keys if key in (metadata or {})
+            }
+            for key, value in values.items():
+                self._partitions[key][value].add(doc_id)
+            self._doc_values[doc_id] = values
+
+    def remove(self, ids: List[str]) -> None:
+        """문서 삭제"""
+        for doc_id in ids:
+            for key, value in self._doc_values.pop(doc_id, {}).items():
+                members = self._partitions[key].get(value)
+                if members is not None:
+                    members.discard(doc_id)
+                    if not members:
+                        del self._partitions[key][value]
+
+    def clear(self) -> None:
+        """색인 전체 삭제"""
+        self._partitions = {key: defaultdict(set) for key in self.keys}
+        self._doc_values.clear()
+
+    def ids_for(self, key: str, values: List[Any]) -> Set[str]:
+        """키의 값들에 속한 문서 ID 합집합"""
+        partitions = self._partitions.get(key, {})
+        ids: Set[str] = set()
+        for value in values:
+            ids |= partitions.get(value, set())
+        return ids
+
+    def sizes(self) -> Dict[str, Dict[Any, int]]:
+        """키별 파티션 크기 ({키: {값: 문서 수}})"""
+        return {
+            key: {value: len(members) for value, members in partitions.items()}
+            for key, partitions in self._partitions.items()
+        }
+
+    def save(self) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일을 봄)"""
+        data = {
+            "keys": list(self.keys),
+            # 값의 타입(int/bool 등)을 유지하도록 [값, ID 리스트] 쌍으로 저장
+            "partitions": {
+                key: [[value, sorted(members)] for value, members in partitions.items()]
+                for key, partitions in self._partitions.items()
+            }
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        print(f"[PARTITION] 파티션 색인 저장 완료 ({len(self._doc_values)}개 문서, "
+              + ", ".join(f"{key} {len(partitions)}개" for key, partitions in self._partitions.items())
+              + ")")
+
+    def load(self) -> None:
+        """.json 파일에서 색인 로드"""
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.clear()
+        for key, pairs in data.get("partitions", {}).items():
+            if key not in self._partitions:
+                continue
+            for value, ids in pairs:
+                self._partitions[key][value] = set(ids)
+                for doc_id in ids:
+                    self._doc_values.setdefault(doc_id, {})[key] = value
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_values
+
+    def __len__(self) -> int:
+        return len(self._doc_values)
@@ -0,0 +1,568 @@
+"""
+NumPy 정확(brute-force) 검색 벡터 스토어 모듈
+
+수천 개 규모의 청크에서는 HNSW + sqlite 경유 조회보다 정규화된 float32 행렬과
+쿼리 벡터의 행렬-벡터 곱 한 번이 더 빠릅니다. ChromaDB 컬렉션을 메모리로 읽어
+ChromaVectorStore.search와 같은 형식의 결과를 반환합니다.
+문서 추가/삭제(VectorStore 인터페이스)는 메모리에만 반영되며 디스크에는 저장되지 않습니다.
+embedding_precision='float16'이면 행렬을 float16으로 보관하여 메모리를 절반으로 줄이고,
+검색 시에는 블록 단위로 float32로 변환하여 점수를 계산합니다.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .vector_store import (
+    ChromaVectorStore,
+    EmbeddingInput,
+    EmbeddingsInput,
+    make_chunk_id,
+    reduce_embeddings,
+    source_key
+)
+
+
+# float16 행렬 점수 계산 시 한 번에 float32로 변환할 행 수
+SCORE_BLOCK_ROWS = 16384
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화한 연속 메모리 float32 행렬 (내적 = 코사인 유사도)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.ascontiguousarray(matrix / np.maximum(norms, 1e-12))
+
+
+def top_k_rows(scores: np.ndarray, k: int):
+    """
+    (q, n) 점수 행렬에서 행별 상위 k개 열 번호와 점수 (점수 내림차순)
+
+    argpartition으로 상위 k개만 부분 정렬한 뒤 그 안에서만 정렬합니다.
+    """
+    if k < scores.shape[1]:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        top = np.tile(np.arange(scores.shape[1]), (len(scores), 1))
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class NumpyVectorStore:
+    """메모리 상주 정확 검색 벡터 스토어 (ChromaVectorStore 검색 인터페이스 호환)"""
+
+    def __init__(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        embedding_dim: Optional[int] = None,
+        embedding_precision: str = "float32",
+        collection_name: str = "commercial_analysis_docs",
+        persist_directory: Optional[str] = None
+    ):
+        """
+        Args:
+            ids: 문서 ID 리스트
+            documents: 문서 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            embeddings: shape (n, dim) 임베딩 행렬 (로드 시 L2 정규화)
+            embedding_dim: 저장 차원 수 (쿼리도 같은 차원으로 절단)
+            embedding_precision: 메모리 보관 정밀도 ('float32'/'float16', float16이면 행렬 메모리 절반)
+            collection_name: 원본 컬렉션 이름 (sparse 역색인 경로 등에 사용)
+            persist_directory: 원본 컬렉션 저장 경로
+        """
+        if len(embeddings) != len(ids):
+            raise ValueError("ID, 문서, 메타데이터, 임베딩의 개수가 일치하지 않습니다.")
+        self._init_rows(
+            ids, documents, metadatas,
+            embedding_dim, embedding_precision, collection_name, persist_directory
+        )
+
+        # 연속 메모리의 정규화 행렬 (내적 = 코사인 유사도, 저장 정밀도 자료형)
+        if len(self.ids):
+            self.matrix = self._stored_rows(
+                reduce_embeddings(np.asarray(embeddings).reshape(len(self.ids), -1), embedding_dim)
+            )
+        else:
+            self.matrix = np.empty((0, 0), dtype=self._storage_dtype)
+
+        print(f"[OK] NumPy 벡터 스토어 준비 완료 (문서 수: {len(self.ids)}, "
+              f"행렬 {self.matrix.shape}, {self.matrix.nbytes / 1024 / 1024:.1f}MB)")
+
+    def _init_rows(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embedding_dim: Optional[int],
+        embedding_precision: str,
+        collection_name: str,
+        persist_directory: Optional[str]
+    ) -> None:
+        """문서/메타데이터 행과 필터 마스크 초기화 (벡터 저장 방식과 무관한 공통 부분)"""
+        if not (len(ids) == len(documents) == len(metadatas)):
+            raise ValueError("ID, 문서, 메타데이터, 임베딩의 개수가 일치하지 않습니다.")
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.embedding_dim = embedding_dim
+        self.embedding_precision = embedding_precision
+
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [dict(metadata or {}) for metadata in metadatas]
+        self._id_index = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        # 문서 추가/삭제 때마다 증가 (VectorStore.generation)
+        self.generation = 0
+
+        # 메타데이터 필터용 마스크: {키: {값: bool 배열}}
+        self._value_masks: Dict[str, Dict[Any, np.ndarray]] = defaultdict(dict)
+        self._build_masks()
+
+    @property
+    def _storage_dtype(self):
+        return np.float16 if self.embedding_precision == "float16" else np.float32
+
+    def _stored_rows(self, embeddings: np.ndarray) -> np.ndarray:
+        """임베딩을 정규화한 뒤 저장 정밀도 자료형으로 변환"""
+        return np.ascontiguousarray(normalize_rows(embeddings), dtype=self._storage_dtype)
+
+    @classmethod
+    def from_chroma(
+        cls,
+        vector_store: Optional[ChromaVectorStore] = None,
+        embedding_precision: Optional[str] = None
+    ) -> "NumpyVectorStore":
+        """
+        기존 ChromaDB 컬렉션 전체를 메모리로 로드
+
+        Args:
+            vector_store: 원본 ChromaVectorStore (None이면 기본 컬렉션)
+            embedding_precision: 메모리 보관 정밀도 (None이면 컬렉션 값, 'float16'이면 메모리 절반)
+        """
+        if vector_store is None:
+            vector_store = ChromaVectorStore()
+
+        # 페이지 단위로 읽어 한 번에 큰 collection.get 응답을 만들지 않음
+        ids, documents, metadatas, blocks = [], [], [], []
+        for page in vector_store.iter_documents():
+            ids += page["ids"]
+            documents += page["documents"]
+            metadatas += page["metadatas"]
+            blocks.append(page["embeddings"])
+        embeddings = np.concatenate(blocks) if blocks else np.empty((0, 0), dtype=np.float32)
+
+        return cls(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            embedding_dim=vector_store.embedding_dim,
+            embedding_precision=embedding_precision or vector_store.embedding_precision,
+            collection_name=vector_store.collection_name,
+            persist_directory=vector_store.persist_directory
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot_dir: str, embedding_precision: Optional[str] = None) -> "NumpyVectorStore":
+        """
+        export_snapshot()으로 만든 스냅샷 디렉토리에서 로드 (ChromaDB 조회 없음)
+
+        Args:
+            snapshot_dir: 스냅샷 디렉토리 경로
+            embedding_precision: 메모리 보관 정밀도 (None이면 스냅샷 값)
+        """
+        from .snapshot import EmbeddingSnapshot
+
+        snapshot = EmbeddingSnapshot(snapshot_dir)
+        manifest = snapshot.manifest
+        return cls(
+            ids=[snapshot.id(i) for i in range(len(snapshot))],
+            documents=[snapshot.document(i) for i in range(len(snapshot))],
+            metadatas=[snapshot.metadata(i) for i in range(len(snapshot))],
+            embeddings=snapshot.embeddings,
+            embedding_dim=manifest.get("embedding_dim"),
+            embedding_precision=embedding_precision or manifest.get("embedding_precision", "float32"),
+            collection_name=manifest.get("collection_name", "commercial_analysis_docs")
+        )
+
+    def _build_masks(self) -> None:
+        """메타데이터 (키, 값) 조합별 bool 마스크 미리 계산"""
+        positions: Dict[str, Dict[Any, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for i, metadata in enumerate(self.metadatas):
+            for key, value in metadata.items():
+                positions[key][value].append(i)
+
+        n = len(self.ids)
+        self._value_masks.clear()
+        for key, values in positions.items():
+            for value, indices in values.items():
+                mask = np.zeros(n, dtype=bool)
+                mask[indices] = True
+                self._value_masks[key][value] = mask
+
+    def _filter_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Chroma where 필터를 bool 마스크로 변환
+
+        지원: {"키": 값}, $eq, $ne, $in, $nin, $and, $or
+        """
+        n = len(self.ids)
+        masks = []
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                sub_masks = [self._filter_mask(sub) for sub in condition]
+                combine = np.logical_and if key == "$and" else np.logical_or
+                masks.append(combine.reduce(sub_masks) if sub_masks else np.ones(n, dtype=bool))
+                continue
+
+            value_masks = self._value_masks.get(key, {})
+            none = np.zeros(n, dtype=bool)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for op, operand in condition.items():
+                if op == "$eq":
+                    masks.append(value_masks.get(operand, none))
+                elif op == "$ne":
+                    masks.append(~value_masks.get(operand, none))
+                elif op in ("$in", "$nin"):
+                    mask = np.logical_or.reduce(
+                        [value_masks.get(value, none) for value in operand] or [none]
+                    )
+                    masks.append(mask if op == "$in" else ~mask)
+                else:
+                    raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+
+        return np.logical_and.reduce(masks) if masks else np.ones(n, dtype=bool)
+
+    def prepare_query_embedding(self, query_embedding: EmbeddingInput) -> np.ndarray:
+        """쿼리 벡터를 저장 차원에 맞게 변환 (쿼리는 float32 유지)"""
+        return reduce_embeddings([query_embedding], self.embedding_dim)[0]
+
+    def search(
+        self,
+        query_embedding: EmbeddingInput,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        유사도 기반 문서 검색 (ChromaVectorStore.search와 같은 결과 형식)
+
+        Args:
+            query_embedding: 검색 쿼리 임베딩 벡터 (리스트 또는 float32 ndarray)
+            top_k: 반환할 문서 개수
+            filter_metadata: 메타데이터 필터 (예: {"source": "guide.pdf"})
+
+        Returns:
+            {"documents": [...], "metadatas": [...], "distances": [...], "ids": [...]}
+            distances는 Chroma cosine 공간과 같은 1 - 코사인 유사도
+        """
+        return self.search_many([query_embedding], top_k, filter_metadata)[0]
+
+    def search_many(
+        self,
+        query_embeddings: EmbeddingsInput,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 쿼리를 한 번의 행렬 곱으로 검색
+
+        Args:
+            query_embeddings: 쿼리 임베딩 리스트 또는 (n, dim) float32 ndarray
+            top_k: 쿼리별 반환할 문서 개수
+            filter_metadata: 모든 쿼리에 적용할 메타데이터 필터
+
+        Returns:
+            쿼리 순서대로 search()와 같은 형식의 결과 딕셔너리 리스트
+        """
+        empty = {"documents": [], "metadatas": [], "distances": [], "ids": []}
+        if len(query_embeddings) == 0:
+            return []
+        if len(self.ids) == 0 or top_k <= 0:
+            return [dict(empty) for _ in range(len(query_embeddings))]
+
+        queries = reduce_embeddings(query_embeddings, self.embedding_dim)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        candidates = None
+        if filter_metadata:
+            candidates = np.flatnonzero(self._filter_mask(filter_metadata))
+            if len(candidates) == 0:
+                return [dict(empty) for _ in range(len(queries))]
+
+        num_candidates = len(candidates) if candidates is not None else len(self.ids)
+        rows, top_scores = self._select_top_k(queries, candidates, min(top_k, num_candidates))
+
+        return [
+            {
+                "documents": [self.documents[i] for i in query_rows],
+                "metadatas": [self.metadatas[i] for i in query_rows],
+                "distances": (1.0 - query_scores).astype(float).tolist(),
+                "ids": [self.ids[i] for i in query_rows]
+            }
+            for query_rows, query_scores in zip(rows, top_scores)
+        ]
+
+    def _select_top_k(
+        self,
+        queries: np.ndarray,
+        candidates: Optional[np.ndarray],
+        k: int
+    ):
+        """
+        쿼리별 상위 k개 문서 선택
+
+        Args:
+            queries: (q, dim) 정규화 쿼리 행렬
+            candidates: 필터를 통과한 문서 행 번호 (None이면 전체)
+            k: 선택할 문서 수 (후보 수 이하)
+
+        Returns:
+            (문서 행 번호 (q, k), 코사인 유사도 (q, k)) 유사도 내림차순
+        """
+        matrix = self.matrix if candidates is None else self.matrix[candidates]
+        if matrix.dtype == np.float32:
+            scores = queries @ matrix.T
+        else:
+            # float16 행렬 전체를 한 번에 변환하지 않고 블록 단위로 float32 계산
+            scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+            for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+                block = matrix[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+                scores[:, start:start + len(block)] = queries @ block.T
+        top, top_scores = top_k_rows(scores, k)
+        return (candidates[top] if candidates is not None else top), top_scores
+
+    def _row_embeddings(self, rows: List[int]) -> np.ndarray:
+        """문서 행 번호의 정규화 float32 임베딩"""
+        return self.matrix[rows].astype(np.float32)
+
+    def get_documents(
+        self,
+        ids: List[str],
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        """
+        ID로 문서 조회 (ChromaVectorStore.get_documents와 같은 결과 형식)
+
+        Args:
+            ids: 조회할 문서 ID 리스트
+            filter_metadata: 메타데이터 필터 (조건에 맞지 않는 문서는 제외)
+            include_embeddings: 임베딩 포함 여부
+        """
+        rows = [self._id_index[doc_id] for doc_id in ids if doc_id in self._id_index]
+        if filter_metadata and rows:
+            mask = self._filter_mask(filter_metadata)
+            rows = [i for i in rows if mask[i]]
+
+        return {
+            "ids": [self.ids[i] for i in rows],
+            "documents": [self.documents[i] for i in rows],
+            "metadatas": [self.metadatas[i] for i in rows],
+            "embeddings": self._row_embeddings(rows) if include_embeddings else None
+        }
+
+    def filter_ids(self, filter_metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """메타데이터 필터를 통과하는 문서 ID 리스트 (None이면 전체 문서 ID)"""
+        if not filter_metadata:
+            return list(self.ids)
+        return [self.ids[i] for i in np.flatnonzero(self._filter_mask(filter_metadata))]
+
+    def get_document_count(self) -> int:
+        """저장된 문서 개수 반환"""
+        return len(self.ids)
+
+    def _replace_rows(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        matrix: np.ndarray
+    ) -> None:
+        """문서 추가/삭제 후 행 목록, ID 색인, 필터 마스크, 행렬 교체"""
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self._id_index = {doc_id: i for i, doc_id in enumerate(ids)}
+        self._build_masks()
+        self.matrix = matrix if len(ids) else np.empty((0, 0), dtype=self._storage_dtype)
+        self.generation += 1
+
+    def add_documents(
+        self,
+        texts: List[str],
+        embeddings: EmbeddingsInput,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[str]:
+        """
+        문서 추가 (메모리에만 반영, 검색과 동시에 호출하지 않는 단일 작성자 기준)
+
+        Args:
+            texts: 문서 텍스트 리스트
+            embeddings: 임베딩 벡터 리스트 또는 (n, dim) float32 ndarray
+            metadatas: 메타데이터 리스트
+            ids: 문서 ID 리스트 (None이면 경로/페이지/청크 번호/내용 해시로 생성)
+            batch_size: ChromaVectorStore 호환용 (사용하지 않음)
+
+        Returns:
+            추가된 문서 ID 리스트
+        """
+        if not texts or len(embeddings) == 0:
+            raise ValueError("텍스트와 임베딩이 비어있습니다.")
+        if len(texts) != len(embeddings):
+            raise ValueError("텍스트와 임베딩의 개수가 일치하지 않습니다.")
+
+        if metadatas is None:
+            metadatas = [{"source": "unknown"} for _ in texts]
+        if ids is None:
+            ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+        duplicated = [doc_id for doc_id in ids if doc_id in self._id_index]
+        if duplicated or len(set(ids)) != len(ids):
+            raise ValueError(f"이미 존재하거나 중복된 문서 ID가 있습니다: {duplicated[:3]}")
+
+        matrix = self._stored_rows(reduce_embeddings(embeddings, self.embedding_dim))
+        if len(self.ids) and matrix.shape[1] != self.matrix.shape[1]:
+            raise ValueError(
+                f"임베딩 차원({matrix.shape[1]})이 기존 차원({self.matrix.shape[1]})과 다릅니다."
+            )
+
+        self._replace_rows(
+            self.ids + list(ids),
+            self.documents + list(texts),
+            self.metadatas + [dict(metadata or {}) for metadata in metadatas],
+            np.concatenate([self.matrix, matrix]) if len(self.ids) else matrix
+        )
+        print(f"[OK] {len(ids)}개 문서 추가 완료 (문서 수: {len(self.ids)})")
+        return list(ids)
+
+    def upsert_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[EmbeddingsInput] = None,
+        embedding_function: Optional[Callable[[List[str]], EmbeddingsInput]] = None,
+        prune_scope: Optional[str] = "source"
+    ) -> Dict[str, List[str]]:
+        """
+        결정적 ID 기준으로 변경된 청크만 반영 (ChromaVectorStore.upsert_documents와 같은 동작)
+
+        Args:
+            texts: 문서 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            embeddings: 전체 텍스트의 임베딩 (embedding_function과 둘 중 하나 필요)
+            embedding_function: 새 청크 텍스트만 받아 임베딩을 반환하는 함수
+            prune_scope: 이번 입력에 없는 기존 청크 삭제 범위 ("source"/"collection"/None)
+
+        Returns:
+            {"added": [...], "unchanged": [...], "deleted": [...]} 문서 ID 리스트
+        """
+        if len(texts) != len(metadatas):
+            raise ValueError("텍스트와 메타데이터의 개수가 일치하지 않습니다.")
+        if embeddings is None and embedding_function is None:
+            raise ValueError("embeddings 또는 embedding_function이 필요합니다.")
+        if prune_scope not in (None, "source", "collection"):
+            raise ValueError(f"지원하지 않는 prune_scope: {prune_scope}")
+
+        ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+        # 같은 내용이 중복 입력된 경우 첫 번째만 사용
+        first_index: Dict[str, int] = {}
+        for i, doc_id in enumerate(ids):
+            first_index.setdefault(doc_id, i)
+
+        new_indices = [i for doc_id, i in first_index.items() if doc_id not in self._id_index]
+        unchanged = [doc_id for doc_id in first_index if doc_id in self._id_index]
+
+        # 이번 입력에 없는 기존 청크 (추가 전에 계산)
+        deleted: List[str] = []
+        if prune_scope == "collection":
+            deleted = [doc_id for doc_id in self.ids if doc_id not in first_index]
+        elif prune_scope == "source":
+            sources = {source_key(metadata) for metadata in metadatas}
+            deleted = [
+                doc_id for doc_id, metadata in zip(self.ids, self.metadatas)
+                if doc_id not in first_index
+                and (metadata.get("relative_path") in sources or metadata.get("source") in sources)
+            ]
+
+        added: List[str] = []
+        if new_indices:
+            new_texts = [texts[i] for i in new_indices]
+            if embedding_function is not None:
+                new_embeddings = embedding_function(new_texts)
+            else:
+                new_embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)[new_indices]
+            added = self.add_documents(
+                texts=new_texts,
+                embeddings=new_embeddings,
+                metadatas=[metadatas[i] for i in new_indices],
+                ids=[ids[i] for i in new_indices]
+            )
+
+        deleted = sorted(deleted)
+        if deleted:
+            self.delete_documents(deleted)
+
+        print(f"[OK] upsert 완료: 추가 {len(added)}개, 유지 {len(unchanged)}개, 삭제 {len(deleted)}개")
+        return {"added": added, "unchanged": unchanged, "deleted": deleted}
+
+    def delete_documents(self, ids: List[str]) -> bool:
+        """
+        문서 삭제 (메모리에만 반영)
+
+        Args:
+            ids: 삭제할 문서 ID 리스트
+
+        Returns:
+            성공 여부
+        """
+        remove = {self._id_index[doc_id] for doc_id in ids if doc_id in self._id_index}
+        keep = [i for i in range(len(self.ids)) if i not in remove]
+        self._replace_rows(
+            [self.ids[i] for i in keep],
+            [self.documents[i] for i in keep],
+            [self.metadatas[i] for i in keep],
+            self.matrix[keep] if keep else np.empty((0, 0), dtype=self._storage_dtype)
+        )
+        print(f"[OK] {len(remove)}개 문서 삭제 완료")
+        return True
+
+    def iter_documents(
+        self,
+        page_size: int = 1000,
+        include_embeddings: bool = True,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        page_size 단위 순회 (ChromaVectorStore.iter_documents와 같은 형식)
+
+        Args:
+            page_size: 페이지당 문서 수
+            include_embeddings: 임베딩 포함 여부 (포함 시 (n, dim) float32 ndarray)
+            filter_metadata: 메타데이터 필터
+        """
+        if page_size < 1:
+            raise ValueError("page_size는 1 이상이어야 합니다.")
+
+        if filter_metadata:
+            rows = np.flatnonzero(self._filter_mask(filter_metadata))
+        else:
+            rows = np.arange(len(self.ids))
+
+        for start in range(0, len(rows), page_size):
+            page = rows[start:start + page_size]
+            yield {
+                "ids": [self.ids[i] for i in page],
+                "documents": [self.documents[i] for i in page],
+                "metadatas": [self.metadatas[i] for i in page],
+                "embeddings": self._row_embeddings(page) if include_embeddings else None
+            }
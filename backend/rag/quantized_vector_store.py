@@ -0,0 +1,228 @@
+"""
+int8 스칼라 양자화 후보 검색 + float32 정밀 재채점 벡터 스토어 모듈
+
+벡터를 차원별 scale의 int8 코드로 메모리에 두고(float32 대비 1/4),
+근사 내적으로 상위 N개 후보를 고른 뒤 그 후보만 스냅샷의 float32 벡터
+(memory-map, 필요한 행만 디스크에서 읽음)로 정확히 재채점합니다.
+거리는 정확한 코사인 거리이므로 Retriever의 임계값 필터링은 그대로 동작합니다.
+
+절약되는 것은 상주 메모리이며 연산량은 아닙니다. NumPy에는 BLAS 수준의 int8 행렬곱이
+없으므로 근사 점수는 int8 코드를 블록 단위로 float32로 복원해 float32 행렬곱으로 계산합니다.
+
+float32 벡터가 읽기 전용 스냅샷에 있으므로 SearchableVectorStore(읽기 인터페이스)만
+만족하며, 문서 추가/갱신/삭제는 ReadOnlyStoreError를 발생시킵니다.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .numpy_vector_store import NumpyVectorStore, top_k_rows
+from .snapshot import EmbeddingSnapshot, export_snapshot
+from .vector_store import ChromaVectorStore
+from .vector_store_protocol import ReadOnlyStoreError
+
+
+def quantize_int8(
+    embeddings: np.ndarray,
+    block_size: int = 8192
+):
+    """
+    차원별 대칭 스케일 int8 양자화 (블록 단위로 처리하여 memmap 입력도 메모리 일정)
+
+    Args:
+        embeddings: (n, dim) float32 행렬 (np.memmap 가능)
+        block_size: 한 번에 처리할 행 수
+
+    Returns:
+        (int8 코드 (n, dim), 차원별 scale (dim,) float32)  x ≈ code × scale
+    """
+    n, dim = embeddings.shape
+    max_abs = np.zeros(dim, dtype=np.float32)
+    for start in range(0, n, block_size):
+        block = np.asarray(embeddings[start:start + block_size], dtype=np.float32)
+        np.maximum(max_abs, np.abs(block).max(axis=0), out=max_abs)
+    scale = np.maximum(max_abs, 1e-12) / 127.0
+
+    codes = np.empty((n, dim), dtype=np.int8)
+    for start in range(0, n, block_size):
+        block = np.asarray(embeddings[start:start + block_size], dtype=np.float32)
+        codes[start:start + len(block)] = np.clip(np.rint(block / scale), -127, 127)
+    return codes, scale.astype(np.float32)
+
+
+class QuantizedVectorStore(NumpyVectorStore):
+    """int8 양자화 후보 검색 + float32 재채점 벡터 스토어 (읽기 전용, SearchableVectorStore 호환)"""
+
+    def __init__(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        exact_embeddings: np.ndarray,
+        rescore_candidates: int = 50,
+        score_block_size: int = 4096,
+        embedding_dim: Optional[int] = None,
+        embedding_precision: str = "float32",
+        collection_name: str = "commercial_analysis_docs",
+        persist_directory: Optional[str] = None
+    ):
+        """
+        Args:
+            ids: 문서 ID 리스트
+            documents: 문서 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            exact_embeddings: 재채점용 (n, dim) float32 행렬 (스냅샷 memmap 권장)
+            rescore_candidates: 쿼리별 float32로 재채점할 후보 수 (top_k보다 작으면 top_k)
+            score_block_size: 양자화 점수 계산 시 한 번에 처리할 행 수 (임시 메모리 상한)
+            embedding_dim: 저장 차원 수 (쿼리도 같은 차원으로 절단)
+            embedding_precision: 저장 정밀도 ('float32'/'float16')
+            collection_name: 원본 컬렉션 이름 (sparse 역색인 경로 등에 사용)
+            persist_directory: 원본 컬렉션 저장 경로
+        """
+        if len(exact_embeddings) != len(ids):
+            raise ValueError("ID, 문서, 메타데이터, 임베딩의 개수가 일치하지 않습니다.")
+        self._init_rows(
+            ids, documents, metadatas,
+            embedding_dim, embedding_precision, collection_name, persist_directory
+        )
+
+        self.rescore_candidates = rescore_candidates
+        self.score_block_size = score_block_size
+        self.exact_embeddings = exact_embeddings
+        if len(ids):
+            self.codes, self.scale = quantize_int8(exact_embeddings)
+        else:
+            self.codes = np.empty((0, 0), dtype=np.int8)
+            self.scale = np.empty(0, dtype=np.float32)
+
+        stats = self.memory_stats()
+        print(f"[OK] int8 양자화 벡터 스토어 준비 완료 (문서 수: {len(self.ids)}, "
+              f"int8 {stats['quantized_mb']:.1f}MB / float32 {stats['float32_mb']:.1f}MB, "
+              f"재채점 후보 {rescore_candidates}개)")
+
+    @classmethod
+    def from_snapshot(cls, snapshot_dir: str, **kwargs) -> "QuantizedVectorStore":
+        """
+        export_snapshot()으로 만든 스냅샷에서 로드 (float32 벡터는 memory-map으로만 참조)
+
+        Args:
+            snapshot_dir: 스냅샷 디렉토리 경로
+            **kwargs: 생성자 인자 (rescore_candidates 등)
+        """
+        snapshot = EmbeddingSnapshot(snapshot_dir)
+        manifest = snapshot.manifest
+        return cls(
+            ids=[snapshot.id(i) for i in range(len(snapshot))],
+            documents=[snapshot.document(i) for i in range(len(snapshot))],
+            metadatas=[snapshot.metadata(i) for i in range(len(snapshot))],
+            exact_embeddings=snapshot.embeddings,
+            embedding_dim=manifest.get("embedding_dim"),
+            embedding_precision=manifest.get("embedding_precision", "float32"),
+            collection_name=manifest.get("collection_name", "commercial_analysis_docs"),
+            **kwargs
+        )
+
+    @classmethod
+    def from_chroma(
+        cls,
+        vector_store: Optional[ChromaVectorStore] = None,
+        snapshot_dir: Optional[str] = None,
+        **kwargs
+    ) -> "QuantizedVectorStore":
+        """
+        ChromaDB 컬렉션을 스냅샷으로 내보낸 뒤 로드
+
+        Args:
+            vector_store: 원본 ChromaVectorStore (None이면 기본 컬렉션)
+            snapshot_dir: 스냅샷 디렉토리 (None이면 data/snapshots/<컬렉션 이름>)
+            **kwargs: 생성자 인자 (rescore_candidates 등)
+        """
+        if vector_store is None:
+            vector_store = ChromaVectorStore()
+        if snapshot_dir is None:
+            snapshot_dir = str(
+                Path(__file__).parent.parent / "data" / "snapshots" / vector_store.collection_name
+            )
+        os.makedirs(os.path.dirname(snapshot_dir), exist_ok=True)
+
+        export_snapshot(vector_store, snapshot_dir)
+        store = cls.from_snapshot(snapshot_dir, **kwargs)
+        # sparse 역색인 등 컬렉션 옆 파일을 찾을 수 있도록 원본 저장 경로 유지
+        store.persist_directory = vector_store.persist_directory
+        return store
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """상주 메모리(int8 코드 + scale)와 같은 벡터의 float32 행렬 크기 비교"""
+        quantized = self.codes.nbytes + self.scale.nbytes
+        float32 = self.codes.size * 4
+        return {
+            "quantized_mb": quantized / 1024 / 1024,
+            "float32_mb": float32 / 1024 / 1024,
+            "saving_ratio": round(1 - quantized / float32, 4) if float32 else 0.0
+        }
+
+    def _approximate_scores(self, queries: np.ndarray, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """
+        양자화 코드로 계산한 근사 내적 점수 (q, 후보 수)
+
+        q·x ≈ (q ∘ scale)·code 이므로 쿼리에 scale을 곱해 두고, int8 코드 블록을
+        float32로 복원하여 float32 행렬곱(BLAS)으로 곱합니다. 정수 내적이 아니므로
+        연산량은 float32 검색과 같고, 임시 메모리만 score_block_size 행 분량으로 제한됩니다.
+        """
+        scaled_queries = (queries * self.scale).T.astype(np.float32)
+        total = len(candidates) if candidates is not None else len(self.codes)
+
+        scores = np.empty((len(queries), total), dtype=np.float32)
+        for start in range(0, total, self.score_block_size):
+            end = min(start + self.score_block_size, total)
+            if candidates is not None:
+                block = self.codes[candidates[start:end]]
+            else:
+                block = self.codes[start:end]
+            scores[:, start:end] = (block.astype(np.float32) @ scaled_queries).T
+        return scores
+
+    def _select_top_k(
+        self,
+        queries: np.ndarray,
+        candidates: Optional[np.ndarray],
+        k: int
+    ):
+        """양자화 점수로 상위 N개 후보 선택 후 float32 벡터로 재채점하여 상위 k개 반환"""
+        approximate = self._approximate_scores(queries, candidates)
+        n = min(max(self.rescore_candidates, k), approximate.shape[1])
+        shortlist, _ = top_k_rows(approximate, n)
+        if candidates is not None:
+            shortlist = candidates[shortlist]
+
+        rows = np.empty((len(queries), k), dtype=np.int64)
+        top_scores = np.empty((len(queries), k), dtype=np.float32)
+        for qi, (query, query_rows) in enumerate(zip(queries, shortlist)):
+            # memmap에서는 정렬된 행 번호로 읽어야 디스크 접근이 순차적
+            order = np.sort(query_rows)
+            exact = self._row_embeddings(order)
+            exact_scores = (exact @ query)[None, :]
+            best, best_scores = top_k_rows(exact_scores, k)
+            rows[qi] = order[best[0]]
+            top_scores[qi] = best_scores[0]
+        return rows, top_scores
+
+    def _row_embeddings(self, rows) -> np.ndarray:
+        """문서 행 번호의 정규화 float32 임베딩 (스냅샷에서 해당 행만 읽음)"""
+        exact = np.asarray(self.exact_embeddings[rows], dtype=np.float32)
+        return exact / np.maximum(np.linalg.norm(exact, axis=1, keepdims=True), 1e-12)
+
+    def add_documents(self, *args, **kwargs) -> List[str]:
+        """읽기 전용 (ReadOnlyStoreError)"""
+        raise ReadOnlyStoreError("QuantizedVectorStore는 읽기 전용입니다. 컬렉션을 갱신한 뒤 다시 로드하세요.")
+
+    def upsert_documents(self, *args, **kwargs) -> Dict[str, List[str]]:
+        """읽기 전용 (ReadOnlyStoreError)"""
+        raise ReadOnlyStoreError("QuantizedVectorStore는 읽기 전용입니다. 컬렉션을 갱신한 뒤 다시 로드하세요.")
+
+    def delete_documents(self, ids: List[str]) -> bool:
+        """읽기 전용 (ReadOnlyStoreError)"""
+        raise ReadOnlyStoreError("QuantizedVectorStore는 읽기 전용입니다. 컬렉션을 갱신한 뒤 다시 로드하세요.")
@@ -6,6 +6,7 @@ RAG (Retrieval-Augmented Generation) 파이프라인
 
 from typing import List, Dict, Any, Optional
 from openai import OpenAI
+import asyncio
 import os
 from .retriever import Retriever
 from .embeddings import BGEEmbeddings
@@ -128,6 +129,26 @@ class RAGChain:
 
         print(f"[OK] RAG 파이프라인 준비 완료 (모델: {model_name})")
 
+    async def warm_up(self, discover_mcp_tools: bool = False) -> None:
+        """
+        서버 시작 시 첫 요청 지연을 없애기 위한 워밍업
+
+        Args:
+            discover_mcp_tools: MCP 도구 발견까지 미리 수행할지 여부
+        """
+        print("[RAG] 워밍업: 더미 임베딩 + 벡터 검색 실행 중...")
+        await asyncio.to_thread(self.retriever.warm_up)
+        print("[OK] 워밍업: 검색기 준비 완료")
+
+        if discover_mcp_tools and self.mcp_tool_router and not self.mcp_initialized:
+            try:
+                tool_count = await self.mcp_tool_router.initialize()
+                self.mcp_initialized = True
+                print(f"[OK] 워밍업: MCP 도구 발견 완료 ({tool_count}개)")
+            except Exception as e:
+                # MCP 실패는 치명적이지 않음 (첫 요청 시 다시 시도)
+                print(f"[WARN] 워밍업: MCP 도구 발견 실패: {e}")
+
     def _get_system_prompt(self, mode: str) -> str:
         """
         컨텍스트 모드에 맞는 시스템 프롬프트 생성
@@ -636,8 +657,9 @@ class RAGChain:
 
         # 1. 로컬 문서 검색 (항상 실행)
         print(f"[DOCS] 1단계: 로컬 문서 검색 (Top-{top_k})...")
-        local_docs = self.retriever.search(search_query, top_k=top_k)
-        print(f"   [OK] {len(local_docs)}개 문서 검색 완료")
+        local_docs = await self.retriever.asearch(search_query, top_k=top_k)
+        print(f"   [OK] {len(local_docs)}개 문서 검색 완료 "
+              f"(검색 대기열: {self.retriever.get_executor_stats()['queue_depth']})")
 
         # 2. MCP Tool Router 실행 (LLM이 판단)
         print(f"[MCP] 2단계: LLM 기반 도구 선택 및 실행...")
@@ -714,8 +736,9 @@ class RAGChain:
 
         # 1. 로컬 문서 검색 (항상 실행)
         print(f"[DOCS] 1단계: 로컬 문서 검색 (Top-{top_k})...")
-        local_docs = self.retriever.search(search_query, top_k=top_k)
-        print(f"   [OK] {len(local_docs)}개 문서 검색 완료")
+        local_docs = await self.retriever.asearch(search_query, top_k=top_k)
+        print(f"   [OK] {len(local_docs)}개 문서 검색 완료 "
+              f"(검색 대기열: {self.retriever.get_executor_stats()['queue_depth']})")
 
         # 2. MCP Tool Router 실행 (LLM이 판단)
         print(f"[MCP] 2단계: LLM 기반 도구 선택 및 실행...")
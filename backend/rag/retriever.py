@@ -2,11 +2,24 @@
 검색기 모듈
 
 임베딩 모델과 벡터 스토어를 사용하여 관련 문서를 검색합니다.
+BM25 인덱스를 함께 주면 dense 결과와 어휘 검색 결과를 reciprocal rank fusion으로 결합합니다.
 """
 
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import threading
+import numpy as np
 from .embeddings import BGEEmbeddings
+from .embedding_cache import QueryEmbeddingCache
+from .batching_embedder import BatchingEmbedder
 from .vector_store import ChromaVectorStore
+from .vector_store_protocol import SearchableVectorStore
+from .sparse_index import SparseLexicalIndex
+from .bm25_index import BM25Index
+from .metadata_partitions import partition_filter
 from .document_loader import Document
 
 
@@ -16,18 +29,44 @@ class Retriever:
     def __init__(
         self,
         embeddings: BGEEmbeddings = None,
-        vector_store: ChromaVectorStore = None,
+        vector_store: Optional[SearchableVectorStore] = None,
         top_k: int = 3,
-        score_threshold: float = 0.5
+        score_threshold: float = 0.5,
+        query_cache_size: int = 1024,
+        query_cache_ttl: Optional[float] = None,
+        search_workers: int = 4,
+        max_pending_searches: int = 64,
+        sparse_index: Optional[SparseLexicalIndex] = None,
+        sparse_weight: float = 0.3,
+        sparse_score_threshold: float = 0.15,
+        sparse_candidates: int = 20,
+        bm25_index: Optional[BM25Index] = None,
+        bm25_candidates: int = 20,
+        bm25_max_distance: float = 0.7,
+        rrf_k: int = 60
     ):
         """
         검색기 초기화
 
         Args:
             embeddings: 임베딩 모델 인스턴스
-            vector_store: 벡터 스토어 인스턴스
+            vector_store: 벡터 스토어 인스턴스 (SearchableVectorStore 인터페이스 구현체, None이면 ChromaVectorStore)
             top_k: 반환할 문서 개수
             score_threshold: 최소 유사도 점수 (0~1, 낮을수록 유사)
+            query_cache_size: 쿼리 임베딩 LRU 캐시 크기 (0이면 캐시 사용 안 함)
+            query_cache_ttl: 쿼리 임베딩 캐시 유효 시간 (초, None이면 만료 없음)
+            search_workers: asearch 전용 스레드 풀 크기
+            max_pending_searches: asearch 동시 대기 한도 (초과 시 호출자가 대기)
+            sparse_index: BGE-M3 sparse 어휘 가중치 역색인 (None이면 dense 검색만 사용)
+            sparse_weight: 순위 계산 시 어휘 매칭 점수 가중치 (dense 유사도 + w × 어휘 점수)
+            sparse_score_threshold: dense 임계값을 넘더라도 통과시킬 최소 어휘 매칭 점수
+            sparse_candidates: dense/sparse 각각에서 가져올 후보 문서 수
+            bm25_index: 청크 텍스트 문자 n-gram BM25 인덱스 (None이면 사용 안 함,
+                BM25Index.load_or_build(vector_store)로 생성)
+            bm25_candidates: dense/BM25 각각에서 순위 융합에 사용할 후보 문서 수
+            bm25_max_distance: dense 임계값을 넘지 못하고 BM25로만 들어온 후보의 최대 코사인 거리
+                (score_threshold보다 느슨한 하한선, score_threshold <= 0이면 적용 안 함)
+            rrf_k: reciprocal rank fusion 상수 (점수 = Σ 1 / (rrf_k + 순위))
         """
         # 임베딩 모델 초기화
         if embeddings is None:
@@ -46,11 +85,219 @@ class Retriever:
         self.top_k = top_k
         self.score_threshold = score_threshold
 
+        # sparse 어휘 매칭 (임베딩 모델이 enable_sparse=True로 로드된 경우에만 사용)
+        self.sparse_index = sparse_index
+        self.sparse_weight = sparse_weight
+        self.sparse_score_threshold = sparse_score_threshold
+        self.sparse_candidates = sparse_candidates
+        self.use_sparse = (
+            sparse_index is not None
+            and getattr(self.embeddings, "sparse_head", None) is not None
+        )
+        if sparse_index is not None and not self.use_sparse:
+            print("[WARN] 임베딩 모델에 sparse 헤드가 없어 어휘 매칭을 사용하지 않습니다. "
+                  "(BGEEmbeddings(enable_sparse=True) 필요)")
+        # sparse 역색인이 속한 물리 컬렉션 (별칭 전환 시 다시 로드)
+        self._sparse_collection = getattr(self.vector_store, "collection_name", None)
+
+        # BM25 어휘 검색 (dense 결과와 reciprocal rank fusion으로 결합)
+        self.bm25_index = bm25_index
+        self.bm25_candidates = bm25_candidates
+        self.bm25_max_distance = bm25_max_distance
+        self.rrf_k = rrf_k
+        self._bm25_collection = self._sparse_collection
+        # 벡터 스토어 세대가 바뀌면(문서 추가/삭제) BM25 인덱스를 차이만큼 동기화
+        self._bm25_generation = getattr(self.vector_store, "generation", None)
+        self._bm25_lock = threading.Lock()
+        self._bm25_syncing = False
+        # 필터별 BM25 검색 허용 문서 ID 집합 {필터 JSON: (세대, ID 집합)}
+        self._bm25_filter_ids: "OrderedDict[str, tuple]" = OrderedDict()
+
+        # 반복 질문/후속 질문의 동일 쿼리 임베딩 재계산 방지
+        if query_cache_size > 0:
+            self.query_cache = QueryEmbeddingCache(
+                max_entries=query_cache_size,
+                ttl_seconds=query_cache_ttl
+            )
+        else:
+            self.query_cache = None
+
+        # 임베딩/벡터 검색을 이벤트 루프 밖에서 실행하기 위한 전용 실행기
+        self.search_workers = search_workers
+        self.max_pending_searches = max_pending_searches
+        self._executor = ThreadPoolExecutor(
+            max_workers=search_workers,
+            thread_name_prefix="retriever-search"
+        )
+        self._search_slots = asyncio.Semaphore(max_pending_searches)
+        self._metrics_lock = threading.Lock()
+        self._in_flight = 0   # asearch 호출 후 완료되지 않은 작업 수
+        self._running = 0     # 워커 스레드에서 실행 중인 작업 수
+        self._peak_queue_depth = 0
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """쿼리 임베딩 (LRU 캐시 경유, float32 ndarray)"""
+        if self.query_cache is None:
+            return self.embeddings.embed_query_array(query)
+        return self.query_cache.get_or_compute(query, self.embeddings.embed_query_array)
+
+    def _embed_query_with_sparse(self, query: str):
+        """쿼리 dense 벡터 + sparse 가중치 (LRU 캐시 경유)"""
+        if self.query_cache is None:
+            return self.embeddings.embed_query_with_sparse(query)
+        return self.query_cache.get_or_compute(query, self.embeddings.embed_query_with_sparse)
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """여러 쿼리 임베딩 (캐시 미스만 한 번의 배치로 인코딩, (n, dim) float32 행렬)"""
+        if self.query_cache is None:
+            return self.embeddings.embed_queries_array(queries)
+        return np.stack(self.query_cache.get_or_compute_many(
+            queries,
+            lambda texts: list(self.embeddings.embed_queries_array(texts))
+        ))
+
+    def _embed_queries_with_sparse(self, queries: List[str]) -> list:
+        """여러 쿼리의 (dense 벡터, sparse 가중치) 리스트 (캐시 미스만 한 번의 배치로 인코딩)"""
+        def compute(texts: List[str]) -> list:
+            dense, sparse = self.embeddings.embed_queries_with_sparse(texts)
+            return list(zip(dense, sparse))
+
+        if self.query_cache is None:
+            return compute(queries)
+        return self.query_cache.get_or_compute_many(queries, compute)
+
+    def _sync_collection_version(self) -> None:
+        """별칭이 새 버전 컬렉션으로 전환되었으면 벡터 스토어와 sparse 역색인을 교체"""
+        refresh = getattr(self.vector_store, "refresh", None)
+        if refresh is not None:
+            refresh()
+
+        collection_name = getattr(self.vector_store, "collection_name", None)
+        if self.use_sparse and collection_name != self._sparse_collection:
+            self.sparse_index = SparseLexicalIndex.for_vector_store(self.vector_store)
+            self._sparse_collection = collection_name
+            print(f"[OK] sparse 역색인 다시 로드: {collection_name} ({len(self.sparse_index)}개 문서)")
+        if self.bm25_index is not None and collection_name != self._bm25_collection:
+            with self._bm25_lock:
+                self.bm25_index = BM25Index.load_or_build(self.vector_store)
+                self._bm25_collection = collection_name
+                self._bm25_generation = getattr(self.vector_store, "generation", None)
+                self._bm25_filter_ids.clear()
+
+    def _sync_bm25(self) -> None:
+        """
+        벡터 스토어 세대가 바뀌었으면 BM25 인덱스 동기화를 백그라운드 스레드로 시작
+
+        벡터 스토어의 쓰기 경로(add/delete, 다른 프로세스의 index_documents.py 실행)가
+        바꾸는 세대 값을 기준으로 합니다. 검색은 동기화를 기다리지 않고 현재 인덱스를
+        사용하며, 동기화가 끝나면 반영됩니다.
+        """
+        generation = getattr(self.vector_store, "generation", None)
+        if generation == self._bm25_generation or self._bm25_syncing:
+            return
+        with self._bm25_lock:
+            if generation == self._bm25_generation or self._bm25_syncing:
+                return
+            self._bm25_syncing = True
+        threading.Thread(
+            target=self._run_bm25_sync,
+            args=(self.bm25_index, generation),
+            name="bm25-sync",
+            daemon=True
+        ).start()
+
+    def _run_bm25_sync(self, bm25_index: BM25Index, generation: Any) -> None:
+        """BM25 인덱스를 저장된 청크와 차이만큼 맞추고 변경이 있으면 .bm25.npz 저장"""
+        try:
+            changes = bm25_index.sync(self.vector_store)
+            if (changes["added"] or changes["removed"]) and bm25_index.index_path:
+                bm25_index.save()
+            with self._bm25_lock:
+                # 동기화 중 별칭 전환으로 인덱스가 교체되었으면 세대를 덮어쓰지 않음
+                if bm25_index is self.bm25_index:
+                    self._bm25_generation = generation
+                    self._bm25_filter_ids.clear()
+            print(f"[OK] BM25 인덱스 동기화: 추가 {changes['added']}개, 삭제 {changes['removed']}개")
+        except Exception as e:
+            print(f"[WARN] BM25 인덱스 동기화 실패: {e}")
+        finally:
+            with self._bm25_lock:
+                self._bm25_syncing = False
+
+    def _bm25_allowed_ids(self, filter_metadata: Dict[str, Any]) -> frozenset:
+        """메타데이터 필터를 통과하는 문서 ID 집합 (같은 세대 동안 필터별로 재사용)"""
+        key = json.dumps(filter_metadata, sort_keys=True, ensure_ascii=False, default=str)
+        generation = self._bm25_generation
+        with self._bm25_lock:
+            cached = self._bm25_filter_ids.get(key)
+            if cached is not None and cached[0] == generation:
+                self._bm25_filter_ids.move_to_end(key)
+                return cached[1]
+
+        allowed = frozenset(self.vector_store.filter_ids(filter_metadata))
+        with self._bm25_lock:
+            self._bm25_filter_ids[key] = (generation, allowed)
+            self._bm25_filter_ids.move_to_end(key)
+            while len(self._bm25_filter_ids) > 64:
+                self._bm25_filter_ids.popitem(last=False)
+        return allowed
+
+    def warm_up(self) -> None:
+        """
+        더미 임베딩과 벡터 검색을 한 번 실행하여 지연 초기화(커널, 인덱스 로드)를 미리 수행
+
+        쿼리 캐시를 거치지 않으므로 캐시 통계에 영향을 주지 않습니다.
+        """
+        if self.use_sparse:
+            query_embedding, _ = self.embeddings.embed_query_with_sparse("워밍업")
+        else:
+            query_embedding = self.embeddings.embed_query_array("워밍업")
+        self.vector_store.search(query_embedding=query_embedding, top_k=1)
+        if self.bm25_index is not None:
+            self.bm25_index.search("워밍업", top_k=1)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """쿼리 임베딩 캐시 통계 반환"""
+        if self.query_cache is None:
+            return {}
+        return self.query_cache.stats()
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """asearch 실행기 통계 반환 (queue_depth: 워커 대기 중인 작업 수)"""
+        with self._metrics_lock:
+            return {
+                "workers": self.search_workers,
+                "in_flight": self._in_flight,
+                "running": self._running,
+                "queue_depth": self._in_flight - self._running,
+                "peak_queue_depth": self._peak_queue_depth,
+                "max_pending": self.max_pending_searches
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """검색기 전체 통계 반환"""
+        stats = {
+            "query_cache": self.get_cache_stats(),
+            "executor": self.get_executor_stats()
+        }
+        if isinstance(self.embeddings, BatchingEmbedder):
+            stats["query_batching"] = self.embeddings.stats()
+        if hasattr(self.embeddings, "get_length_stats"):
+            stats["sequence_lengths"] = self.embeddings.get_length_stats()
+        if hasattr(self.vector_store, "get_partition_stats"):
+            stats["partitions"] = self.vector_store.get_partition_stats()
+        if hasattr(self.vector_store, "get_result_cache_stats"):
+            stats["result_cache"] = self.vector_store.get_result_cache_stats()
+        if self.bm25_index is not None:
+            stats["bm25"] = self.bm25_index.stats()
+        return stats
+
     def search(
         self,
         query: str,
         top_k: Optional[int] = None,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        partitions: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         쿼리에 대한 관련 문서 검색
@@ -59,6 +306,8 @@ class Retriever:
             query: 검색 쿼리
             top_k: 반환할 문서 개수 (None이면 기본값 사용)
             filter_metadata: 메타데이터 필터
+            partitions: 검색할 메타데이터 파티션 (예: {"file_type": "pdf"},
+                {"source": ["a.pdf", "b.pdf"]}), 해당 파티션의 벡터만 검색
 
         Returns:
             검색 결과 리스트 [
@@ -76,19 +325,110 @@ class Retriever:
 
         # top_k 설정
         k = top_k if top_k is not None else self.top_k
+        filter_metadata = partition_filter(partitions, filter_metadata)
+        self._sync_collection_version()
+
+        # BM25 융합 시 dense 쪽도 후보를 넉넉히 가져옴
+        dense_k = max(k, self.bm25_candidates) if self.bm25_index is not None else k
 
         # 쿼리 임베딩
         print(f"[SEARCH] 검색 쿼리: {query}")
-        query_embedding = self.embeddings.embed_query(query)
+        if self.use_sparse:
+            query_embedding, query_sparse = self._embed_query_with_sparse(query)
+            formatted_results = self._search_with_sparse(
+                query_embedding, query_sparse, dense_k, filter_metadata
+            )
+            mode = "dense + sparse"
+        else:
+            query_embedding = self._embed_query(query)
 
-        # 벡터 검색
-        results = self.vector_store.search(
-            query_embedding=query_embedding,
-            top_k=k,
-            filter_metadata=filter_metadata
-        )
+            # 벡터 검색
+            results = self.vector_store.search(
+                query_embedding=query_embedding,
+                top_k=dense_k,
+                filter_metadata=filter_metadata
+            )
+            formatted_results = self._format_dense_results(results)
+            mode = "dense"
+
+        if self.bm25_index is not None:
+            formatted_results = self._fuse_with_bm25(
+                query, query_embedding, formatted_results, k, filter_metadata
+            )
+            mode += " + BM25"
+        print(f"[OK] {len(formatted_results)}개 문서 검색 완료 ({mode})")
+        return formatted_results
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        partitions: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리 일괄 검색
 
-        # 결과 포맷팅 및 필터링
+        캐시에 없는 쿼리는 한 번의 인코더 배치로 임베딩하고,
+        벡터 검색도 vector_store.search_many 한 번으로 수행합니다.
+        (평가 실행, multi-query 검색, 일괄 답변용)
+
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 쿼리별 반환할 문서 개수 (None이면 기본값 사용)
+            filter_metadata: 모든 쿼리에 적용할 메타데이터 필터
+            partitions: 모든 쿼리에 적용할 메타데이터 파티션 (search() 참고)
+
+        Returns:
+            쿼리 순서대로 search()와 같은 형식의 검색 결과 리스트
+        """
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("검색 쿼리가 비어있습니다.")
+        if not queries:
+            return []
+
+        k = top_k if top_k is not None else self.top_k
+        filter_metadata = partition_filter(partitions, filter_metadata)
+        self._sync_collection_version()
+        print(f"[SEARCH] 일괄 검색 쿼리 {len(queries)}개")
+
+        dense_k = max(k, self.bm25_candidates) if self.bm25_index is not None else k
+
+        if self.use_sparse:
+            embedded = self._embed_queries_with_sparse(queries)
+            query_matrix = np.stack([dense for dense, _ in embedded])
+            dense_results = self.vector_store.search_many(
+                query_matrix,
+                top_k=max(dense_k, self.sparse_candidates),
+                filter_metadata=filter_metadata
+            )
+            all_results = [
+                self._search_with_sparse(dense, sparse, dense_k, filter_metadata, dense_results=results)
+                for (dense, sparse), results in zip(embedded, dense_results)
+            ]
+        else:
+            query_matrix = self._embed_queries(queries)
+            all_results = [
+                self._format_dense_results(results)
+                for results in self.vector_store.search_many(
+                    query_matrix,
+                    top_k=dense_k,
+                    filter_metadata=filter_metadata
+                )
+            ]
+
+        if self.bm25_index is not None:
+            all_results = [
+                self._fuse_with_bm25(query, query_embedding, results, k, filter_metadata)
+                for query, query_embedding, results in zip(queries, query_matrix, all_results)
+            ]
+
+        print(f"[OK] {len(queries)}개 쿼리 일괄 검색 완료 "
+              f"(평균 {sum(map(len, all_results)) / len(queries):.1f}개 문서)")
+        return all_results
+
+    def _format_dense_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """벡터 스토어 검색 결과를 검색 결과 리스트로 변환 (임계값 필터링 포함)"""
         formatted_results = []
         for i, (doc, metadata, distance, doc_id) in enumerate(zip(
             results["documents"],
@@ -112,9 +452,227 @@ class Retriever:
                     "rank": i + 1
                 })
 
-        print(f"[OK] {len(formatted_results)}개 문서 검색 완료")
         return formatted_results
 
+    def _search_with_sparse(
+        self,
+        query_embedding: np.ndarray,
+        query_sparse: Dict[int, float],
+        k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+        dense_results: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        dense 후보와 sparse 어휘 매칭 후보를 합쳐 재순위화
+
+        순위 점수: (1 - cosine distance) + sparse_weight × 어휘 매칭 점수
+        dense 임계값을 넘는 문서도 어휘 매칭 점수가 충분히 높으면 통과시켜
+        지명·숫자처럼 정확한 토큰 일치가 중요한 문서를 놓치지 않습니다.
+        """
+        candidate_k = max(k, self.sparse_candidates)
+
+        # search_many에서 일괄 조회한 dense 후보가 있으면 재사용
+        results = dense_results
+        if results is None:
+            results = self.vector_store.search(
+                query_embedding=query_embedding,
+                top_k=candidate_k,
+                filter_metadata=filter_metadata
+            )
+        candidates = {
+            doc_id: {"content": doc, "metadata": metadata, "distance": distance}
+            for doc, metadata, distance, doc_id in zip(
+                results["documents"],
+                results["metadatas"],
+                results["distances"],
+                results["ids"]
+            )
+        }
+
+        # dense 후보에 없는 어휘 매칭 후보는 임베딩을 조회하여 dense 거리 계산
+        lexical_scores = dict(self.sparse_index.search(query_sparse, top_k=candidate_k))
+        missing_ids = [doc_id for doc_id in lexical_scores if doc_id not in candidates]
+        if missing_ids:
+            fetched = self.vector_store.get_documents(
+                missing_ids,
+                filter_metadata=filter_metadata,
+                include_embeddings=True
+            )
+            prepared_query = self.vector_store.prepare_query_embedding(query_embedding)
+            for doc_id, doc, metadata, embedding in zip(
+                fetched["ids"],
+                fetched["documents"],
+                fetched["metadatas"],
+                fetched["embeddings"]
+            ):
+                candidates[doc_id] = {
+                    "content": doc,
+                    "metadata": metadata,
+                    "distance": float(1 - np.dot(prepared_query, embedding))
+                }
+
+        for doc_id, candidate in candidates.items():
+            if doc_id in lexical_scores:
+                candidate["lexical_score"] = lexical_scores[doc_id]
+            else:
+                candidate["lexical_score"] = self.sparse_index.score(query_sparse, doc_id)
+
+        ranked = sorted(
+            candidates.items(),
+            key=lambda item: (1 - item[1]["distance"]) + self.sparse_weight * item[1]["lexical_score"],
+            reverse=True
+        )[:k]
+
+        formatted_results = []
+        for i, (doc_id, candidate) in enumerate(ranked):
+            distance = candidate["distance"]
+            passed = (
+                self.score_threshold <= 0
+                or distance <= self.score_threshold
+                or candidate["lexical_score"] >= self.sparse_score_threshold
+            )
+            if passed:
+                formatted_results.append({
+                    "content": candidate["content"],
+                    "metadata": candidate["metadata"],
+                    "score": round(1 - (distance / 2), 4),
+                    "distance": round(distance, 4),
+                    "lexical_score": round(candidate["lexical_score"], 4),
+                    "id": doc_id,
+                    "rank": i + 1
+                })
+
+        return formatted_results
+
+    def _fuse_with_bm25(
+        self,
+        query: str,
+        query_embedding: np.ndarray,
+        dense_ranked: List[Dict[str, Any]],
+        k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        dense 검색 결과와 BM25 결과를 reciprocal rank fusion으로 결합
+
+        융합 점수: Σ 1 / (rrf_k + 순위) (각 결과 목록에서의 순위, 없는 목록은 0)
+        점수 척도가 다른 두 검색기를 순위만으로 합치므로 가중치 조정이 필요 없습니다.
+        dense 임계값을 넘는 문서도 BM25 후보이면(bm25_max_distance 이내) 포함하여
+        지명·업종명·통계 수치처럼 정확한 표현이 일치하는 청크를 놓치지 않습니다.
+        BM25 후보는 filter_metadata를 통과한 문서 중에서만 고릅니다.
+        """
+        self._sync_bm25()
+        candidates = {result["id"]: dict(result) for result in dense_ranked}
+        # 필터가 있으면 필터를 통과한 문서끼리만 BM25 순위를 매김
+        allowed_ids = self._bm25_allowed_ids(filter_metadata) if filter_metadata else None
+        lexical = self.bm25_index.search(query, top_k=self.bm25_candidates, allowed_ids=allowed_ids)
+
+        # dense 후보에 없는 BM25 후보는 임베딩 조회하여 dense 거리 계산
+        # (dense 유사도가 너무 낮은 후보는 bm25_max_distance로 제외)
+        max_distance = max(self.score_threshold, self.bm25_max_distance)
+        missing_ids = [doc_id for doc_id, _ in lexical if doc_id not in candidates]
+        if missing_ids:
+            fetched = self.vector_store.get_documents(
+                missing_ids,
+                filter_metadata=filter_metadata,
+                include_embeddings=True
+            )
+            prepared_query = self.vector_store.prepare_query_embedding(query_embedding)
+            for doc_id, doc, metadata, embedding in zip(
+                fetched["ids"],
+                fetched["documents"],
+                fetched["metadatas"],
+                fetched["embeddings"]
+            ):
+                distance = float(1 - np.dot(prepared_query, embedding))
+                if self.score_threshold > 0 and distance > max_distance:
+                    continue
+                candidates[doc_id] = {
+                    "content": doc,
+                    "metadata": metadata,
+                    "score": round(1 - (distance / 2), 4),
+                    "distance": round(distance, 4),
+                    "id": doc_id
+                }
+
+        # 거리 하한선에서 제외된 BM25 후보는 순위에서도 제외
+        lexical = [(doc_id, score) for doc_id, score in lexical if doc_id in candidates]
+        fused: Dict[str, float] = {}
+        for rank, result in enumerate(dense_ranked, 1):
+            fused[result["id"]] = 1 / (self.rrf_k + rank)
+        for rank, (doc_id, _) in enumerate(lexical, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1 / (self.rrf_k + rank)
+
+        bm25_scores = dict(lexical)
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+        formatted_results = []
+        for i, (doc_id, rrf_score) in enumerate(ranked):
+            result = candidates[doc_id]
+            result["bm25_score"] = round(bm25_scores.get(doc_id, 0.0), 4)
+            result["rrf_score"] = round(rrf_score, 6)
+            result["rank"] = i + 1
+            formatted_results.append(result)
+
+        return formatted_results
+
+    async def asearch(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        partitions: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        search()의 비동기 버전
+
+        임베딩과 벡터 검색은 CPU 바운드 동기 작업이므로 전용 스레드 풀에서 실행하여
+        이벤트 루프(다른 SSE 스트림)를 막지 않습니다.
+
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 문서 개수 (None이면 기본값 사용)
+            filter_metadata: 메타데이터 필터
+            partitions: 검색할 메타데이터 파티션 (search() 참고)
+
+        Returns:
+            search()와 동일한 검색 결과 리스트
+        """
+        loop = asyncio.get_running_loop()
+        filter_metadata = partition_filter(partitions, filter_metadata)
+
+        with self._metrics_lock:
+            self._in_flight += 1
+            queue_depth = self._in_flight - self._running
+            self._peak_queue_depth = max(self._peak_queue_depth, queue_depth)
+
+        try:
+            async with self._search_slots:
+                return await loop.run_in_executor(
+                    self._executor,
+                    self._run_search_job,
+                    query,
+                    top_k,
+                    filter_metadata
+                )
+        finally:
+            with self._metrics_lock:
+                self._in_flight -= 1
+
+    def _run_search_job(
+        self,
+        query: str,
+        top_k: Optional[int],
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """워커 스레드에서 실행되는 검색 작업"""
+        with self._metrics_lock:
+            self._running += 1
+        try:
+            return self.search(query, top_k=top_k, filter_metadata=filter_metadata)
+        finally:
+            with self._metrics_lock:
+                self._running -= 1
+
     def get_relevant_documents(self, query: str) -> List[Document]:
         """
         LangChain 호환 인터페이스
@@ -0,0 +1,156 @@
+"""
+검색 결과 캐시 모듈
+
+인기 질문처럼 같은 쿼리 벡터·top_k·필터로 반복되는 벡터 검색 결과를 메모리에 보관합니다.
+키는 양자화한 쿼리 벡터와 검색 파라미터의 해시이며, 항목은 저장 당시의 세대(generation)
+번호를 가집니다. 문서 추가/삭제 시 세대를 올리면 이전 세대 항목은 조회 시 자동으로 폐기됩니다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+def copy_search_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    검색 결과 복사본 (결과 리스트와 메타데이터 딕셔너리까지 복사)
+
+    메타데이터 값은 스칼라만 허용되므로 이 깊이까지 복사하면 호출자가 결과를
+    수정해도 캐시 항목에는 영향이 없습니다. (copy.deepcopy보다 빠름)
+    """
+    return {
+        key: [dict(item) if isinstance(item, dict) else item for item in value]
+        if isinstance(value, list) else value
+        for key, value in result.items()
+    }
+
+
+class SearchResultCache:
+    """세대 번호로 무효화되는 벡터 검색 결과 LRU 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        quantization_step: float = 1e-4
+    ):
+        """
+        Args:
+            max_entries: 최대 캐시 항목 수
+            ttl_seconds: 항목 유효 시간 (초, None이면 만료 없음)
+            quantization_step: 키 계산 시 쿼리 벡터 양자화 간격
+                (부동소수점 오차 수준의 차이는 같은 키로 취급)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.quantization_step = quantization_step
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # 세대가 바뀌거나 만료되어 폐기된 항목 수
+
+        # {키: (결과, 세대, 생성 시각)}
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        namespace: str = ""
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            query_embedding: 저장 모드로 변환된 쿼리 벡터
+            top_k: 반환 문서 수
+            filter_metadata: 메타데이터 필터
+            namespace: 컬렉션 이름 등 구분자
+        """
+        quantized = np.rint(
+            np.asarray(query_embedding, dtype=np.float32) / self.quantization_step
+        ).astype(np.int32)
+        digest = hashlib.sha1(quantized.tobytes())
+        digest.update(
+            json.dumps([namespace, top_k, filter_metadata], sort_keys=True, ensure_ascii=False, default=str)
+            .encode("utf-8")
+        )
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        캐시 조회 (현재 세대가 아니거나 만료된 항목은 폐기)
+
+        Returns:
+            (적중 여부, 결과)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, entry_generation, created_at = entry
+                expired = self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+                if entry_generation == self.generation and not expired:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, result
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, result: Any, generation: int) -> None:
+        """
+        검색 결과 저장
+
+        검색 도중 세대가 바뀌었으면(문서 추가/삭제) 오래된 결과이므로 저장하지 않습니다.
+
+        Args:
+            key: make_key()로 만든 키
+            result: 검색 결과
+            generation: 검색 시작 전에 읽은 generation 값
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (result, generation, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> int:
+        """세대 번호를 올려 기존 항목 전체 무효화 (메모리도 즉시 해제)"""
+        with self._lock:
+            self.generation += 1
+            self.stale += len(self._entries)
+            self._entries.clear()
+            return self.generation
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self.generation,
+                "stale": self.stale
+            }
+
+    def clear(self) -> None:
+        """캐시 전체 삭제 (세대 번호 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
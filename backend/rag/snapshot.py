@@ -0,0 +1,228 @@
+"""
+임베딩 스냅샷 내보내기/열기 모듈
+
+컬렉션을 페이지 단위로 읽어 아래 형식의 디렉토리로 저장합니다.
+분석 작업이나 다른 검색 백엔드는 역직렬화 없이 memory-map으로 즉시 열 수 있습니다.
+
+    manifest.json                  문서 수, 차원, 저장 모드 등
+    embeddings.npy                 (n, dim) float32 행렬 (np.load(mmap_mode="r"))
+    {ids,documents,metadatas}.bin  열(column)별 UTF-8 바이트를 이어 붙인 파일 (메타데이터는 행별 JSON)
+    {ids,documents,metadatas}.offsets.npy  행별 시작 위치 (int64, n+1개)
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .vector_store import ChromaVectorStore
+
+
+FORMAT_VERSION = 1
+COLUMNS = ("ids", "documents", "metadatas")
+
+
+class _ColumnWriter:
+    """가변 길이 UTF-8 값을 이어 쓰고 오프셋을 기록하는 열 파일 작성기"""
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+        self._file = open(os.path.join(directory, f"{name}.bin"), "wb")
+        self._offsets = [0]
+
+    def write(self, values: List[str]) -> None:
+        for value in values:
+            data = value.encode("utf-8")
+            self._file.write(data)
+            self._offsets.append(self._offsets[-1] + len(data))
+
+    def close(self) -> None:
+        self._file.close()
+        np.save(
+            os.path.join(self.directory, f"{self.name}.offsets.npy"),
+            np.asarray(self._offsets, dtype=np.int64)
+        )
+
+
+def export_snapshot(
+    vector_store: ChromaVectorStore,
+    snapshot_dir: str,
+    page_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    컬렉션 전체를 스냅샷 디렉토리로 내보내기 (메모리에는 한 페이지만 유지)
+
+    임시 디렉토리에 쓴 뒤 완료되면 snapshot_dir로 교체하므로,
+    중간에 실패해도 기존 스냅샷은 그대로 남습니다.
+
+    Args:
+        vector_store: 내보낼 ChromaVectorStore
+        snapshot_dir: 스냅샷 디렉토리 경로
+        page_size: 한 번에 읽을 문서 수
+
+    Returns:
+        manifest 딕셔너리
+    """
+    count = vector_store.get_document_count()
+    tmp_dir = snapshot_dir.rstrip("/\\") + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    start = time.perf_counter()
+    writers = {name: _ColumnWriter(tmp_dir, name) for name in COLUMNS}
+    embeddings = None
+    written = 0
+
+    try:
+        for page in vector_store.iter_documents(page_size=page_size):
+            page_embeddings = page["embeddings"]
+            rows = len(page["ids"])
+            if written + rows > count:
+                raise RuntimeError("내보내는 중 컬렉션에 문서가 추가되었습니다. 다시 실행해주세요.")
+
+            if embeddings is None:
+                embeddings = np.lib.format.open_memmap(
+                    os.path.join(tmp_dir, "embeddings.npy"),
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(count, page_embeddings.shape[1])
+                )
+            embeddings[written:written + rows] = page_embeddings
+
+            writers["ids"].write(page["ids"])
+            writers["documents"].write([doc or "" for doc in page["documents"]])
+            writers["metadatas"].write([
+                json.dumps(metadata or {}, ensure_ascii=False) for metadata in page["metadatas"]
+            ])
+            written += rows
+            print(f"[SNAPSHOT] {written}/{count} 문서 내보내기 완료")
+    finally:
+        for writer in writers.values():
+            writer.close()
+        if embeddings is not None:
+            embeddings.flush()
+            del embeddings
+
+    if written != count:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise RuntimeError(
+            f"내보낸 문서 수({written})가 컬렉션 문서 수({count})와 다릅니다. "
+            "내보내는 중 컬렉션이 변경되었습니다."
+        )
+
+    if count == 0:
+        np.save(os.path.join(tmp_dir, "embeddings.npy"), np.empty((0, 0), dtype=np.float32))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "collection_name": vector_store.collection_name,
+        "count": count,
+        "dim": int(np.load(os.path.join(tmp_dir, "embeddings.npy"), mmap_mode="r").shape[1]),
+        "embedding_dim": vector_store.embedding_dim,
+        "embedding_precision": vector_store.embedding_precision,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # 완료된 스냅샷으로 교체
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    os.replace(tmp_dir, snapshot_dir)
+
+    print(f"[OK] 스냅샷 저장 완료: {snapshot_dir} ({count}개 문서, "
+          f"{time.perf_counter() - start:.1f}s)")
+    return manifest
+
+
+class _Column:
+    """memory-map된 가변 길이 UTF-8 열"""
+
+    def __init__(self, directory: str, name: str):
+        self.offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode="r")
+        path = os.path.join(directory, f"{name}.bin")
+        # 빈 파일은 memmap할 수 없으므로 빈 배열로 대체
+        if os.path.getsize(path) > 0:
+            self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            self.data = np.empty(0, dtype=np.uint8)
+
+    def __getitem__(self, index: int) -> str:
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return self.data[start:end].tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class EmbeddingSnapshot:
+    """스냅샷 디렉토리를 memory-map으로 여는 읽기 전용 뷰"""
+
+    def __init__(self, snapshot_dir: str):
+        """
+        Args:
+            snapshot_dir: export_snapshot()으로 만든 디렉토리
+        """
+        self.snapshot_dir = snapshot_dir
+        with open(os.path.join(snapshot_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest: Dict[str, Any] = json.load(f)
+
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식: {self.manifest.get('format_version')}")
+
+        # (n, dim) float32, 필요한 페이지만 디스크에서 읽힘
+        self.embeddings: np.ndarray = np.load(
+            os.path.join(snapshot_dir, "embeddings.npy"),
+            mmap_mode="r"
+        )
+        self._columns = {name: _Column(snapshot_dir, name) for name in COLUMNS}
+        self._id_index: Optional[Dict[str, int]] = None
+
+    def id(self, index: int) -> str:
+        return self._columns["ids"][index]
+
+    def document(self, index: int) -> str:
+        return self._columns["documents"][index]
+
+    def metadata(self, index: int) -> Dict[str, Any]:
+        return json.loads(self._columns["metadatas"][index])
+
+    def index_of(self, doc_id: str) -> int:
+        """문서 ID의 행 번호 (처음 호출 시 ID 색인 생성)"""
+        if self._id_index is None:
+            self._id_index = {self.id(i): i for i in range(len(self))}
+        return self._id_index[doc_id]
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """행 단위 순회 ({"id", "document", "metadata", "embedding"})"""
+        for i in range(len(self)):
+            yield {
+                "id": self.id(i),
+                "document": self.document(i),
+                "metadata": self.metadata(i),
+                "embedding": self.embeddings[i]
+            }
+
+    def __len__(self) -> int:
+        return int(self.manifest["count"])
+
+
+if __name__ == "__main__":
+    import argparse
+    from pathlib import Path
+
+    default_dir = Path(__file__).parent.parent / "data" / "snapshots" / "commercial_analysis_docs"
+
+    parser = argparse.ArgumentParser(description="컬렉션 임베딩 스냅샷 내보내기")
+    parser.add_argument("--collection", default="commercial_analysis_docs", help="컬렉션 이름")
+    parser.add_argument("--out", default=str(default_dir), help="스냅샷 디렉토리")
+    parser.add_argument("--page-size", type=int, default=1000, help="한 번에 읽을 문서 수")
+    args = parser.parse_args()
+
+    store = ChromaVectorStore(collection_name=args.collection)
+    export_snapshot(store, args.out, page_size=args.page_size)
+    snapshot = EmbeddingSnapshot(args.out)
+    print(f"   - 문서 수: {len(snapshot)}, 임베딩: {snapshot.embeddings.shape} float32 (memory-mapped)")
@@ -0,0 +1,165 @@
+"""
+BGE-M3 sparse 어휘 가중치 역색인 모듈
+
+문서별 {토큰 ID: 가중치}를 토큰 → (문서, 가중치) 포스팅 리스트로 저장합니다.
+Chroma 컬렉션 옆에 .npz 파일(CSR 형식 배열)로 저장되며,
+쿼리 점수는 BGE-M3 lexical matching 방식(공통 토큰 가중치 곱의 합)을 따릅니다.
+"""
+
+import heapq
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SparseLexicalIndex:
+    """sparse 어휘 가중치 역색인"""
+
+    def __init__(self, index_path: str):
+        """
+        Args:
+            index_path: 인덱스 파일 경로 (.npz, 있으면 로드)
+        """
+        self.index_path = index_path
+
+        # {토큰 ID: {문서 ID: 가중치}}
+        self._postings: Dict[int, Dict[str, float]] = defaultdict(dict)
+        # {문서 ID: 해당 문서의 토큰 ID 목록} (삭제용)
+        self._doc_tokens: Dict[str, List[int]] = {}
+
+        if os.path.exists(index_path):
+            self.load()
+
+    @classmethod
+    def for_vector_store(cls, vector_store) -> "SparseLexicalIndex":
+        """벡터 스토어 컬렉션 옆 경로의 인덱스 열기"""
+        path = os.path.join(
+            vector_store.persist_directory,
+            f"{vector_store.collection_name}.sparse.npz"
+        )
+        return cls(path)
+
+    def add(self, ids: List[str], sparse_weights: List[Dict[int, float]]) -> None:
+        """
+        문서 sparse 가중치 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            ids: 문서 ID 리스트
+            sparse_weights: 문서별 {토큰 ID: 가중치}
+        """
+        if len(ids) != len(sparse_weights):
+            raise ValueError("ID와 sparse 가중치의 개수가 일치하지 않습니다.")
+
+        self.remove([doc_id for doc_id in ids if doc_id in self._doc_tokens])
+        for doc_id, weights in zip(ids, sparse_weights):
+            for token_id, weight in weights.items():
+                self._postings[int(token_id)][doc_id] = float(weight)
+            self._doc_tokens[doc_id] = [int(token_id) for token_id in weights]
+
+    def remove(self, ids: List[str]) -> None:
+        """문서 삭제"""
+        for doc_id in ids:
+            for token_id in self._doc_tokens.pop(doc_id, []):
+                postings = self._postings.get(token_id)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[token_id]
+
+    def clear(self) -> None:
+        """인덱스 전체 삭제"""
+        self._postings.clear()
+        self._doc_tokens.clear()
+
+    def search(
+        self,
+        query_weights: Dict[int, float],
+        top_k: int = 10,
+        candidate_ids: Optional[set] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        어휘 매칭 점수 기준 상위 문서 검색
+
+        Args:
+            query_weights: 쿼리 {토큰 ID: 가중치}
+            top_k: 반환할 문서 개수
+            candidate_ids: 점수를 계산할 문서 ID 집합 (None이면 전체)
+
+        Returns:
+            [(문서 ID, 점수), ...] 점수 내림차순
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        for token_id, query_weight in query_weights.items():
+            for doc_id, doc_weight in self._postings.get(int(token_id), {}).items():
+                if candidate_ids is None or doc_id in candidate_ids:
+                    scores[doc_id] += query_weight * doc_weight
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def score(self, query_weights: Dict[int, float], doc_id: str) -> float:
+        """단일 문서의 어휘 매칭 점수"""
+        total = 0.0
+        for token_id, query_weight in query_weights.items():
+            doc_weight = self._postings.get(int(token_id), {}).get(doc_id)
+            if doc_weight is not None:
+                total += query_weight * doc_weight
+        return total
+
+    def save(self) -> None:
+        """CSR 형식(.npz)으로 저장: 토큰별 포스팅을 연속 배열로 직렬화"""
+        doc_ids = sorted(self._doc_tokens)
+        doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+
+        token_ids = sorted(self._postings)
+        offsets = np.zeros(len(token_ids) + 1, dtype=np.int64)
+        postings_docs = []
+        postings_weights = []
+        for i, token_id in enumerate(token_ids):
+            postings = self._postings[token_id]
+            postings_docs.extend(doc_index[doc_id] for doc_id in postings)
+            postings_weights.extend(postings.values())
+            offsets[i + 1] = offsets[i] + len(postings)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        tmp_path = self.index_path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            doc_ids=np.array(doc_ids, dtype=np.str_),
+            token_ids=np.array(token_ids, dtype=np.int32),
+            offsets=offsets,
+            postings_docs=np.array(postings_docs, dtype=np.int32),
+            postings_weights=np.array(postings_weights, dtype=np.float16)
+        )
+        os.replace(tmp_path, self.index_path)
+        print(f"[OK] sparse 역색인 저장 완료 ({len(doc_ids)}개 문서, {len(token_ids)}개 토큰)")
+
+    def load(self) -> None:
+        """.npz 파일에서 인덱스 로드"""
+        data = np.load(self.index_path)
+        doc_ids = data["doc_ids"].tolist()
+        token_ids = data["token_ids"]
+        offsets = data["offsets"]
+        postings_docs = data["postings_docs"]
+        postings_weights = data["postings_weights"].astype(np.float32)
+
+        self.clear()
+        doc_tokens: Dict[str, List[int]] = defaultdict(list)
+        for i, token_id in enumerate(token_ids.tolist()):
+            start, end = offsets[i], offsets[i + 1]
+            postings = {
+                doc_ids[doc]: float(weight)
+                for doc, weight in zip(postings_docs[start:end], postings_weights[start:end])
+            }
+            self._postings[token_id] = postings
+            for doc_id in postings:
+                doc_tokens[doc_id].append(token_id)
+
+        self._doc_tokens = {doc_id: doc_tokens.get(doc_id, []) for doc_id in doc_ids}
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_tokens
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
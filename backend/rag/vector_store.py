@@ -6,10 +6,117 @@ ChromaDB를 사용하여 임베딩 벡터를 저장하고 검색합니다.
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Optional, Any
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Any
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
+from .collection_alias import CollectionAliasRegistry, parse_version, versioned_name, VERSION_SEPARATOR
+from .bm25_index import BM25Index
+from .metadata_partitions import MetadataPartitionIndex, PARTITION_KEYS, partition_clauses
+from .search_cache import SearchResultCache, copy_search_result
+from .vector_store_protocol import EmbeddingInput, EmbeddingsInput
+
+
+def as_float32_rows(embeddings: EmbeddingsInput) -> List[np.ndarray]:
+    """
+    임베딩 행렬을 Chroma에 전달할 float32 행 뷰 리스트로 변환
+
+    ndarray 입력은 복사 없이 각 행의 뷰를 반환하고,
+    리스트 입력은 한 번만 float32 행렬로 변환합니다.
+    """
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f"임베딩은 2차원이어야 합니다. (shape: {matrix.shape})")
+    return list(matrix)
+
+
+SUPPORTED_PRECISIONS = ("float32", "float16")
+
+# HNSW 인덱스 파라미터 → 컬렉션 메타데이터 키 (값이 없으면 Chroma 기본값 사용)
+HNSW_METADATA_KEYS = {
+    "M": "hnsw:M",
+    "construction_ef": "hnsw:construction_ef",
+    "search_ef": "hnsw:search_ef"
+}
+HNSW_DEFAULTS = {"M": 16, "construction_ef": 100, "search_ef": 10}
+
+
+def source_key(metadata: Dict[str, Any]) -> str:
+    """청크가 속한 원본 파일 식별자 (문서 폴더 기준 상대 경로, 없으면 파일명)"""
+    return str(metadata.get("relative_path") or metadata.get("source") or "unknown")
+
+
+def make_chunk_id(text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    결정적 청크 ID 생성
+
+    원본 경로, 페이지, 청크 번호, 내용 해시로 구성되므로 같은 청크는 항상 같은 ID를 갖고,
+    내용이 바뀌면 ID도 바뀝니다. (삭제/재추가 시 충돌 없음)
+
+    예: chunk_3f2a9c1b7d04_p12_c3_9e107d9d372bb682
+    """
+    metadata = metadata or {}
+    path_hash = hashlib.sha1(source_key(metadata).encode("utf-8")).hexdigest()[:12]
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    page = metadata.get("page", 0)
+    chunk_index = metadata.get("chunk_index", 0)
+    return f"chunk_{path_hash}_p{page}_c{chunk_index}_{content_hash}"
+
+
+def reduce_embeddings(
+    embeddings: EmbeddingsInput,
+    dim: Optional[int] = None,
+    precision: str = "float32"
+) -> np.ndarray:
+    """
+    저장 모드에 맞게 임베딩 축소
+
+    Args:
+        embeddings: (n, 원본 dim) 임베딩 행렬
+        dim: 앞에서부터 남길 차원 수 (None이면 원본 유지, 절단 후 재정규화)
+        precision: 'float32' 또는 'float16' (float16이면 float16 행렬 반환)
+
+    Returns:
+        (n, dim) 행렬 (precision 자료형)
+    """
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(f"지원하지 않는 정밀도: {precision} (지원: {SUPPORTED_PRECISIONS})")
+
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if dim is not None and dim < matrix.shape[-1]:
+        matrix = matrix[..., :dim]
+        # 절단 후 코사인 거리 계산을 위해 다시 정규화
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        matrix = matrix / np.maximum(norms, 1e-12)
+
+    return np.ascontiguousarray(matrix, dtype=np.float16 if precision == "float16" else np.float32)
+
+
+def default_persist_directory() -> str:
+    """기본 ChromaDB 저장 경로 (backend/data/chroma_db)"""
+    return str(Path(__file__).parent.parent / "data" / "chroma_db")
+
+
+def sidecar_paths(persist_directory: str, collection_name: str) -> List[str]:
+    """
+    컬렉션 옆에 저장되는 보조 파일 경로 (컬렉션을 삭제할 때 함께 삭제)
+
+    sparse 역색인, BM25 인덱스, 파티션 색인, 세대 마커 순서입니다.
+    """
+    return [
+        os.path.join(persist_directory, f"{collection_name}.sparse.npz"),
+        BM25Index.path_for(persist_directory, collection_name),
+        MetadataPartitionIndex.path_for(persist_directory, collection_name),
+        os.path.join(persist_directory, f"{collection_name}.generation")
+    ]
+
 
 class ChromaVectorStore:
     """ChromaDB 벡터 스토어 관리 클래스"""
@@ -17,22 +124,67 @@ class ChromaVectorStore:
     def __init__(
         self,
         collection_name: str = "commercial_analysis_docs",
-        persist_directory: str = None
+        persist_directory: str = None,
+        embedding_dim: Optional[int] = None,
+        embedding_precision: Optional[str] = None,
+        write_batch_size: int = 1000,
+        hnsw_m: Optional[int] = None,
+        hnsw_construction_ef: Optional[int] = None,
+        hnsw_search_ef: Optional[int] = None,
+        follow_alias: bool = True,
+        alias_check_interval: float = 1.0,
+        partition_keys: Optional[Iterable[str]] = PARTITION_KEYS,
+        partition_max_rows: int = 20000,
+        partition_cache_rows: int = 100000,
+        result_cache_size: int = 1024,
+        result_cache_ttl: Optional[float] = None
     ):
         """
         ChromaDB 벡터 스토어 초기화
 
         Args:
-            collection_name: 컬렉션 이름
+            collection_name: 컬렉션 이름 (별칭이면 활성 버전 컬렉션을 엶)
             persist_directory: 데이터 저장 경로 (None이면 기본 경로 사용)
+            embedding_dim: 저장 차원 수 (None이면 원본 차원, 기존 컬렉션은 메타데이터 값 사용)
+            embedding_precision: 저장 정밀도 (None/'float32'. Chroma는 벡터를 항상 float32로
+                저장하므로 새 컬렉션에 'float16'을 지정하면 ValueError. 컬렉션 크기는
+                embedding_dim 절단으로만 줄어들며, float16은 NumpyVectorStore에서 사용)
+            write_batch_size: add_documents 배치당 최대 행 수 (Chroma 최대 배치 크기로 제한)
+            hnsw_m: HNSW 노드당 연결 수 (클수록 recall↑, 메모리·빌드 시간↑)
+            hnsw_construction_ef: HNSW 빌드 시 후보 목록 크기 (클수록 인덱스 품질↑, 빌드 시간↑)
+            hnsw_search_ef: HNSW 검색 시 후보 목록 크기 (클수록 recall↑, 쿼리 지연↑)
+                (None이면 Chroma 기본값, 기존 컬렉션은 메타데이터 값 사용.
+                 세 값 모두 컬렉션 생성 시 고정되므로 변경하려면 새 버전을 빌드해야 함)
+            follow_alias: 별칭이 다른 버전으로 전환되면 검색 시 자동으로 새 버전을 엶
+            alias_check_interval: 별칭 포인터 파일 확인 간격 (초)
+            partition_keys: 파티션 검색에 사용할 메타데이터 키 (None/빈 값이면 사용 안 함)
+            partition_max_rows: 파티션 검색을 사용할 최대 파티션 크기 (초과 시 Chroma where 필터)
+            partition_cache_rows: 메모리에 올려둘 파티션 벡터의 최대 총 행 수
+            result_cache_size: 검색 결과 캐시 크기 (0이면 캐시 사용 안 함)
+            result_cache_ttl: 검색 결과 캐시 유효 시간 (초, None이면 문서 변경 전까지 유지)
         """
         # 저장 경로 설정
         if persist_directory is None:
             # 현재 파일 기준 상대 경로로 data/chroma_db 설정
-            current_dir = Path(__file__).parent.parent
-            persist_directory = str(current_dir / "data" / "chroma_db")
+            persist_directory = default_persist_directory()
 
         self.persist_directory = persist_directory
+
+        # 별칭(예: commercial_analysis_docs) → 활성 물리 컬렉션(예: commercial_analysis_docs__v3)
+        self.alias = collection_name
+        if VERSION_SEPARATOR in collection_name:
+            base = collection_name.rsplit(VERSION_SEPARATOR, 1)[0]
+            if parse_version(base, collection_name) is not None:
+                self.alias = base
+        self.follow_alias = follow_alias
+        self.alias_check_interval = alias_check_interval
+        self._alias_registry = CollectionAliasRegistry(persist_directory)
+        self._alias_mtime = self._alias_registry.mtime()
+        self._alias_checked_at = time.monotonic()
+        self._refresh_lock = threading.Lock()
+
+        if follow_alias and collection_name == self.alias:
+            collection_name = self._alias_registry.resolve(self.alias)
         self.collection_name = collection_name
 
         # 디렉토리 생성
@@ -47,68 +199,443 @@ class ChromaVectorStore:
             path=persist_directory
         )
 
+        # Chroma가 한 번에 받을 수 있는 최대 행 수를 넘지 않도록 배치 크기 제한
+        max_batch_size = getattr(self.client, "get_max_batch_size", lambda: write_batch_size)()
+        self.write_batch_size = max(1, min(write_batch_size, max_batch_size))
+        self.last_write_stats: Dict[str, Any] = {}
+
+        # 메타데이터 파티션: 필터 검색 시 해당 파티션의 벡터만 정확 검색
+        self.partition_keys = tuple(partition_keys or ())
+        self.partition_max_rows = partition_max_rows
+        self.partition_cache_rows = partition_cache_rows
+        self._partition_lock = threading.RLock()
+        self._partition_index: Optional[MetadataPartitionIndex] = None
+        self._generation_token = self.read_generation()
+        self._partition_checked_at = time.monotonic()
+        self._partition_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._partition_stats = {"partitioned": 0, "fallback": 0}
+
+        # 같은 쿼리 벡터·top_k·필터의 반복 검색 결과 캐시 (문서 추가/삭제 시 세대 번호로 무효화)
+        if result_cache_size > 0:
+            self.result_cache = SearchResultCache(
+                max_entries=result_cache_size,
+                ttl_seconds=result_cache_ttl
+            )
+        else:
+            self.result_cache = None
+
         # 컬렉션 생성 또는 가져오기
         try:
-            self.collection = self.client.get_or_create_collection(
-                name=collection_name,
-                metadata={"hnsw:space": "cosine"}  # 코사인 유사도 사용
+            self.collection = self._open_collection(
+                embedding_dim,
+                embedding_precision,
+                {"M": hnsw_m, "construction_ef": hnsw_construction_ef, "search_ef": hnsw_search_ef}
             )
-            print(f"[OK] ChromaDB 준비 완료 (문서 수: {self.collection.count()})")
+            print(f"[OK] ChromaDB 준비 완료 (문서 수: {self.collection.count()}, "
+                  f"저장 모드: {self.embedding_dim or '원본'}차원/{self.embedding_precision}, "
+                  f"HNSW: {self.hnsw_params})")
         except Exception as e:
             print(f"[ERROR] ChromaDB 초기화 실패: {e}")
             raise
 
+    @classmethod
+    def create_version(
+        cls,
+        alias: str = "commercial_analysis_docs",
+        persist_directory: Optional[str] = None,
+        **kwargs
+    ) -> "ChromaVectorStore":
+        """
+        별칭의 새 버전 컬렉션(예: commercial_analysis_docs__v4)을 만들어 엶
+
+        활성 버전은 건드리지 않으므로, 빌드·검증이 끝난 뒤 promote()로 전환합니다.
+
+        Args:
+            alias: 별칭
+            persist_directory: 데이터 저장 경로 (None이면 기본 경로 사용)
+            **kwargs: ChromaVectorStore 생성자 인자 (embedding_dim 등)
+        """
+        persist_directory = persist_directory or default_persist_directory()
+        os.makedirs(persist_directory, exist_ok=True)
+        client = chromadb.PersistentClient(path=persist_directory)
+        existing = [getattr(col, "name", col) for col in client.list_collections()]
+
+        version = CollectionAliasRegistry(persist_directory).next_version(alias, existing)
+        print(f"[ALIAS] 새 버전 컬렉션 생성: {versioned_name(alias, version)}")
+        return cls(
+            collection_name=versioned_name(alias, version),
+            persist_directory=persist_directory,
+            follow_alias=False,
+            **kwargs
+        )
+
+    def promote(self, info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        현재 컬렉션을 별칭의 활성 버전으로 전환 (포인터 파일 원자적 교체)
+
+        Args:
+            info: 별칭 레코드에 함께 남길 정보 (문서 수 등)
+        """
+        record = self._alias_registry.promote(self.alias, self.collection_name, info)
+        self._alias_mtime = self._alias_registry.mtime()
+        return record
+
+    def gc_versions(self, keep: int = 1) -> List[str]:
+        """
+        활성 버전보다 오래된 버전 컬렉션 삭제 (sparse 역색인, BM25 인덱스, 파티션 색인 파일 포함)
+
+        활성 버전보다 새로운 버전(다른 프로세스에서 빌드 중일 수 있음)은 삭제하지 않습니다.
+
+        Args:
+            keep: 롤백용으로 남겨둘 직전 버전 수
+
+        Returns:
+            삭제한 컬렉션 이름 리스트
+        """
+        active = self._alias_registry.resolve(self.alias)
+        active_version = parse_version(self.alias, active) or 0
+        older = [
+            name for name in self._alias_registry.versions(self.alias, self.list_collections())
+            if parse_version(self.alias, name) < active_version
+        ]
+        stale = older[:max(len(older) - keep, 0)]
+
+        for name in stale:
+            self.client.delete_collection(name=name)
+            for side_path in sidecar_paths(self.persist_directory, name):
+                if os.path.exists(side_path):
+                    os.remove(side_path)
+            print(f"[ALIAS] 이전 버전 컬렉션 삭제: {name}")
+        return stale
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        별칭이 다른 버전으로 전환되었으면 새 버전 컬렉션으로 교체
+
+        포인터 파일의 수정 시각만 확인하므로 alias_check_interval마다 stat 한 번의 비용입니다.
+
+        Returns:
+            컬렉션이 교체되었는지 여부
+        """
+        if not self.follow_alias:
+            return False
+
+        now = time.monotonic()
+        if not force and now - self._alias_checked_at < self.alias_check_interval:
+            return False
+
+        with self._refresh_lock:
+            self._alias_checked_at = now
+            mtime = self._alias_registry.mtime()
+            if mtime == self._alias_mtime:
+                return False
+            self._alias_mtime = mtime
+
+            target = self._alias_registry.resolve(self.alias)
+            if target == self.collection_name:
+                return False
+
+            try:
+                self.client.get_collection(name=target)
+            except Exception as e:
+                print(f"[WARN] 별칭 '{self.alias}'의 새 버전 '{target}'을 열 수 없어 기존 버전 유지: {e}")
+                return False
+
+            previous = self.collection_name
+            self.collection_name = target
+            self.collection = self._open_collection(None, None)
+            self._reset_partitions()
+            self._generation_token = self.read_generation()
+            self._invalidate_results()
+            print(f"[ALIAS] '{self.alias}' 컬렉션 전환: {previous} → {target} "
+                  f"(문서 수: {self.collection.count()})")
+            return True
+
+    def _open_collection(
+        self,
+        embedding_dim: Optional[int],
+        embedding_precision: Optional[str],
+        hnsw_params: Optional[Dict[str, Optional[int]]] = None
+    ):
+        """
+        컬렉션을 열고 저장 모드(차원/정밀도)와 HNSW 파라미터를 메타데이터와 맞춤
+
+        기존 컬렉션은 메타데이터에 기록된 값을 따르며,
+        명시적으로 다른 값을 요청하면 ValueError를 발생시킵니다.
+        """
+        requested_hnsw = {
+            name: value for name, value in (hnsw_params or {}).items() if value is not None
+        }
+        try:
+            collection = self.client.get_collection(name=self.collection_name)
+        except Exception:
+            collection = None
+
+        if collection is not None:
+            metadata = collection.metadata or {}
+            stored_dim = metadata.get("embedding_dim") or None
+            stored_precision = metadata.get("embedding_precision", "float32")
+
+            if embedding_dim is not None and embedding_dim != stored_dim:
+                raise ValueError(
+                    f"컬렉션 '{self.collection_name}'의 저장 차원({stored_dim})과 "
+                    f"요청한 차원({embedding_dim})이 다릅니다."
+                )
+            if embedding_precision is not None and embedding_precision != stored_precision:
+                raise ValueError(
+                    f"컬렉션 '{self.collection_name}'의 저장 정밀도({stored_precision})와 "
+                    f"요청한 정밀도({embedding_precision})가 다릅니다."
+                )
+
+            stored_hnsw = {
+                name: int(metadata.get(key, HNSW_DEFAULTS[name]))
+                for name, key in HNSW_METADATA_KEYS.items()
+            }
+            for name, value in requested_hnsw.items():
+                if value != stored_hnsw[name]:
+                    raise ValueError(
+                        f"컬렉션 '{self.collection_name}'의 HNSW {name}({stored_hnsw[name]})와 "
+                        f"요청한 값({value})이 다릅니다. 새 버전 컬렉션을 빌드해야 합니다."
+                    )
+
+            if stored_precision == "float16":
+                print(f"[WARN] 컬렉션 '{self.collection_name}'은 float16 모드로 만들어졌지만 Chroma는 "
+                      f"float32로 저장합니다. 새로 추가하는 벡터는 float32 그대로 저장합니다.")
+
+            self.embedding_dim = stored_dim
+            self.embedding_precision = stored_precision
+            self.hnsw_params = stored_hnsw
+            return collection
+
+        self.embedding_dim = embedding_dim
+        self.embedding_precision = embedding_precision or "float32"
+        if self.embedding_precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(f"지원하지 않는 정밀도: {self.embedding_precision}")
+        if self.embedding_precision != "float32":
+            raise ValueError(
+                "Chroma는 벡터를 float32로 저장하므로 float16 컬렉션은 크기가 줄지 않습니다. "
+                "컬렉션 크기는 embedding_dim으로 줄이고, float16은 NumPy 백엔드"
+                "(RAG_VECTOR_PRECISION=float16)에서 사용하세요."
+            )
+
+        for name, value in requested_hnsw.items():
+            if value < 1:
+                raise ValueError(f"HNSW {name}는 1 이상이어야 합니다. ({value})")
+        self.hnsw_params = {**HNSW_DEFAULTS, **requested_hnsw}
+
+        return self.client.create_collection(
+            name=self.collection_name,
+            metadata={
+                "hnsw:space": "cosine",  # 코사인 유사도 사용
+                "embedding_dim": self.embedding_dim or 0,  # 0 = 원본 차원
+                "embedding_precision": self.embedding_precision,
+                **{HNSW_METADATA_KEYS[name]: value for name, value in requested_hnsw.items()}
+            }
+        )
+
+    def _prepare_embeddings(self, embeddings: EmbeddingsInput) -> np.ndarray:
+        """저장 모드에 맞게 임베딩 변환 (차원 절단, Chroma 저장 자료형인 float32 유지)"""
+        if self.embedding_dim is None:
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
+        return reduce_embeddings(embeddings, self.embedding_dim)
+
     def add_documents(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: EmbeddingsInput,
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
     ) -> List[str]:
         """
         문서를 벡터 스토어에 추가
 
+        batch_size 단위로 나누어 쓰며, 이전 배치가 Chroma에 기록되는 동안
+        다음 배치의 임베딩 변환을 준비합니다. (동시에 최대 2개 배치만 메모리에 유지)
+
         Args:
             texts: 문서 텍스트 리스트
-            embeddings: 임베딩 벡터 리스트
+            embeddings: 임베딩 벡터 리스트 또는 (n, dim) float32 ndarray
             metadatas: 메타데이터 리스트 (파일명, 날짜 등)
-            ids: 문서 ID 리스트 (None이면 자동 생성)
+            ids: 문서 ID 리스트 (None이면 경로/페이지/청크 번호/내용 해시로 생성)
+            batch_size: 배치당 최대 행 수 (None이면 write_batch_size)
 
         Returns:
             생성된 문서 ID 리스트
         """
-        if not texts or not embeddings:
+        if not texts or len(embeddings) == 0:
             raise ValueError("텍스트와 임베딩이 비어있습니다.")
 
         if len(texts) != len(embeddings):
             raise ValueError("텍스트와 임베딩의 개수가 일치하지 않습니다.")
 
-        # ID 자동 생성
-        if ids is None:
-            current_count = self.collection.count()
-            ids = [f"doc_{current_count + i}" for i in range(len(texts))]
-
         # 메타데이터 기본값 설정
         if metadatas is None:
             metadatas = [{"source": "unknown"} for _ in texts]
 
-        try:
-            # 문서 추가
+        # ID 자동 생성 (결정적 콘텐츠 해시 ID)
+        if ids is None:
+            ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+        batch_size = min(batch_size or self.write_batch_size, self.write_batch_size)
+        total = len(texts)
+        num_batches = (total + batch_size - 1) // batch_size
+        batch_times: List[float] = []
+        committed = 0  # Chroma에 기록된 앞쪽 행 수 (쓰기 스레드 1개이므로 순서대로 완료)
+
+        def write_batch(start: int, end: int, rows: List[np.ndarray]) -> float:
+            batch_start = time.perf_counter()
             self.collection.add(
-                documents=texts,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
+                documents=texts[start:end],
+                embeddings=rows,
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
             )
-            print(f"[OK] {len(texts)}개 문서 추가 완료")
+            return time.perf_counter() - batch_start
+
+        def report(future: Future, batch_no: int, rows: int) -> None:
+            nonlocal committed
+            elapsed = future.result()
+            committed += rows
+            batch_times.append(elapsed)
+            if num_batches > 1:
+                print(f"[WRITE] 배치 {batch_no}/{num_batches}: {rows}행, "
+                      f"{elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)")
+
+        try:
+            # 문서 추가 (쓰기 스레드 1개 + 호출 스레드에서 다음 배치 준비)
+            total_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ChromaWriter") as writer:
+                pending = None
+                for batch_no, start in enumerate(range(0, total, batch_size), 1):
+                    end = min(start + batch_size, total)
+                    rows = as_float32_rows(self._prepare_embeddings(embeddings[start:end]))
+
+                    if pending is not None:
+                        report(*pending)
+                    pending = (writer.submit(write_batch, start, end, rows), batch_no, end - start)
+                if pending is not None:
+                    report(*pending)
+            total_elapsed = time.perf_counter() - total_start
+
+            self.last_write_stats = {
+                "rows": total,
+                "batches": num_batches,
+                "batch_size": batch_size,
+                "elapsed_s": round(total_elapsed, 3),
+                "rows_per_sec": round(total / max(total_elapsed, 1e-9), 1),
+                "max_batch_s": round(max(batch_times), 3)
+            }
+            print(f"[OK] {total}개 문서 추가 완료 ({num_batches}개 배치, "
+                  f"{total_elapsed:.2f}s, {self.last_write_stats['rows_per_sec']:.0f} rows/s)")
             return ids
         except Exception as e:
-            print(f"[ERROR] 문서 추가 실패: {e}")
+            print(f"[ERROR] 문서 추가 실패: {e} (기록된 {committed}/{total}행은 컬렉션에 남음)")
             raise
+        finally:
+            # 일부 배치만 기록되었더라도 기록된 행은 파티션 필터 검색에 포함되어야 하고,
+            # 캐시된 검색 결과는 더 이상 유효하지 않음
+            if committed:
+                self._update_partition_index(added_ids=ids[:committed], metadatas=metadatas[:committed])
+            self._mark_changed()
+
+    def upsert_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[EmbeddingsInput] = None,
+        embedding_function: Optional[Callable[[List[str]], EmbeddingsInput]] = None,
+        prune_scope: Optional[str] = "source",
+        reembed: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        결정적 ID 기준으로 변경된 청크만 반영
+
+        - 이미 같은 ID(같은 경로/페이지/청크 번호/내용)가 있으면 건너뜀 (reembed=True면 다시 임베딩)
+        - 새 청크만 임베딩하여 추가 (embedding_function 사용 시 새 청크만 임베딩)
+        - prune_scope에 따라 이번 입력에 없는 기존 청크 삭제
+
+        Args:
+            texts: 문서 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            embeddings: 전체 텍스트의 임베딩 (embedding_function과 둘 중 하나 필요)
+            embedding_function: 새 청크 텍스트만 받아 임베딩을 반환하는 함수
+            prune_scope: 이번 입력에 없는 기존 청크 삭제 범위
+                - "source": 입력에 포함된 원본 파일의 청크만 정리 (파일 단위 갱신)
+                - "collection": 컬렉션 전체 정리 (전체 동기화, 삭제된 파일 반영)
+                - None: 삭제하지 않음
+            reembed: 기존 청크도 다시 임베딩하여 교체 (max_seq_length 등 임베딩 설정 변경 시;
+                다시 임베딩한 청크는 "added"에 포함)
+
+        Returns:
+            {"added": [...], "unchanged": [...], "deleted": [...]} 문서 ID 리스트
+        """
+        if len(texts) != len(metadatas):
+            raise ValueError("텍스트와 메타데이터의 개수가 일치하지 않습니다.")
+        if embeddings is None and embedding_function is None:
+            raise ValueError("embeddings 또는 embedding_function이 필요합니다.")
+        if prune_scope not in (None, "source", "collection"):
+            raise ValueError(f"지원하지 않는 prune_scope: {prune_scope}")
+
+        ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+
+        # 같은 내용이 중복 입력된 경우 첫 번째만 사용
+        first_index: Dict[str, int] = {}
+        for i, doc_id in enumerate(ids):
+            first_index.setdefault(doc_id, i)
+
+        existing = set()
+        if first_index:
+            existing = set(self.collection.get(ids=list(first_index), include=[])["ids"])
+        if reembed:
+            new_indices = list(first_index.values())
+            unchanged = []
+        else:
+            new_indices = [i for doc_id, i in first_index.items() if doc_id not in existing]
+            unchanged = [doc_id for doc_id in first_index if doc_id in existing]
+
+        # 새 청크 추가
+        added: List[str] = []
+        if new_indices:
+            new_texts = [texts[i] for i in new_indices]
+            if embedding_function is not None:
+                new_embeddings = embedding_function(new_texts)
+            else:
+                new_embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)[new_indices]
+            if reembed and existing:
+                # 새 임베딩을 모두 계산한 뒤에 기존 벡터를 교체
+                self.delete_documents(sorted(existing))
+            added = self.add_documents(
+                texts=new_texts,
+                embeddings=new_embeddings,
+                metadatas=[metadatas[i] for i in new_indices],
+                ids=[ids[i] for i in new_indices]
+            )
+
+        # 이번 입력에 없는 기존 청크 정리
+        deleted: List[str] = []
+        if prune_scope is not None:
+            keep = set(first_index)
+            if prune_scope == "collection":
+                candidates = self.collection.get(include=[])["ids"]
+            else:
+                sources = sorted({source_key(metadata) for metadata in metadatas})
+                candidates = []
+                for key_field in ("relative_path", "source"):
+                    candidates += self.collection.get(
+                        where={key_field: {"$in": sources}},
+                        include=[]
+                    )["ids"]
+            deleted = sorted({doc_id for doc_id in candidates if doc_id not in keep})
+            if deleted:
+                self.delete_documents(deleted)
+
+        print(f"[OK] upsert 완료: 추가 {len(added)}개, 유지 {len(unchanged)}개, 삭제 {len(deleted)}개")
+        return {"added": added, "unchanged": unchanged, "deleted": deleted}
 
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingInput,
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
@@ -116,7 +643,7 @@ class ChromaVectorStore:
         유사도 기반 문서 검색
 
         Args:
-            query_embedding: 검색 쿼리 임베딩 벡터
+            query_embedding: 검색 쿼리 임베딩 벡터 (리스트 또는 float32 ndarray)
             top_k: 반환할 문서 개수
             filter_metadata: 메타데이터 필터 (예: {"source": "guide.pdf"})
 
@@ -129,25 +656,395 @@ class ChromaVectorStore:
                 "ids": [...]
             }
         """
+        return self.search_many([query_embedding], top_k, filter_metadata)[0]
+
+    def search_many(
+        self,
+        query_embeddings: EmbeddingsInput,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 쿼리를 한 번의 collection.query 호출로 검색
+
+        Args:
+            query_embeddings: 쿼리 임베딩 리스트 또는 (n, dim) float32 ndarray
+            top_k: 쿼리별 반환할 문서 개수
+            filter_metadata: 모든 쿼리에 적용할 메타데이터 필터
+
+        Returns:
+            쿼리 순서대로 search()와 같은 형식의 결과 딕셔너리 리스트
+        """
+        if len(query_embeddings) == 0:
+            return []
+
+        # 별칭이 새 버전으로 전환되었거나 다른 프로세스가 문서를 갱신했으면 반영
+        self.refresh()
+        self._check_external_changes()
+
+        queries = self._prepare_embeddings(query_embeddings)
+        if self.result_cache is None:
+            return self._search_uncached(queries, top_k, filter_metadata)
+
+        # 캐시에 없는 쿼리만 검색 (같은 키의 쿼리는 한 번만 검색)
+        generation = self.result_cache.generation
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        missing: Dict[str, List[int]] = {}
+        for i, query in enumerate(queries):
+            key = self.result_cache.make_key(query, top_k, filter_metadata, self.collection_name)
+            if key in missing:
+                missing[key].append(i)
+                continue
+            found, cached = self.result_cache.get(key)
+            if found:
+                results[i] = cached
+            else:
+                missing[key] = [i]
+
+        if missing:
+            rows = [positions[0] for positions in missing.values()]
+            fresh = self._search_uncached(queries[rows], top_k, filter_metadata)
+            for (key, positions), result in zip(missing.items(), fresh):
+                self.result_cache.put(key, result, generation)
+                for i in positions:
+                    results[i] = result
+
+        # 호출자가 결과 리스트/메타데이터를 수정해도 캐시 항목은 그대로 유지
+        return [copy_search_result(result) for result in results]
+
+    def _search_uncached(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """저장 모드로 변환된 (q, dim) 쿼리 행렬 검색 (파티션 또는 collection.query)"""
+        # 파티션 키 필터면 해당 파티션 벡터만 검색
+        if filter_metadata and self.partition_keys:
+            partitioned = self._search_partitions(queries, top_k, filter_metadata)
+            if partitioned is not None:
+                return partitioned
+
         try:
             # 검색 수행
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=as_float32_rows(queries),
                 n_results=top_k,
                 where=filter_metadata  # 메타데이터 필터링
             )
 
-            # 결과 정리
-            formatted_results = {
-                "documents": results["documents"][0] if results["documents"] else [],
-                "metadatas": results["metadatas"][0] if results["metadatas"] else [],
-                "distances": results["distances"][0] if results["distances"] else [],
-                "ids": results["ids"][0] if results["ids"] else []
+            # 결과 정리 (쿼리별)
+            return [
+                {
+                    "documents": results["documents"][i] if results["documents"] else [],
+                    "metadatas": results["metadatas"][i] if results["metadatas"] else [],
+                    "distances": results["distances"][i] if results["distances"] else [],
+                    "ids": results["ids"][i] if results["ids"] else []
+                }
+                for i in range(len(queries))
+            ]
+        except Exception as e:
+            print(f"[ERROR] 검색 실패: {e}")
+            raise
+
+    @property
+    def partition_index_path(self) -> str:
+        """현재 컬렉션의 파티션 색인 파일 경로"""
+        return MetadataPartitionIndex.path_for(self.persist_directory, self.collection_name)
+
+    def build_partition_index(self, page_size: int = 1000) -> MetadataPartitionIndex:
+        """
+        컬렉션 메타데이터를 페이지 단위로 읽어 파티션 색인을 새로 만들고 저장
+
+        Args:
+            page_size: 한 번에 읽을 문서 수
+
+        Returns:
+            생성된 MetadataPartitionIndex
+        """
+        with self._partition_lock:
+            index = MetadataPartitionIndex(self.partition_index_path, self.partition_keys or PARTITION_KEYS)
+            index.clear()
+            for page in self.iter_documents(page_size=page_size, include_embeddings=False):
+                index.add(page["ids"], page["metadatas"])
+            index.save()
+
+            self._partition_cache.clear()
+            self._partition_index = index
+            self._partition_checked_at = time.monotonic()
+        self._mark_changed()
+        return index
+
+    def get_partition_stats(self) -> Dict[str, Any]:
+        """파티션 검색 통계 (partitioned: 파티션 검색 수, fallback: Chroma where 필터 사용 수)"""
+        with self._partition_lock:
+            return {
+                **self._partition_stats,
+                "cached_partitions": len(self._partition_cache),
+                "cached_rows": sum(len(store.ids) for store in self._partition_cache.values())
             }
 
-            return formatted_results
+    def get_result_cache_stats(self) -> Dict[str, Any]:
+        """검색 결과 캐시 통계 (hit_ratio, entries, generation 등)"""
+        if self.result_cache is None:
+            return {}
+        return self.result_cache.stats()
+
+    def _invalidate_results(self) -> None:
+        """문서가 바뀌었으므로 검색 결과 캐시 세대 번호 증가"""
+        if self.result_cache is not None:
+            self.result_cache.invalidate()
+
+    @property
+    def generation_marker_path(self) -> str:
+        """현재 컬렉션의 세대 마커 파일 경로 (쓰기 경로마다 새 값으로 교체)"""
+        return os.path.join(self.persist_directory, f"{self.collection_name}.generation")
+
+    @property
+    def generation(self) -> str:
+        """
+        마지막으로 확인한 세대 마커 값 (자체 쓰기는 즉시, 다른 프로세스의 쓰기는
+        검색 시 alias_check_interval마다 반영)
+        """
+        return self._generation_token
+
+    def read_generation(self) -> str:
+        """
+        세대 마커 값 (문서 추가/삭제, 파티션 색인 재생성 때마다 바뀜; 마커가 없으면 빈 문자열)
+
+        같은 컬렉션의 파일 기반 보조 색인(BM25 등)이 다시 로드할 시점을 판단할 때 사용합니다.
+        """
+        try:
+            with open(self.generation_marker_path, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return ""
+
+    def _mark_changed(self) -> None:
+        """
+        세대 마커를 새 값으로 교체하고 검색 결과 캐시 무효화
+
+        add_documents/delete_documents/build_partition_index 등 모든 쓰기 경로에서 호출하며,
+        다른 프로세스는 _check_external_changes에서 마커 값이 바뀐 것을 보고 캐시를 버립니다.
+        """
+        token = f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        tmp_path = f"{self.generation_marker_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(token)
+            os.replace(tmp_path, self.generation_marker_path)
+            self._generation_token = token
+        except OSError as e:
+            print(f"[WARN] 세대 마커 갱신 실패: {e}")
+        self._invalidate_results()
+
+    def _check_external_changes(self) -> None:
+        """
+        다른 프로세스(index_documents.py)의 문서 추가/삭제 감지
+
+        모든 쓰기 경로가 세대 마커 파일을 새 값으로 교체하므로,
+        alias_check_interval마다 마커 값을 확인하여 바뀌었으면
+        파티션 색인과 검색 결과 캐시를 무효화합니다.
+        """
+        now = time.monotonic()
+        if now - self._partition_checked_at < self.alias_check_interval:
+            return
+
+        with self._partition_lock:
+            self._partition_checked_at = now
+            token = self.read_generation()
+            if token == self._generation_token:
+                return
+            self._generation_token = token
+            print(f"[PARTITION] 컬렉션 변경 감지, 파티션 색인/검색 캐시 무효화: {self.collection_name}")
+            self._reset_partitions()
+        self._invalidate_results()
+
+    def _reset_partitions(self) -> None:
+        """파티션 색인과 메모리의 파티션 벡터 폐기 (컬렉션 전환/외부 갱신 시)"""
+        with self._partition_lock:
+            self._partition_index = None
+            self._partition_cache.clear()
+
+    def _load_partition_index(self) -> MetadataPartitionIndex:
+        """파티션 색인 반환 (파일이 없으면 생성, 외부 변경은 _check_external_changes에서 감지)"""
+        with self._partition_lock:
+            if self._partition_index is None:
+                if os.path.exists(self.partition_index_path):
+                    self._partition_index = MetadataPartitionIndex(self.partition_index_path, self.partition_keys)
+                else:
+                    print(f"[PARTITION] 파티션 색인이 없어 생성합니다: {self.partition_index_path}")
+                    self.build_partition_index()
+            return self._partition_index
+
+    def _update_partition_index(
+        self,
+        added_ids: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        removed_ids: Optional[List[str]] = None
+    ) -> None:
+        """문서 추가/삭제를 파티션 색인에 반영 (색인이 아직 없으면 첫 필터 검색 때 생성)"""
+        if not self.partition_keys:
+            return
+        with self._partition_lock:
+            index = self._partition_index
+            if index is None:
+                if not os.path.exists(self.partition_index_path):
+                    return
+                index = MetadataPartitionIndex(self.partition_index_path, self.partition_keys)
+
+            if removed_ids:
+                index.remove(removed_ids)
+            if added_ids:
+                index.add(added_ids, metadatas)
+            index.save()
+
+            self._partition_cache.clear()
+            self._partition_index = index
+
+    def _partition_store(self, key: str, value: Any, ids: List[str]):
+        """(키, 값) 파티션의 벡터를 메모리 정확 검색 스토어로 로드 (LRU, 총 행 수 제한)"""
+        from .numpy_vector_store import NumpyVectorStore
+
+        cache_key = (key, value)
+        with self._partition_lock:
+            store = self._partition_cache.get(cache_key)
+            if store is not None:
+                self._partition_cache.move_to_end(cache_key)
+                return store
+
+        rows = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+        for start in range(0, len(ids), self.write_batch_size):
+            page = self.collection.get(
+                ids=ids[start:start + self.write_batch_size],
+                include=["documents", "metadatas", "embeddings"]
+            )
+            for name in rows:
+                rows[name].extend(page[name])
+
+        store = NumpyVectorStore(
+            ids=rows["ids"],
+            documents=rows["documents"],
+            metadatas=rows["metadatas"],
+            embeddings=np.asarray(rows["embeddings"], dtype=np.float32),
+            embedding_dim=self.embedding_dim,
+            embedding_precision=self.embedding_precision,
+            collection_name=self.collection_name,
+            persist_directory=self.persist_directory
+        )
+        print(f"[PARTITION] 파티션 로드: {key}={value!r} ({len(store.ids)}개 문서)")
+
+        with self._partition_lock:
+            self._partition_cache[cache_key] = store
+            cached_rows = sum(len(cached.ids) for cached in self._partition_cache.values())
+            while cached_rows > self.partition_cache_rows and len(self._partition_cache) > 1:
+                _, evicted = self._partition_cache.popitem(last=False)
+                cached_rows -= len(evicted.ids)
+        return store
+
+    def _search_partitions(
+        self,
+        query_embeddings: EmbeddingsInput,
+        top_k: int,
+        filter_metadata: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        필터의 파티션 조건 중 가장 작은 파티션의 벡터만 정확 검색
+
+        전체 필터는 파티션 안에서 그대로 적용합니다. 파티션 조건이 없거나,
+        파티션이 partition_max_rows보다 크거나, 메모리 검색이 지원하지 않는
+        연산자($gt 등)를 쓰면 None을 반환하여 Chroma where 필터로 검색합니다.
+        """
+        clauses = partition_clauses(filter_metadata, self.partition_keys)
+        if not clauses:
+            return None
+
+        index = self._load_partition_index()
+        size, key, values = min(
+            ((len(index.ids_for(key, values)), key, values) for key, values in clauses),
+            key=lambda clause: clause[0]
+        )
+        if size > self.partition_max_rows:
+            with self._partition_lock:
+                self._partition_stats["fallback"] += 1
+            return None
+
+        try:
+            per_partition = []
+            for value in dict.fromkeys(values):
+                ids = sorted(index.ids_for(key, [value]))
+                if ids:
+                    store = self._partition_store(key, value, ids)
+                    per_partition.append(store.search_many(query_embeddings, top_k, filter_metadata))
+        except ValueError as e:
+            print(f"[WARN] 파티션 검색 불가, Chroma 필터 검색 사용: {e}")
+            with self._partition_lock:
+                self._partition_stats["fallback"] += 1
+            return None
+
+        with self._partition_lock:
+            self._partition_stats["partitioned"] += 1
+
+        # 값이 여러 개($in)면 파티션별 상위 k개를 거리 순으로 병합
+        merged = []
+        for qi in range(len(query_embeddings)):
+            rows = [
+                (distance, doc_id, doc, metadata)
+                for results in per_partition
+                for doc_id, doc, metadata, distance in zip(
+                    results[qi]["ids"], results[qi]["documents"],
+                    results[qi]["metadatas"], results[qi]["distances"]
+                )
+            ]
+            rows.sort(key=lambda row: row[0])
+            rows = rows[:top_k]
+            merged.append({
+                "documents": [row[2] for row in rows],
+                "metadatas": [row[3] for row in rows],
+                "distances": [row[0] for row in rows],
+                "ids": [row[1] for row in rows]
+            })
+        return merged
+
+    def prepare_query_embedding(self, query_embedding: EmbeddingInput) -> np.ndarray:
+        """쿼리 벡터를 컬렉션 저장 모드(차원/정밀도)에 맞게 변환"""
+        return self._prepare_embeddings([query_embedding])[0]
+
+    def get_documents(
+        self,
+        ids: List[str],
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        """
+        ID로 문서 조회
+
+        Args:
+            ids: 조회할 문서 ID 리스트
+            filter_metadata: 메타데이터 필터 (조건에 맞지 않는 문서는 제외)
+            include_embeddings: 임베딩 포함 여부
+
+        Returns:
+            {"ids": [...], "documents": [...], "metadatas": [...], ("embeddings": ndarray)}
+        """
+        if not ids:
+            return {"ids": [], "documents": [], "metadatas": [], "embeddings": None}
+
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        try:
+            results = self.collection.get(
+                ids=ids,
+                where=filter_metadata,
+                include=include
+            )
+            if include_embeddings:
+                results["embeddings"] = np.asarray(results["embeddings"], dtype=np.float32)
+            return results
         except Exception as e:
-            print(f"[ERROR] 검색 실패: {e}")
+            print(f"[ERROR] 문서 조회 실패: {e}")
             raise
 
     def delete_documents(self, ids: List[str]) -> bool:
@@ -161,28 +1058,65 @@ class ChromaVectorStore:
             성공 여부
         """
         try:
-            self.collection.delete(ids=ids)
+            for start in range(0, len(ids), self.write_batch_size):
+                self.collection.delete(ids=ids[start:start + self.write_batch_size])
             print(f"[OK] {len(ids)}개 문서 삭제 완료")
+            self._update_partition_index(removed_ids=ids)
             return True
         except Exception as e:
             print(f"[ERROR] 문서 삭제 실패: {e}")
             return False
+        finally:
+            self._mark_changed()
 
     def delete_collection(self) -> bool:
         """
-        컬렉션 전체 삭제
+        컬렉션 전체 삭제 (sparse 역색인/BM25 인덱스/파티션 색인/세대 마커 파일 포함)
 
         Returns:
             성공 여부
         """
         try:
             self.client.delete_collection(name=self.collection_name)
+            for side_path in sidecar_paths(self.persist_directory, self.collection_name):
+                if os.path.exists(side_path):
+                    os.remove(side_path)
+            self._reset_partitions()
+            self._invalidate_results()
             print(f"[OK] 컬렉션 '{self.collection_name}' 삭제 완료")
             return True
         except Exception as e:
             print(f"[ERROR] 컬렉션 삭제 실패: {e}")
             return False
 
+    def filter_ids(self, filter_metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        메타데이터 필터를 통과하는 문서 ID 리스트 (문서/임베딩은 읽지 않음)
+
+        Args:
+            filter_metadata: Chroma where 필터 (None이면 전체 문서 ID)
+        """
+        return self.collection.get(where=filter_metadata or None, include=[])["ids"]
+
+    @property
+    def stored_max_seq_length(self) -> Optional[int]:
+        """컬렉션 임베딩에 사용한 최대 시퀀스 길이 (기록이 없으면 None)"""
+        return (self.collection.metadata or {}).get("max_seq_length") or None
+
+    def record_max_seq_length(self, max_seq_length: int) -> None:
+        """
+        컬렉션 메타데이터에 임베딩 최대 시퀀스 길이 기록 (다음 인덱싱 때 재임베딩 여부 판단)
+
+        Chroma는 modify에 거리 함수(hnsw:space)를 다시 넘기면 거부하므로 제외합니다.
+        거리 함수는 컬렉션 설정에 그대로 유지됩니다.
+        """
+        metadata = dict(self.collection.metadata or {})
+        if metadata.get("max_seq_length") == max_seq_length:
+            return
+        metadata.pop("hnsw:space", None)
+        metadata["max_seq_length"] = max_seq_length
+        self.collection.modify(metadata=metadata)
+
     def get_document_count(self) -> int:
         """컬렉션의 문서 개수 반환"""
         return self.collection.count()
@@ -190,12 +1124,64 @@ class ChromaVectorStore:
     def list_collections(self) -> List[str]:
         """모든 컬렉션 목록 반환"""
         collections = self.client.list_collections()
-        return [col.name for col in collections]
+        # chromadb 0.6+는 이름 문자열, 이전 버전은 Collection 객체를 반환
+        return [getattr(col, "name", col) for col in collections]
+
+    def iter_documents(
+        self,
+        page_size: int = 1000,
+        include_embeddings: bool = True,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        컬렉션을 page_size 단위로 나누어 순회 (메모리에는 한 페이지만 유지)
+
+        Args:
+            page_size: 페이지당 문서 수
+            include_embeddings: 임베딩 포함 여부 (포함 시 (n, dim) float32 ndarray)
+            filter_metadata: 메타데이터 필터
+
+        Yields:
+            {"ids": [...], "documents": [...], "metadatas": [...], "embeddings": ndarray 또는 None}
+        """
+        if page_size < 1:
+            raise ValueError("page_size는 1 이상이어야 합니다.")
+
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        offset = 0
+        while True:
+            page = self.collection.get(
+                limit=page_size,
+                offset=offset,
+                where=filter_metadata,
+                include=include
+            )
+            if not page["ids"]:
+                break
+
+            yield {
+                "ids": page["ids"],
+                "documents": page["documents"],
+                "metadatas": page["metadatas"],
+                "embeddings": (
+                    np.asarray(page["embeddings"], dtype=np.float32) if include_embeddings else None
+                )
+            }
+
+            if len(page["ids"]) < page_size:
+                break
+            offset += page_size
 
     def get_all_documents(self, limit: int = None) -> Dict[str, Any]:
         """
         모든 문서 조회
 
+        대형 컬렉션은 한 번에 메모리로 읽으므로 iter_documents() 또는
+        rag.snapshot.export_snapshot()을 사용하세요.
+
         Args:
             limit: 최대 조회 개수 (None이면 전체)
 
@@ -0,0 +1,125 @@
+"""
+벡터 스토어 인터페이스(Protocol) 모듈
+
+Retriever, 인덱싱 스크립트, 벤치마크가 사용하는 벡터 스토어 메서드를 정의합니다.
+ChromaVectorStore, NumpyVectorStore처럼 이 메서드를 갖춘 클래스는 상속 없이
+서로 교체하여 사용할 수 있습니다. (구현 검증: test_vector_store_conformance.py)
+
+- SearchableVectorStore: 검색/조회만 하는 읽기 인터페이스 (Retriever가 사용)
+- VectorStore: 읽기 + 문서 추가/갱신/삭제 (인덱싱 스크립트가 사용)
+
+QuantizedVectorStore처럼 읽기 전용인 스토어는 SearchableVectorStore만 만족하며,
+쓰기 메서드를 호출하면 ReadOnlyStoreError를 발생시킵니다.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Union, runtime_checkable
+
+import numpy as np
+
+
+# 임베딩 입력 타입: 기존 리스트 형식 또는 float32 ndarray
+EmbeddingInput = Union[List[float], np.ndarray]
+EmbeddingsInput = Union[List[List[float]], np.ndarray]
+
+
+class ReadOnlyStoreError(RuntimeError):
+    """읽기 전용 벡터 스토어에 문서 추가/갱신/삭제를 요청한 경우"""
+
+
+@runtime_checkable
+class SearchableVectorStore(Protocol):
+    """
+    벡터 스토어 읽기 인터페이스 (검색/조회)
+
+    검색 결과 형식: {"documents": [...], "metadatas": [...], "distances": [...], "ids": [...]}
+    distances는 코사인 거리(1 - 코사인 유사도)이며 오름차순입니다.
+    """
+
+    collection_name: str
+    persist_directory: Optional[str]
+    embedding_dim: Optional[int]
+    embedding_precision: str
+
+    @property
+    def generation(self) -> Any:
+        """문서 추가/삭제 때마다 바뀌는 값 (BM25 등 보조 색인을 다시 맞출 시점 판단용)"""
+        ...
+
+    def search(
+        self,
+        query_embedding: EmbeddingInput,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """유사도 기반 문서 검색"""
+        ...
+
+    def search_many(
+        self,
+        query_embeddings: EmbeddingsInput,
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """여러 쿼리 일괄 검색 (쿼리 순서대로 search()와 같은 형식)"""
+        ...
+
+    def get_documents(
+        self,
+        ids: List[str],
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        """ID로 문서 조회"""
+        ...
+
+    def filter_ids(self, filter_metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """메타데이터 필터를 통과하는 문서 ID 리스트 (None이면 전체 문서 ID)"""
+        ...
+
+    def get_document_count(self) -> int:
+        """저장된 문서 개수"""
+        ...
+
+    def iter_documents(
+        self,
+        page_size: int = 1000,
+        include_embeddings: bool = True,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """page_size 단위 순회 ({"ids", "documents", "metadatas", "embeddings"})"""
+        ...
+
+    def prepare_query_embedding(self, query_embedding: EmbeddingInput) -> np.ndarray:
+        """쿼리 벡터를 저장 모드(차원/정밀도)에 맞게 변환"""
+        ...
+
+
+@runtime_checkable
+class VectorStore(SearchableVectorStore, Protocol):
+    """벡터 스토어 읽기/쓰기 인터페이스 (SearchableVectorStore + 문서 추가/갱신/삭제)"""
+
+    def add_documents(
+        self,
+        texts: List[str],
+        embeddings: EmbeddingsInput,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[str]:
+        """문서 추가 후 문서 ID 리스트 반환"""
+        ...
+
+    def upsert_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[EmbeddingsInput] = None,
+        embedding_function: Optional[Callable[[List[str]], EmbeddingsInput]] = None,
+        prune_scope: Optional[str] = "source"
+    ) -> Dict[str, List[str]]:
+        """결정적 ID 기준으로 변경된 청크만 반영 ({"added", "unchanged", "deleted"})"""
+        ...
+
+    def delete_documents(self, ids: List[str]) -> bool:
+        """문서 삭제 후 성공 여부 반환"""
+        ...
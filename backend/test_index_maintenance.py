@@ -0,0 +1,136 @@
+"""
+인덱스 유지보수(index_maintenance) 저장소 보고서 테스트
+
+저장소에 포함된 data/chroma_db 사본과 새로 만든 Chroma 저장소로 HNSW 헤더 해석,
+삭제 표시 수, 쓰기 로그 기반 살아있는/삭제된 문서 수를 확인합니다.
+
+실행: cd backend && python -m pytest test_index_maintenance.py
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from rag.index_maintenance import (
+    HNSW_HEADER_VERSION,
+    pending_write_stats,
+    read_hnsw_header,
+    segment_stats,
+    storage_report
+)
+
+
+CHROMA_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "chroma_db")
+COLLECTION = "commercial_analysis_docs"
+
+
+@pytest.fixture
+def shipped_db():
+    """data/chroma_db 사본 (테스트가 원본을 바꾸지 않도록)"""
+    if not os.path.isdir(CHROMA_DB):
+        pytest.skip("data/chroma_db가 없습니다")
+    temp_dir = tempfile.mkdtemp(prefix="maintenance_")
+    persist_directory = os.path.join(temp_dir, "chroma_db")
+    shutil.copytree(CHROMA_DB, persist_directory)
+    yield persist_directory
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def hnsw_segment(persist_directory: str) -> str:
+    segments = [row for row in segment_stats(persist_directory) if "header.bin" in row["files"]]
+    assert len(segments) == 1, "HNSW 세그먼트가 하나가 아닙니다"
+    return os.path.join(persist_directory, segments[0]["segment"])
+
+
+def test_shipped_header(shipped_db):
+    header = read_hnsw_header(hnsw_segment(shipped_db))
+    assert header is not None, "버전 접두사가 있는 header.bin을 해석하지 못했습니다"
+    assert header["version"] == 1
+    assert header["M"] == 16
+    assert header["dim"] == 1024
+    assert header["max_elements"] == 100
+    assert header["element_count"] == 0, "디스크에 반영된 HNSW 요소가 없어야 합니다"
+
+
+def test_legacy_header_without_version(shipped_db):
+    segment_path = hnsw_segment(shipped_db)
+    expected = read_hnsw_header(segment_path)
+    header_path = os.path.join(segment_path, "header.bin")
+    with open(header_path, "rb") as f:
+        data = f.read()
+    with open(header_path, "wb") as f:
+        f.write(data[HNSW_HEADER_VERSION.size:])
+
+    header = read_hnsw_header(segment_path)
+    assert header is not None, "버전 접두사가 없는 header.bin을 해석하지 못했습니다"
+    assert {key: value for key, value in header.items() if key != "version"} == \
+        {key: value for key, value in expected.items() if key != "version"}
+
+
+def test_unknown_header(shipped_db):
+    """형식이 맞지 않는 헤더는 잘못된 값 대신 None(알 수 없음)"""
+    segment_path = hnsw_segment(shipped_db)
+    header_path = os.path.join(segment_path, "header.bin")
+    with open(header_path, "rb") as f:
+        data = f.read()
+    with open(header_path, "wb") as f:
+        f.write(data[:HNSW_HEADER_VERSION.size] + data[HNSW_HEADER_VERSION.size + 4:] + b"\0" * 4)
+
+    assert read_hnsw_header(segment_path) is None
+    row = next(row for row in segment_stats(shipped_db) if "header.bin" in row["files"])
+    assert row["elements"] is None and row["deleted"] is None and row["M"] is None
+
+
+def test_shipped_storage_report(shipped_db):
+    """HNSW에 반영되지 않은 쓰기는 embeddings_queue에서 셈"""
+    assert pending_write_stats(shipped_db) == {COLLECTION: {"pending_writes": 74, "pending_deletes": 0}}
+
+    from rag.vector_store import ChromaVectorStore
+
+    store = ChromaVectorStore(collection_name=COLLECTION, persist_directory=shipped_db, follow_alias=False)
+    row = storage_report(store)["collections"][COLLECTION]
+    assert row["live"] == 74
+    assert row["dead"] == 0
+    assert row["pending_writes"] == 74
+    assert row["hnsw_elements"] == 0 and row["hnsw_deleted"] == 0
+
+
+def test_flushed_and_pending_deletes():
+    """디스크 HNSW 삭제 표시와 아직 반영되지 않은 삭제 로그를 합쳐 삭제 수 계산"""
+    import chromadb
+
+    from rag.vector_store import ChromaVectorStore
+
+    temp_dir = tempfile.mkdtemp(prefix="maintenance_")
+    try:
+        client = chromadb.PersistentClient(path=temp_dir)
+        collection = client.create_collection(
+            "maintenance_test",
+            metadata={"hnsw:space": "cosine", "hnsw:sync_threshold": 100, "hnsw:batch_size": 50}
+        )
+        rng = np.random.default_rng(0)
+        collection.add(ids=[f"a{i}" for i in range(300)], embeddings=rng.random((300, 16)).tolist())
+        collection.delete(ids=[f"a{i}" for i in range(40)])
+        collection.add(ids=[f"b{i}" for i in range(60)], embeddings=rng.random((60, 16)).tolist())
+        collection.delete(ids=[f"a{i}" for i in range(40, 50)])
+        del collection, client
+        gc.collect()
+
+        row = next(row for row in segment_stats(temp_dir) if "header.bin" in row["files"])
+        assert row["elements"] == 360
+        assert row["deleted"] == 40, "data_level0.bin 삭제 표시 수가 다릅니다"
+        assert pending_write_stats(temp_dir) == {
+            "maintenance_test": {"pending_writes": 10, "pending_deletes": 10}
+        }
+
+        store = ChromaVectorStore(collection_name="maintenance_test", persist_directory=temp_dir,
+                                  follow_alias=False)
+        report = storage_report(store)["collections"]["maintenance_test"]
+        assert report["live"] == 310
+        assert report["dead"] == 50
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,338 @@
+"""
+벡터 스토어 인터페이스(VectorStore) 공통 적합성 테스트
+
+같은 생성 코퍼스로 각 백엔드가 추가/upsert/검색/일괄 검색/삭제/개수/순회 동작을
+동일하게 수행하는지 확인합니다. 새 백엔드는 BACKENDS에 생성 함수를 추가하면 됩니다.
+
+읽기 전용 백엔드(QuantizedVectorStore)는 쓰기 검사 대신 READ_ONLY_BACKENDS에서
+SearchableVectorStore 계약(검색/필터 동작, 쓰기 시 ReadOnlyStoreError)을 검사합니다.
+
+실행: cd backend && python -m pytest test_vector_store_conformance.py
+      또는 python test_vector_store_conformance.py [--backend numpy chroma quantized]
+"""
+
+import argparse
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from rag.numpy_vector_store import NumpyVectorStore
+from rag.quantized_vector_store import QuantizedVectorStore
+from rag.vector_store import make_chunk_id
+from rag.vector_store_protocol import ReadOnlyStoreError, SearchableVectorStore, VectorStore
+
+
+DIM = 32
+
+
+def make_numpy_store():
+    return NumpyVectorStore([], [], [], np.empty((0, 0), dtype=np.float32), collection_name="conformance")
+
+
+def make_chroma_store():
+    from rag.vector_store import ChromaVectorStore
+
+    temp_dir = tempfile.mkdtemp(prefix="conformance_")
+    store = ChromaVectorStore(
+        collection_name="conformance",
+        persist_directory=temp_dir,
+        follow_alias=False
+    )
+    store._conformance_temp_dir = temp_dir
+    return store
+
+
+def close_store(store) -> None:
+    """생성 함수가 만든 임시 디렉토리 정리"""
+    temp_dir = getattr(store, "_conformance_temp_dir", None)
+    if temp_dir:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def make_quantized_store(texts, embeddings, metadatas):
+    """읽기 전용 스토어는 코퍼스를 생성 시점에 받음 (ID는 add_documents와 같은 규칙)"""
+    ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+    return QuantizedVectorStore(ids, texts, metadatas, embeddings, collection_name="conformance")
+
+
+BACKENDS = {
+    "numpy": make_numpy_store,
+    "chroma": make_chroma_store,
+}
+
+READ_ONLY_BACKENDS = {
+    "quantized": make_quantized_store,
+}
+
+
+def generated_corpus(size: int = 200, seed: int = 0):
+    """잘 분리된 정규화 벡터와 텍스트/메타데이터 (source 4종, file_type 2종)"""
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(size, DIM)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    texts = [f"문서 {i}" for i in range(size)]
+    metadatas = [
+        {"source": f"doc_{i % 4}.txt", "file_type": "pdf" if i % 2 else "txt", "chunk_index": i}
+        for i in range(size)
+    ]
+    return texts, embeddings, metadatas
+
+
+def check_protocol(store) -> None:
+    """VectorStore 인터페이스 메서드/속성 구현 여부"""
+    assert isinstance(store, VectorStore), f"{type(store).__name__}가 VectorStore 인터페이스를 구현하지 않습니다"
+
+
+def check_add_and_count(store) -> None:
+    texts, embeddings, metadatas = generated_corpus()
+    ids = store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+    assert len(ids) == len(texts) == len(set(ids)), "추가된 ID 수가 다릅니다"
+    assert store.get_document_count() == len(texts), "문서 수가 다릅니다"
+
+
+def check_search(store) -> None:
+    texts, embeddings, metadatas = generated_corpus()
+    ids = store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+    assert_search(store, ids, texts, embeddings)
+
+
+def assert_search(store, ids, texts, embeddings) -> None:
+    results = store.search(embeddings[7], top_k=5)
+    assert set(results) >= {"documents", "metadatas", "distances", "ids"}, "결과 키가 다릅니다"
+    assert len(results["ids"]) == 5, "top_k개를 반환하지 않습니다"
+    assert results["ids"][0] == ids[7], "자기 자신이 1위가 아닙니다"
+    assert abs(results["distances"][0]) < 1e-3, "자기 자신과의 코사인 거리가 0이 아닙니다"
+    assert results["documents"][0] == texts[7], "문서 텍스트가 다릅니다"
+    assert results["distances"] == sorted(results["distances"]), "거리 오름차순이 아닙니다"
+
+    # top_k가 문서 수보다 크면 전체 반환
+    assert len(store.search(embeddings[0], top_k=len(ids) + 10)["ids"]) == len(ids)
+
+
+def check_search_many(store) -> None:
+    texts, embeddings, metadatas = generated_corpus()
+    store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+    assert_search_many(store, embeddings)
+
+
+def assert_search_many(store, embeddings) -> None:
+    queries = embeddings[[3, 50, 120]] + 0.01
+    batched = store.search_many(queries, top_k=4)
+    assert len(batched) == 3, "쿼리 수만큼 결과를 반환하지 않습니다"
+    for query, results in zip(queries, batched):
+        single = store.search(query, top_k=4)
+        assert results["ids"] == single["ids"], "search_many와 search 결과가 다릅니다"
+    assert store.search_many(np.empty((0, DIM), dtype=np.float32), top_k=4) == [], "빈 쿼리 결과가 빈 리스트가 아닙니다"
+
+
+def check_filters(store) -> None:
+    texts, embeddings, metadatas = generated_corpus()
+    store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+    assert_filters(store, embeddings)
+
+
+def assert_filters(store, embeddings) -> None:
+    results = store.search(embeddings[0], top_k=10, filter_metadata={"source": "doc_1.txt"})
+    assert results["ids"], "필터 결과가 없습니다"
+    assert all(metadata["source"] == "doc_1.txt" for metadata in results["metadatas"]), "$eq 필터 위반"
+
+    results = store.search(
+        embeddings[0], top_k=20,
+        filter_metadata={"source": {"$in": ["doc_2.txt", "doc_3.txt"]}}
+    )
+    assert {metadata["source"] for metadata in results["metadatas"]} <= {"doc_2.txt", "doc_3.txt"}, "$in 필터 위반"
+
+    results = store.search(
+        embeddings[0], top_k=20,
+        filter_metadata={"$and": [{"source": "doc_1.txt"}, {"file_type": "pdf"}]}
+    )
+    assert all(
+        metadata["source"] == "doc_1.txt" and metadata["file_type"] == "pdf"
+        for metadata in results["metadatas"]
+    ), "$and 필터 위반"
+
+    results = store.search(embeddings[0], top_k=5, filter_metadata={"source": "missing.txt"})
+    assert results["ids"] == [], "일치하는 문서가 없는데 결과를 반환합니다"
+
+    allowed = store.filter_ids({"$and": [{"source": "doc_1.txt"}, {"file_type": "pdf"}]})
+    assert len(allowed) == 50, "filter_ids 결과 수가 다릅니다"
+    fetched = store.get_documents(allowed)
+    assert all(
+        metadata["source"] == "doc_1.txt" and metadata["file_type"] == "pdf"
+        for metadata in fetched["metadatas"]
+    ), "filter_ids 필터 위반"
+    assert store.filter_ids({"source": "missing.txt"}) == [], "filter_ids가 없는 값에 ID를 반환합니다"
+    assert len(store.filter_ids()) == store.get_document_count(), "필터 없는 filter_ids가 전체 ID를 반환하지 않습니다"
+
+
+def check_delete(store) -> None:
+    texts, embeddings, metadatas = generated_corpus()
+    ids = store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+
+    # 삭제 전 검색 결과가 캐시되어 있어도 삭제가 반영되어야 함
+    assert store.search(embeddings[10], top_k=1)["ids"] == [ids[10]]
+    generation = store.generation
+    assert store.delete_documents([ids[10], ids[11]]), "삭제 실패"
+    assert store.generation != generation, "삭제 후 generation이 바뀌지 않았습니다"
+    assert store.get_document_count() == len(ids) - 2, "삭제 후 문서 수가 다릅니다"
+    found = store.search(embeddings[10], top_k=5)["ids"]
+    assert ids[10] not in found and ids[11] not in found, "삭제된 문서가 검색됩니다"
+    assert store.get_documents([ids[10]])["ids"] == [], "삭제된 문서가 조회됩니다"
+
+
+def check_upsert(store) -> None:
+    texts, embeddings, metadatas = generated_corpus(size=40)
+
+    first = store.upsert_documents(texts, metadatas, embeddings=embeddings, prune_scope="collection")
+    assert len(first["added"]) == 40 and not first["unchanged"] and not first["deleted"]
+
+    # 같은 입력은 변경 없음
+    again = store.upsert_documents(texts, metadatas, embeddings=embeddings, prune_scope="collection")
+    assert not again["added"] and len(again["unchanged"]) == 40 and not again["deleted"]
+
+    # doc_0.txt만 다시 넣되 첫 청크 내용 변경 → 1개 추가, 1개 삭제, 나머지 유지
+    rows = [i for i, metadata in enumerate(metadatas) if metadata["source"] == "doc_0.txt"]
+    new_texts = [texts[i] for i in rows]
+    new_texts[0] = new_texts[0] + " (수정)"
+    embedded: list = []
+
+    def embed(batch):
+        embedded.extend(batch)
+        return embeddings[rows[:len(batch)]]
+
+    changed = store.upsert_documents(
+        new_texts, [metadatas[i] for i in rows],
+        embedding_function=embed, prune_scope="source"
+    )
+    assert embedded == [new_texts[0]], "변경된 청크만 임베딩해야 합니다"
+    assert len(changed["added"]) == 1 and len(changed["deleted"]) == 1
+    assert len(changed["unchanged"]) == len(rows) - 1
+    assert store.get_document_count() == 40, "source 범위 밖 문서가 삭제되었습니다"
+
+
+def check_iterate(store) -> None:
+    texts, embeddings, metadatas = generated_corpus(size=95)
+    ids = store.add_documents(texts=texts, embeddings=embeddings, metadatas=metadatas)
+
+    pages = list(store.iter_documents(page_size=20))
+    assert [len(page["ids"]) for page in pages] == [20, 20, 20, 20, 15], "페이지 크기가 다릅니다"
+    seen = [doc_id for page in pages for doc_id in page["ids"]]
+    assert sorted(seen) == sorted(ids), "순회 결과가 전체 문서와 다릅니다"
+    assert pages[0]["embeddings"].shape == (20, DIM), "임베딩 shape이 다릅니다"
+
+    no_embeddings = next(store.iter_documents(page_size=10, include_embeddings=False))
+    assert no_embeddings["embeddings"] is None
+
+    filtered = [
+        metadata for page in store.iter_documents(page_size=7, filter_metadata={"file_type": "pdf"})
+        for metadata in page["metadatas"]
+    ]
+    assert len(filtered) == 47 and all(metadata["file_type"] == "pdf" for metadata in filtered)
+
+    fetched = store.get_documents([ids[5]], include_embeddings=True)
+    assert fetched["ids"] == [ids[5]]
+    assert np.allclose(fetched["embeddings"][0], embeddings[5], atol=1e-5), "저장된 임베딩이 다릅니다"
+
+
+CHECKS = [
+    check_protocol,
+    check_add_and_count,
+    check_search,
+    check_search_many,
+    check_filters,
+    check_delete,
+    check_upsert,
+    check_iterate,
+]
+
+
+def check_read_only_contract(store, corpus) -> None:
+    """읽기 인터페이스만 만족하고 쓰기 메서드는 ReadOnlyStoreError 발생"""
+    texts, embeddings, metadatas = corpus
+    assert isinstance(store, SearchableVectorStore), f"{type(store).__name__}가 SearchableVectorStore를 구현하지 않습니다"
+    generation = store.generation
+    for write in (
+        lambda: store.add_documents(texts=texts[:1], embeddings=embeddings[:1], metadatas=metadatas[:1]),
+        lambda: store.upsert_documents(texts[:1], metadatas[:1], embeddings=embeddings[:1]),
+        lambda: store.delete_documents([store.ids[0]])
+    ):
+        with pytest.raises(ReadOnlyStoreError):
+            write()
+    assert store.get_document_count() == len(texts), "쓰기 거부 후 문서 수가 바뀌었습니다"
+    assert store.generation == generation, "읽기 전용 스토어의 generation이 바뀌었습니다"
+
+
+def check_read_only_search(store, corpus) -> None:
+    texts, embeddings, metadatas = corpus
+    ids = [make_chunk_id(text, metadata) for text, metadata in zip(texts, metadatas)]
+    assert_search(store, ids, texts, embeddings)
+    assert_search_many(store, embeddings)
+
+
+def check_read_only_filters(store, corpus) -> None:
+    assert_filters(store, corpus[1])
+
+
+READ_ONLY_CHECKS = [
+    check_read_only_contract,
+    check_read_only_search,
+    check_read_only_filters,
+]
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=lambda check: check.__name__)
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_conformance(backend, check):
+    """백엔드 × 검사마다 새 스토어로 실행"""
+    store = BACKENDS[backend]()
+    try:
+        check(store)
+    finally:
+        close_store(store)
+
+
+@pytest.mark.parametrize("check", READ_ONLY_CHECKS, ids=lambda check: check.__name__)
+@pytest.mark.parametrize("backend", list(READ_ONLY_BACKENDS))
+def test_read_only_conformance(backend, check):
+    """읽기 전용 백엔드 × 읽기 검사마다 생성 코퍼스로 만든 새 스토어로 실행"""
+    corpus = generated_corpus()
+    check(READ_ONLY_BACKENDS[backend](*corpus), corpus)
+
+
+def run_conformance(backend: str) -> bool:
+    """백엔드 하나에 대해 모든 검사를 새 스토어로 실행 (스크립트 실행용)"""
+    print("\n" + "=" * 70)
+    print(f"VectorStore 적합성 테스트: {backend}")
+    print("=" * 70)
+
+    read_only = backend in READ_ONLY_BACKENDS
+    checks = READ_ONLY_CHECKS if read_only else CHECKS
+    failures = 0
+    for check in checks:
+        try:
+            if read_only:
+                test_read_only_conformance(backend, check)
+            else:
+                test_conformance(backend, check)
+            print(f"[OK] {check.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"[ERROR] {check.__name__}: {e or '검증 실패'}")
+
+    print(f"\n{backend}: {len(checks) - failures}/{len(checks)} 통과")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    all_backends = list(BACKENDS) + list(READ_ONLY_BACKENDS)
+    parser = argparse.ArgumentParser(description="VectorStore 백엔드 적합성 테스트")
+    parser.add_argument("--backend", nargs="+", default=all_backends, choices=all_backends)
+    args = parser.parse_args()
+
+    results = {backend: run_conformance(backend) for backend in args.backend}
+    print("\n" + "=" * 70)
+    for backend, passed in results.items():
+        print(f"  {backend}: {'[OK] 통과' if passed else '[ERROR] 실패'}")
+    print("=" * 70)
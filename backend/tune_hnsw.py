@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+HNSW 파라미터 튜닝 스크립트
+
+현재 활성 컬렉션(commercial_analysis_docs)의 벡터로 (M, construction_ef, search_ef)
+조합별 임시 컬렉션을 빌드하고, NumPy 정확(brute-force) 검색 결과를 정답으로
+recall@k와 쿼리 지연(p50/p95), 빌드 시간을 출력합니다.
+
+쿼리: 무작위로 고른 컬렉션 문서 벡터에 작은 노이즈를 더한 벡터
+
+실행: cd backend && python tune_hnsw.py --m 8 16 32 --construction-ef 100 200 --search-ef 10 50 100
+선택한 값 적용: python index_documents.py --rebuild --hnsw-m 16 --hnsw-construction-ef 200 --hnsw-search-ef 50
+"""
+
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.vector_store import ChromaVectorStore
+
+
+def load_vectors(vector_store: ChromaVectorStore):
+    """컬렉션 ID와 float32 임베딩 행렬을 페이지 단위로 로드"""
+    ids, blocks = [], []
+    for page in vector_store.iter_documents():
+        ids += page["ids"]
+        blocks.append(page["embeddings"])
+    matrix = np.concatenate(blocks) if blocks else np.empty((0, 0), dtype=np.float32)
+    return ids, matrix
+
+
+def exact_top_k(matrix: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """정규화 벡터 내적 기준 정확 top-k 인덱스"""
+    scores = queries @ matrix.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HNSW 파라미터별 recall@k / 지연 시간 비교")
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32], help="M 후보")
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200],
+                        help="construction_ef 후보")
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200],
+                        help="search_ef 후보")
+    parser.add_argument("--k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🎛️  HNSW 파라미터 튜닝")
+    print("=" * 70)
+
+    ids, matrix = load_vectors(ChromaVectorStore())
+    if len(ids) == 0:
+        print("⚠️  컬렉션이 비어있습니다. 먼저 index_documents.py를 실행해주세요.")
+        return
+    matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    rng = np.random.default_rng(0)
+    picks = rng.choice(len(matrix), size=min(args.queries, len(matrix)), replace=False)
+    queries = matrix[picks] + rng.normal(scale=0.02, size=(len(picks), matrix.shape[1])).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    k = min(args.k, len(ids))
+    truth = exact_top_k(matrix, queries, k)
+    truth_ids = [{ids[i] for i in row} for row in truth]
+    metadatas = [{"source": "tune"} for _ in ids]
+    texts = list(ids)  # 검색 결과 비교에는 ID만 사용
+
+    print(f"\n문서 수: {len(ids)}, 차원: {matrix.shape[1]}, 쿼리 {len(queries)}개, k={k}")
+    print(f"\n{'M':>4} | {'c_ef':>5} | {'s_ef':>5} | {'빌드 s':>7} | {'recall@k':>8} | "
+          f"{'p50 ms':>7} | {'p95 ms':>7}")
+    print("-" * 62)
+
+    results = []
+    for m, construction_ef, search_ef in itertools.product(args.m, args.construction_ef, args.search_ef):
+        temp_dir = tempfile.mkdtemp(prefix="tune_hnsw_")
+        try:
+            store = ChromaVectorStore(
+                collection_name="tune_hnsw",
+                persist_directory=temp_dir,
+                hnsw_m=m,
+                hnsw_construction_ef=construction_ef,
+                hnsw_search_ef=search_ef,
+                follow_alias=False,
+                result_cache_size=0  # 인덱스 검색 자체의 지연 측정
+            )
+            start = time.perf_counter()
+            store.add_documents(texts=texts, embeddings=matrix, metadatas=metadatas, ids=ids)
+            store.search(queries[0], top_k=k)  # 인덱스 로드
+            build_s = time.perf_counter() - start
+
+            latencies, recalls = [], []
+            for query, expected in zip(queries, truth_ids):
+                query_start = time.perf_counter()
+                found = store.search(query, top_k=k)
+                latencies.append((time.perf_counter() - query_start) * 1000)
+                recalls.append(len(expected & set(found["ids"])) / k)
+
+            row = (m, construction_ef, search_ef, build_s, float(np.mean(recalls)),
+                   float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95)))
+            results.append(row)
+            print(f"{row[0]:>4} | {row[1]:>5} | {row[2]:>5} | {row[3]:>7.1f} | {row[4]:>8.3f} | "
+                  f"{row[5]:>7.2f} | {row[6]:>7.2f}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # recall 0.99 이상 중 p95가 가장 낮은 조합 추천
+    good = [row for row in results if row[4] >= 0.99]
+    if good:
+        best = min(good, key=lambda row: row[6])
+        print(f"\n💡 recall@{k} ≥ 0.99 중 p95 최소: M={best[0]}, construction_ef={best[1]}, "
+              f"search_ef={best[2]} (recall {best[4]:.3f}, p95 {best[6]:.2f}ms)")
+        print(f"   적용: python index_documents.py --rebuild --hnsw-m {best[0]} "
+              f"--hnsw-construction-ef {best[1]} --hnsw-search-ef {best[2]}")
+    else:
+        print("\n⚠️  recall 0.99 이상인 조합이 없습니다. search_ef/M 후보를 늘려보세요.")
+
+
+if __name__ == "__main__":
+    main()